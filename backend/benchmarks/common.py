@@ -0,0 +1,87 @@
+"""
+Shared helpers for the scripts in this package.
+
+Benchmarks run against a throwaway test database (in-memory for SQLite) so
+they never touch db.sqlite3 — run them from the backend directory:
+
+    python -m benchmarks.<name>
+"""
+
+import os
+import time
+from contextlib import contextmanager
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+django.setup()
+
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+BENCH_PASSWORD = "password123"
+
+
+@contextmanager
+def temporary_database():
+    """
+    Create (and afterwards destroy) a migrated test database.  DEBUG is off,
+    as under the test runner, so queries aren't logged behind our back.
+    """
+    setup_test_environment(debug=False)
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def make_catalog(rows: int, chunk_size: int = 5000):
+    """
+    Empty the database, then create one business, one user per role
+    (<role>@bench.com / BENCH_PASSWORD) and `rows` products (two thirds
+    approved) with bulk_create.  Returns the business.
+    """
+    from django.contrib.auth.hashers import make_password
+    from django.core.management import call_command
+    from users.models import Business, Role, User
+    from products.models import Product, ProductStatus
+
+    call_command("flush", interactive=False, verbosity=0)
+
+    business = Business.objects.create(name="Bench Corp", email="bench@example.com")
+    password = make_password(BENCH_PASSWORD)
+    users = {
+        role: User.objects.create(
+            email=f"{role}@bench.com", first_name=role.title(), last_name="Bench",
+            role=role, business=business, password=password,
+        )
+        for role in (Role.ADMIN, Role.APPROVER, Role.EDITOR, Role.VIEWER)
+    }
+    editor, approver = users[Role.EDITOR], users[Role.APPROVER]
+
+    for start in range(0, rows, chunk_size):
+        Product.objects.bulk_create([
+            Product(
+                name=f"Product {i}",
+                description=f"Benchmark product number {i}, a fine example of its kind.",
+                price=f"{(i % 50000) / 100 + 0.99:.2f}",
+                status=ProductStatus.APPROVED if i % 3 else ProductStatus.PENDING_APPROVAL,
+                business=business,
+                created_by=editor,
+                approved_by=approver if i % 3 else None,
+            )
+            for i in range(start, min(start + chunk_size, rows))
+        ])
+    return business
+
+
+def best_of(fn, repeat: int = 3) -> float:
+    """Run fn `repeat` times and return the fastest wall time in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
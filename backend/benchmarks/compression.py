@@ -0,0 +1,46 @@
+"""
+Bytes saved and CPU cost per response for each codec available to
+CompressionMiddleware (core/middleware.py), on product list JSON of
+increasing size.
+
+    python -m benchmarks.compression
+    python -m benchmarks.compression --rows 5 50 500 5000 --repeat 5
+
+br / zstd rows only appear when the brotli / zstandard packages are installed.
+"""
+
+import argparse
+
+from benchmarks.common import best_of, make_catalog, temporary_database
+
+from core.fastpath import serialize_list
+from core.middleware import available_codecs
+from core.renderers import ORJSONRenderer
+from products.models import Product
+from products.serializers import ProductSerializer
+
+
+def run(rows_list, repeat):
+    codecs = available_codecs()
+    print(f"{'rows':>6} {'codec':>5} {'raw KB':>9} {'out KB':>9} {'saved':>7} {'µs/resp':>9} {'MB/s':>8}")
+    with temporary_database():
+        make_catalog(max(rows_list))
+        renderer = ORJSONRenderer()
+        for rows in rows_list:
+            body = renderer.render(serialize_list(ProductSerializer, Product.objects.all()[:rows]))
+            for name, codec in codecs.items():
+                compressed = codec.compress(body)
+                elapsed = best_of(lambda: codec.compress(body), repeat)
+                print(
+                    f"{rows:>6} {name:>5} {len(body) / 1024:>9.1f} {len(compressed) / 1024:>9.1f} "
+                    f"{1 - len(compressed) / len(body):>6.1%} {elapsed * 1e6:>9.0f} "
+                    f"{len(body) / elapsed / 1e6:>8.1f}"
+                )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1, 10, 100, 1_000, 10_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.rows, args.repeat)
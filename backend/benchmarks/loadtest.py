@@ -0,0 +1,399 @@
+"""
+HTTP load-testing harness.
+
+Starts the backend as a real server on a throwaway SQLite database seeded via
+seed.py's scale mode, points the OpenAI client at an in-process stub (so chat
+traffic never leaves the machine), then drives scripted scenarios with an
+asyncio httpx client and reports RPS and p50/p95/p99 latency per endpoint.
+
+    python -m benchmarks.loadtest
+    python -m benchmarks.loadtest --duration 60 --users anonymous=50 editor=5 approver=2 chat=10 refresh=2
+    python -m benchmarks.loadtest --output after.json --compare before.json
+
+    # Against an already running server (nothing is started or seeded)
+    python -m benchmarks.loadtest --url http://localhost:8000
+
+    # Any server command; {port} is substituted
+    python -m benchmarks.loadtest --server-cmd "gunicorn core.wsgi -w 4 -b 127.0.0.1:{port}"
+
+Scenarios (virtual users per scenario set with --users name=count):
+    anonymous  browse the public catalog: list, search, price filters, detail
+    editor     list own business products, create, edit and submit drafts
+    approver   fetch pending products and approve / reject them in bursts
+    chat       anonymous chat messages and history
+    refresh    the auth refresh flow (rotating refresh tokens)
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+PASSWORD    = "password123"
+
+
+# ─── Stub LLM ────────────────────────────────────────────────────────────────
+
+class StubLLM:
+    """
+    Minimal OpenAI-compatible /v1/chat/completions endpoint with a fixed
+    latency, served from this process with asyncio streams.
+    """
+
+    def __init__(self, latency_ms: float):
+        self.latency = latency_ms / 1000
+        self.calls = 0
+        self.writers = set()
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def _handle(self, reader, writer):
+        self.writers.add(writer)
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in head.split(b"\r\n"):
+                    if line.lower().startswith(b"content-length:"):
+                        length = int(line.split(b":", 1)[1])
+                if length:
+                    await reader.readexactly(length)
+                self.calls += 1
+                await asyncio.sleep(self.latency)
+                body = json.dumps({
+                    "id": f"chatcmpl-stub-{self.calls}",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": "gpt-4o-mini",
+                    "choices": [{
+                        "index": 0,
+                        "finish_reason": "stop",
+                        "message": {"role": "assistant", "content": "Stub answer: the Widget Pro is $29.99."},
+                    }],
+                    "usage": {"prompt_tokens": 100, "completion_tokens": 12, "total_tokens": 112},
+                }).encode()
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    b"Content-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.writers.discard(writer)
+            writer.close()
+
+    async def close(self):
+        self.server.close()
+        # Let keep-alive handlers see EOF and exit instead of being cancelled
+        for writer in list(self.writers):
+            writer.transport.abort()
+        await asyncio.sleep(0.1)
+
+
+# ─── Server under test ───────────────────────────────────────────────────────
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class LocalServer:
+    """Migrates and seeds a temporary database, then runs the server command against it."""
+
+    def __init__(self, server_cmd, stub_port, businesses, products, workdir):
+        self.port = _free_port()
+        self.url  = f"http://localhost:{self.port}"
+        self.env  = {
+            **os.environ,
+            "DB_ENGINE": "sqlite",
+            "DB_NAME": str(Path(workdir) / "loadtest.sqlite3"),
+            "DEBUG": "False",
+            "ALLOWED_HOSTS": "localhost,127.0.0.1",
+            "OPENAI_API_KEY": "stub",
+            "OPENAI_BASE_URL": f"http://127.0.0.1:{stub_port}/v1",
+        }
+        self.cmd = server_cmd.format(port=self.port).split()
+        self.businesses, self.products = businesses, products
+
+    def prepare(self):
+        run = dict(cwd=BACKEND_DIR, env=self.env, check=True)
+        subprocess.run([sys.executable, "manage.py", "migrate", "-v0"], **run)
+        subprocess.run([sys.executable, "seed.py"], stdout=subprocess.DEVNULL, **run)
+        subprocess.run([
+            sys.executable, "seed.py", "--businesses", str(self.businesses),
+            "--products-per-business", str(self.products), "--chat-messages", "1000",
+        ], stdout=subprocess.DEVNULL, **run)
+
+    async def start(self):
+        self.process = subprocess.Popen(self.cmd, cwd=BACKEND_DIR, env=self.env,
+                                        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        async with httpx.AsyncClient() as client:
+            for _ in range(200):
+                try:
+                    await client.get(f"{self.url}/api/products/public/products/?fields=id")
+                    return
+                except httpx.TransportError:
+                    await asyncio.sleep(0.1)
+        raise RuntimeError(f"Server did not start: {' '.join(self.cmd)}")
+
+    def stop(self):
+        self.process.terminate()
+        self.process.wait(timeout=10)
+
+
+# ─── Recording ───────────────────────────────────────────────────────────────
+
+class Recorder:
+    def __init__(self):
+        self.latencies = defaultdict(list)   # endpoint → [seconds]
+        self.errors    = defaultdict(int)    # endpoint → count
+        self.statuses  = defaultdict(lambda: defaultdict(int))
+
+    async def request(self, client, label, method, url, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.errors[label] += 1
+            self.statuses[label]["transport"] += 1
+            self.latencies[label].append(time.perf_counter() - started)
+            return None
+        self.latencies[label].append(time.perf_counter() - started)
+        self.statuses[label][str(response.status_code)] += 1
+        if response.status_code >= 400:
+            self.errors[label] += 1
+        return response
+
+    def report(self, elapsed) -> dict:
+        endpoints = {}
+        for label, samples in sorted(self.latencies.items()):
+            samples = sorted(samples)
+            endpoints[label] = {
+                "requests": len(samples),
+                "errors":   self.errors[label],
+                "error_rate": round(self.errors[label] / len(samples), 4),
+                "rps":      round(len(samples) / elapsed, 1),
+                "p50_ms":   round(_percentile(samples, 50) * 1000, 2),
+                "p95_ms":   round(_percentile(samples, 95) * 1000, 2),
+                "p99_ms":   round(_percentile(samples, 99) * 1000, 2),
+                "max_ms":   round(samples[-1] * 1000, 2),
+                "statuses": dict(self.statuses[label]),
+            }
+        total = sum(e["requests"] for e in endpoints.values())
+        return {
+            "duration_s": round(elapsed, 2),
+            "total_requests": total,
+            "total_rps": round(total / elapsed, 1),
+            "total_errors": sum(e["errors"] for e in endpoints.values()),
+            "endpoints": endpoints,
+        }
+
+
+def _percentile(sorted_samples, pct):
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, int(round(pct / 100 * (len(sorted_samples) - 1))))
+    return sorted_samples[index]
+
+
+# ─── Scenarios ───────────────────────────────────────────────────────────────
+
+async def _login(client, rec, email):
+    """Log in and return (auth headers, refresh token). Tokens are read from the
+    body because the Secure cookies aren't sent back over plain http."""
+    response = await rec.request(client, "POST auth-login", "POST", "/api/auth/login/",
+                                 json={"email": email, "password": PASSWORD})
+    if response is None or response.status_code != 200:
+        return None, None
+    data = response.json()
+    return {"Authorization": f"Bearer {data['access_token']}"}, data["refresh_token"]
+
+
+async def anonymous(client, rec, deadline, rng):
+    ids = []
+    while time.perf_counter() < deadline:
+        roll = rng.random()
+        if roll < 0.4:
+            response = await rec.request(client, "GET public-product-list", "GET", "/api/products/public/products/")
+            if response is not None and response.status_code == 200 and not ids:
+                ids = [p["id"] for p in response.json()[:200]]
+        elif roll < 0.6:
+            await rec.request(client, "GET public-product-list ?search", "GET",
+                              "/api/products/public/products/", params={"search": rng.choice(["Pro", "Lamp", "Eco", "Mug"])})
+        elif roll < 0.75:
+            low = rng.randint(1, 200)
+            await rec.request(client, "GET public-product-list ?price", "GET", "/api/products/public/products/",
+                              params={"min_price": low, "max_price": low + rng.randint(10, 100), "fields": "id,name,price"})
+        elif ids:
+            await rec.request(client, "GET public-product-detail", "GET", f"/api/products/public/products/{rng.choice(ids)}/")
+
+
+async def editor(client, rec, deadline, rng):
+    headers, _ = await _login(client, rec, "editor@acme.com")
+    if headers is None:
+        return
+    while time.perf_counter() < deadline:
+        await rec.request(client, "GET product-list-create", "GET", "/api/products/",
+                          params={"fields": "id,name,price,status"}, headers=headers)
+        response = await rec.request(client, "POST product-list-create", "POST", "/api/products/", headers=headers,
+                                     json={"name": f"Load test {rng.randrange(10**9)}", "description": "Created by the load harness",
+                                           "price": f"{rng.randint(100, 50000) / 100:.2f}"})
+        if response is None or response.status_code != 201:
+            continue
+        pk = response.json()["id"]
+        await rec.request(client, "PATCH product-detail", "PATCH", f"/api/products/{pk}/", headers=headers,
+                          json={"price": f"{rng.randint(100, 50000) / 100:.2f}"})
+        await rec.request(client, "POST product-submit", "POST", f"/api/products/{pk}/submit/", headers=headers)
+
+
+async def approver(client, rec, deadline, rng):
+    headers, _ = await _login(client, rec, "approver@acme.com")
+    if headers is None:
+        return
+    while time.perf_counter() < deadline:
+        response = await rec.request(client, "GET product-list-create ?status=pending", "GET", "/api/products/",
+                                     params={"status": "pending_approval", "fields": "id"}, headers=headers)
+        pending = [p["id"] for p in response.json()] if response is not None and response.status_code == 200 else []
+        if not pending:
+            await asyncio.sleep(0.2)
+            continue
+        # Burst: work through a batch of the queue back to back
+        for pk in rng.sample(pending, min(len(pending), 10)):
+            if rng.random() < 0.8:
+                await rec.request(client, "POST product-approve", "POST", f"/api/products/{pk}/approve/", headers=headers)
+            else:
+                await rec.request(client, "POST product-reject", "POST", f"/api/products/{pk}/reject/", headers=headers)
+
+
+async def chat(client, rec, deadline, rng):
+    questions = ["What products do you have under $30?", "Tell me about the Widget Pro.",
+                 "What does Acme sell?", "Which gadget is the best value?"]
+    while time.perf_counter() < deadline:
+        await rec.request(client, "POST chat", "POST", "/api/chat/", json={"message": rng.choice(questions)})
+        if rng.random() < 0.3:
+            await rec.request(client, "GET chat-history", "GET", "/api/chat/history/")
+
+
+async def refresh(client, rec, deadline, rng):
+    _, refresh_token = await _login(client, rec, rng.choice(["viewer@acme.com", "admin@acme.com"]))
+    while refresh_token and time.perf_counter() < deadline:
+        response = await rec.request(client, "POST auth-refresh", "POST", "/api/auth/refresh/",
+                                     headers={"Cookie": f"refresh_token={refresh_token}"})
+        if response is None or response.status_code != 200:
+            return
+        refresh_token = response.json()["refresh_token"]
+        await asyncio.sleep(0.05)
+
+
+SCENARIOS = {
+    "anonymous": anonymous,
+    "editor":    editor,
+    "approver":  approver,
+    "chat":      chat,
+    "refresh":   refresh,
+}
+
+
+# ─── Runner ──────────────────────────────────────────────────────────────────
+
+async def drive(url, users, duration, seed):
+    rec = Recorder()
+    limits = httpx.Limits(max_connections=sum(users.values()) + 10)
+    async with httpx.AsyncClient(base_url=url, timeout=30, limits=limits) as client:
+        started  = time.perf_counter()
+        deadline = started + duration
+        tasks = [
+            SCENARIOS[name](client, rec, deadline, random.Random(f"{seed}:{name}:{i}"))
+            for name, count in users.items()
+            for i in range(count)
+        ]
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+    return rec.report(elapsed)
+
+
+async def main(args):
+    users = {name: 0 for name in SCENARIOS}
+    for spec in args.users:
+        name, _, count = spec.partition("=")
+        if name not in SCENARIOS:
+            raise SystemExit(f"Unknown scenario {name!r} (choose from {', '.join(SCENARIOS)})")
+        users[name] = int(count or 1)
+    users = {name: count for name, count in users.items() if count}
+
+    stub, server = None, None
+    with tempfile.TemporaryDirectory() as workdir:
+        try:
+            url = args.url
+            if url is None:
+                stub = await StubLLM(args.llm_latency_ms).start()
+                server = LocalServer(args.server_cmd, stub.port, args.businesses, args.products, workdir)
+                print("Preparing database...", file=sys.stderr)
+                server.prepare()
+                await server.start()
+                url = server.url
+
+            print(f"Running {users} against {url} for {args.duration}s...", file=sys.stderr)
+            report = await drive(url, users, args.duration, args.seed)
+            report["scenario_users"] = users
+            if stub is not None:
+                report["llm_stub_calls"] = stub.calls
+        finally:
+            if server is not None:
+                server.stop()
+            if stub is not None:
+                await stub.close()
+
+    _print_table(report, _load(args.compare))
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        print(f"\nWrote {args.output}", file=sys.stderr)
+
+
+def _load(path):
+    return json.loads(Path(path).read_text()) if path else None
+
+
+def _print_table(report, baseline=None):
+    print(f"\n{'endpoint':<42} {'reqs':>7} {'err%':>6} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for label, e in report["endpoints"].items():
+        line = (f"{label:<42} {e['requests']:>7} {e['error_rate'] * 100:>5.1f}% {e['rps']:>8.1f} "
+                f"{e['p50_ms']:>8.1f} {e['p95_ms']:>8.1f} {e['p99_ms']:>8.1f}")
+        before = (baseline or {}).get("endpoints", {}).get(label)
+        if before and before["p95_ms"]:
+            line += f"   p95 {(e['p95_ms'] / before['p95_ms'] - 1) * 100:+.0f}%  rps {(e['rps'] / max(before['rps'], 0.1) - 1) * 100:+.0f}%"
+        print(line)
+    print(f"\ntotal: {report['total_requests']} requests, {report['total_rps']} rps, {report['total_errors']} errors")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Target an already running server instead of starting one")
+    parser.add_argument("--server-cmd", default=f"{sys.executable} manage.py runserver 127.0.0.1:{{port}} --noreload",
+                        help="Command used to start the server ({port} is substituted)")
+    parser.add_argument("--users", nargs="*", default=["anonymous=20", "editor=2", "approver=1", "chat=4", "refresh=1"],
+                        help="Virtual users per scenario, e.g. anonymous=50 chat=10")
+    parser.add_argument("--duration", type=float, default=20, help="Seconds to run")
+    parser.add_argument("--businesses", type=int, default=5, help="Scale-mode businesses to seed")
+    parser.add_argument("--products", type=int, default=200, help="Products per seeded business")
+    parser.add_argument("--llm-latency-ms", type=float, default=300, help="Latency of the stub LLM")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write the JSON report here")
+    parser.add_argument("--compare", help="Earlier JSON report to diff against")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,52 @@
+"""
+Render throughput of ORJSONRenderer (core/renderers.py) versus DRF's stdlib
+JSONRenderer on realistic product list payloads.
+
+    python -m benchmarks.rendering
+    python -m benchmarks.rendering --rows 100 1000 10000 --repeat 5
+"""
+
+import argparse
+
+from benchmarks.common import best_of, make_catalog, temporary_database
+
+from rest_framework.renderers import JSONRenderer
+
+from core.fastpath import serialize_list
+from core.renderers import ORJSONRenderer, orjson
+from products.models import Product, ProductStatus
+from products.serializers import ProductSerializer, PublicProductSerializer
+
+
+def run(rows_list, repeat):
+    if orjson is None:
+        print("orjson is not installed — ORJSONRenderer falls back to the stdlib encoder.")
+
+    stdlib, fast = JSONRenderer(), ORJSONRenderer()
+    print(f"{'payload':<24} {'rows':>7} {'MB':>7} {'json MB/s':>10} {'orjson MB/s':>12} {'speedup':>8}")
+    with temporary_database():
+        for rows in rows_list:
+            make_catalog(rows)
+            payloads = [
+                ("ProductSerializer", serialize_list(ProductSerializer, Product.objects.all())),
+                ("PublicProductSerializer", serialize_list(
+                    PublicProductSerializer, Product.objects.filter(status=ProductStatus.APPROVED),
+                )),
+            ]
+            for label, data in payloads:
+                assert stdlib.render(data) == fast.render(data), f"{label}: output differs"
+                size = len(stdlib.render(data)) / 1e6
+                stdlib_time = best_of(lambda: stdlib.render(data), repeat)
+                fast_time   = best_of(lambda: fast.render(data), repeat)
+                print(
+                    f"{label:<24} {len(data):>7} {size:>7.2f} {size / stdlib_time:>10.1f} "
+                    f"{size / fast_time:>12.1f} {stdlib_time / fast_time:>7.1f}x"
+                )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.rows, args.repeat)
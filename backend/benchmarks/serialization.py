@@ -0,0 +1,54 @@
+"""
+Rows/sec of the values_list() fast path (core/fastpath.py) versus the
+regular DRF serializers used by the product list views.
+
+    python -m benchmarks.serialization
+    python -m benchmarks.serialization --rows 1000 10000 --repeat 5
+"""
+
+import argparse
+
+from benchmarks.common import best_of, make_catalog, temporary_database
+
+from core.fastpath import ValuesSerializer
+from products.models import Product, ProductStatus
+from products.serializers import ProductSerializer, PublicProductSerializer
+
+
+CASES = [
+    ("ProductSerializer",          ProductSerializer,       lambda: Product.objects.all()),
+    ("PublicProductSerializer",    PublicProductSerializer, lambda: Product.objects.filter(status=ProductStatus.APPROVED)),
+    ("ProductSerializer ?fields=", ProductSerializer,       lambda: Product.objects.all(), "id,name,price,status"),
+]
+
+
+def run(rows_list, repeat):
+    print(f"{'case':<28} {'rows':>8} {'serializer rows/s':>18} {'fast path rows/s':>17} {'speedup':>8}")
+    with temporary_database():
+        for rows in rows_list:
+            make_catalog(rows)
+            for label, serializer_class, queryset, *fields in CASES:
+                fields = fields[0] if fields else None
+                count  = queryset().count()
+
+                def slow():
+                    qs = serializer_class.project(queryset(), fields=fields)
+                    return serializer_class(qs, many=True, fields=fields).data
+
+                def fast():
+                    return ValuesSerializer(serializer_class(fields=fields)).serialize(queryset())
+
+                slow_time = best_of(slow, repeat)
+                fast_time = best_of(fast, repeat)
+                print(
+                    f"{label:<28} {count:>8} {count / slow_time:>18,.0f} "
+                    f"{count / fast_time:>17,.0f} {slow_time / fast_time:>7.1f}x"
+                )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.rows, args.repeat)
@@ -0,0 +1,287 @@
+"""
+Per-view microbenchmarks with checked-in budgets.
+
+Every API view is called in-process through DRF's APIClient (real cookie JWT
+auth, full middleware stack) against catalogs of increasing size.  For each
+view and size we record
+
+    - the number of SQL queries of one request
+    - the median wall time over --repeat requests
+    - the peak Python memory of one request (tracemalloc)
+
+and compare them with benchmarks/budgets.json.  The script exits non-zero
+when any budget is exceeded, so it can gate CI:
+
+    python -m benchmarks.views
+    python -m benchmarks.views --sizes 100 1000 --only product
+    python -m benchmarks.views --update        # rewrite budgets from this run
+
+--update stores the measured query counts as-is and the time/memory figures
+with headroom (x3 / x1.5), since those vary between machines.  Review the
+diff before committing it — a budget that only ever goes up is no budget.
+
+The chat view runs against the offline stub LLM provider: the budget covers
+our own work, not the provider's latency.
+"""
+
+import argparse
+import json
+import math
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from benchmarks.common import BENCH_PASSWORD, make_catalog, temporary_database
+
+from django.conf import settings
+from django.db import connection, reset_queries
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from chat.models import ChatMessage
+from products.models import Product, ProductStatus
+from users.models import Role, User
+
+BUDGETS_FILE = Path(__file__).with_name("budgets.json")
+
+TIME_HEADROOM   = 3.0
+MEMORY_HEADROOM = 1.5
+
+
+# ─── Fixtures ────────────────────────────────────────────────────────────────
+
+class Dataset:
+    """A seeded catalog plus the handles the cases need."""
+
+    def __init__(self, size):
+        self.size     = size
+        self.business = make_catalog(size)
+        self.password = User.objects.get(email=f"{Role.ADMIN}@bench.com").password
+        self.users    = {user.role: user for user in User.objects.filter(email__endswith="@bench.com")}
+
+        # Scale the user directory and chat history with the catalog
+        User.objects.bulk_create([
+            User(
+                email=f"user{i}@bench.example.com", first_name="User", last_name=str(i),
+                role=Role.VIEWER, business=self.business, password=self.password,
+            )
+            for i in range(max(size // 10, 1))
+        ])
+        ChatMessage.objects.bulk_create([
+            ChatMessage(
+                user=self.users[Role.VIEWER], session_id="bench",
+                user_message=f"Question {i}", ai_response=f"Answer {i}",
+            )
+            for i in range(max(size // 10, 1))
+        ])
+
+        self.approved = Product.objects.filter(status=ProductStatus.APPROVED).values_list("pk", flat=True).first()
+
+    def product(self, status=ProductStatus.DRAFT):
+        return Product.objects.create(
+            name="Scratch", description="Created for one benchmark request.", price="9.99",
+            status=status, business=self.business, created_by=self.users[Role.EDITOR],
+        ).pk
+
+    def viewer(self):
+        return User.objects.create(
+            email=f"scratch{User.all_objects.count()}@bench.example.com",
+            role=Role.VIEWER, business=self.business, password=self.password,
+        ).pk
+
+
+def _client(user=None, refresh=False):
+    client = APIClient(SERVER_NAME="localhost")
+    if user is not None:
+        token = RefreshToken.for_user(user)
+        client.cookies[settings.JWT_AUTH_COOKIE] = str(token.access_token)
+        if refresh:
+            client.cookies[settings.JWT_AUTH_REFRESH_COOKIE] = str(token)
+    return client
+
+
+# ─── Cases ───────────────────────────────────────────────────────────────────
+# (name, role, method, expected status, prepare)
+# prepare(ds) runs outside the measurement and returns (url, data, client
+# kwargs) for one request, creating whatever rows that request consumes.
+
+def _reset_password(ds, role):
+    # A password change also revokes the user's tokens (see users/tokens.py)
+    User.objects.filter(pk=ds.users[role].pk).update(password=ds.password, token_generation=0)
+
+
+CASES = [
+    # products — private
+    ("product-list",           Role.VIEWER,   "get",    200, lambda ds: ("/api/products/", None, {})),
+    ("product-list ?fields=",  Role.VIEWER,   "get",    200, lambda ds: ("/api/products/?fields=id,name,price", None, {})),
+    ("product-list ?search=",  Role.VIEWER,   "get",    200, lambda ds: ("/api/products/?search=Product 1", None, {})),
+    ("product-create",         Role.EDITOR,   "post",   201, lambda ds: (
+        "/api/products/", {"name": "New", "description": "Benchmark", "price": "19.99"}, {})),
+    ("product-detail",         Role.VIEWER,   "get",    200, lambda ds: (f"/api/products/{ds.approved}/", None, {})),
+    ("product-update",         Role.EDITOR,   "patch",  200, lambda ds: (
+        f"/api/products/{ds.product()}/", {"price": "24.99"}, {})),
+    ("product-delete",         Role.ADMIN,    "delete", 204, lambda ds: (f"/api/products/{ds.product()}/", None, {})),
+    ("product-submit",         Role.EDITOR,   "post",   200, lambda ds: (f"/api/products/{ds.product()}/submit/", None, {})),
+    ("product-approve",        Role.APPROVER, "post",   200, lambda ds: (
+        f"/api/products/{ds.product(ProductStatus.PENDING_APPROVAL)}/approve/", None, {})),
+    ("product-reject",         Role.APPROVER, "post",   200, lambda ds: (
+        f"/api/products/{ds.product(ProductStatus.PENDING_APPROVAL)}/reject/", None, {})),
+    # products — public
+    ("public-product-list",    None,          "get",    200, lambda ds: ("/api/products/public/products/", None, {})),
+    ("public-product-list ?min_price=", None, "get",    200, lambda ds: (
+        "/api/products/public/products/?min_price=100&max_price=200", None, {})),
+    ("public-product-list ?facets=", None,  "get",    200, lambda ds: (
+        "/api/products/public/products/?facets=price,business&sort=price&fields=id,name,price", None, {})),
+    ("public-product-detail",  None,          "get",    200, lambda ds: (f"/api/products/public/products/{ds.approved}/", None, {})),
+    # users — auth
+    ("auth-login",             None,          "post",   200, lambda ds: (
+        "/api/auth/login/", {"email": f"{Role.VIEWER}@bench.com", "password": BENCH_PASSWORD}, {})),
+    ("auth-refresh",           Role.VIEWER,   "post",   200, lambda ds: ("/api/auth/refresh/", None, {"refresh": True})),
+    ("auth-logout",            Role.VIEWER,   "post",   200, lambda ds: ("/api/auth/logout/", None, {"refresh": True})),
+    ("auth-me",                Role.VIEWER,   "get",    200, lambda ds: ("/api/auth/me/", None, {})),
+    # users — management
+    ("user-list",              Role.ADMIN,    "get",    200, lambda ds: ("/api/users/", None, {})),
+    ("user-create",            Role.ADMIN,    "post",   201, lambda ds: ("/api/users/", {
+        "email": f"new{User.objects.count()}@bench.example.com", "first_name": "New", "last_name": "User",
+        "role": Role.VIEWER, "password": BENCH_PASSWORD,
+    }, {})),
+    ("user-detail",            Role.ADMIN,    "get",    200, lambda ds: (f"/api/users/{ds.users[Role.VIEWER].pk}/", None, {})),
+    ("user-update",            Role.ADMIN,    "patch",  200, lambda ds: (f"/api/users/{ds.viewer()}/", {"role": Role.EDITOR}, {})),
+    ("user-delete",            Role.ADMIN,    "delete", 202, lambda ds: (f"/api/users/{ds.viewer()}/", None, {})),
+    ("change-password",        Role.EDITOR,   "post",   200, lambda ds: (_reset_password(ds, Role.EDITOR) or (
+        "/api/users/change-password/", {"old_password": BENCH_PASSWORD, "new_password": BENCH_PASSWORD}, {}))),
+    # chat
+    ("chat",                   None,          "post",   200, lambda ds: ("/api/chat/", {"message": "Anything under $30?"}, {})),
+    ("chat open-ended",        None,          "post",   200, lambda ds: (
+        "/api/chat/", {"message": "Which of these would make a good gift?"}, {})),
+    ("chat-history",           Role.VIEWER,   "get",    200, lambda ds: ("/api/chat/history/", None, {})),
+]
+
+
+# ─── Measurement ─────────────────────────────────────────────────────────────
+
+def _request(ds, role, method, expected, prepare):
+    url, data, client_kwargs = prepare(ds)
+    client = _client(ds.users[role] if role else None, **client_kwargs)
+    return lambda: _check(getattr(client, method)(url, data, format="json"), expected, url)
+
+
+def _check(response, expected, url):
+    if response.status_code != expected:
+        raise RuntimeError(f"{url} returned {response.status_code}, expected {expected}: {response.content[:200]!r}")
+    return response
+
+
+def measure(ds, case, repeat) -> dict:
+    _, role, method, expected, prepare = case
+
+    _request(ds, role, method, expected, prepare)()  # warm-up (URL resolution, caches)
+
+    call = _request(ds, role, method, expected, prepare)
+    reset_queries()
+    with CaptureQueriesContext(connection) as captured:
+        call()
+    queries = len(captured)  # read now: later requests reset connection.queries_log
+
+    timings = []
+    for _ in range(repeat):
+        call = _request(ds, role, method, expected, prepare)
+        started = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - started)
+
+    call = _request(ds, role, method, expected, prepare)
+    tracemalloc.start()
+    try:
+        call()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "queries": queries,
+        "ms":      round(statistics.median(timings) * 1000, 2),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+# ─── Budgets ─────────────────────────────────────────────────────────────────
+
+def load_budgets(path) -> dict:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def check(budgets, name, size, result) -> list:
+    """Return a human-readable line per exceeded budget."""
+    budget = budgets.get(name, {}).get(str(size))
+    if budget is None:
+        return []
+    return [
+        f"{name} @ {size}: {metric} {result[metric]} > budget {budget[metric]}"
+        for metric in ("queries", "ms", "peak_kb")
+        if metric in budget and result[metric] > budget[metric]
+    ]
+
+
+def with_headroom(result) -> dict:
+    return {
+        "queries": result["queries"],
+        "ms":      math.ceil(result["ms"] * TIME_HEADROOM),
+        "peak_kb": math.ceil(result["peak_kb"] * MEMORY_HEADROOM),
+    }
+
+
+def run(sizes, repeat, only, budgets_path, update):
+    budgets  = load_budgets(budgets_path)
+    cases    = [case for case in CASES if not only or any(word in case[0] for word in only)]
+    failures = []
+    missing  = 0
+
+    print(f"{'view':<34} {'size':>7} {'queries':>8} {'ms':>9} {'peak KB':>10}  budget")
+    with temporary_database(), override_settings(CHAT_LLM_PROVIDER="stub", CHAT_LLM_STUB_LATENCY_MS=0):
+        for size in sizes:
+            ds = Dataset(size)
+            for case in cases:
+                name   = case[0]
+                result = measure(ds, case, repeat)
+                over   = check(budgets, name, size, result)
+                known  = str(size) in budgets.get(name, {})
+                missing += not known
+                failures += over
+                print(
+                    f"{name:<34} {size:>7} {result['queries']:>8} {result['ms']:>9.2f} "
+                    f"{result['peak_kb']:>10.1f}  {'OVER' if over else 'ok' if known else '-'}"
+                )
+                if update:
+                    budgets.setdefault(name, {})[str(size)] = with_headroom(result)
+
+    if update:
+        budgets_path.write_text(json.dumps(budgets, indent=2, sort_keys=True) + "\n")
+        print(f"\nBudgets written to {budgets_path}")
+        return 0
+
+    if missing:
+        print(f"\n{missing} measurement(s) have no budget — run with --update to record them.")
+    if failures:
+        print("\nBudget exceeded:")
+        for line in failures:
+            print(f"  {line}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1_000, 10_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", nargs="+", help="Only run views whose name contains one of these words")
+    parser.add_argument("--budgets", type=Path, default=BUDGETS_FILE)
+    parser.add_argument("--update", action="store_true", help="Rewrite the budgets file from this run")
+    args = parser.parse_args()
+    sys.exit(run(args.sizes, args.repeat, args.only, args.budgets, args.update))
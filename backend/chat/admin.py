@@ -1,15 +1,25 @@
 from django.contrib import admin
+from django.db.models import Q
+
+from core.pagination import EstimatedCountPaginator
+from users.models import User
 from .models import ChatMessage
+from .search import text_matches
 
 
 @admin.register(ChatMessage)
 class ChatMessageAdmin(admin.ModelAdmin):
+    # Our largest table: every changelist query is bounded (see core/pagination.py)
     list_display = ['id', 'get_user_identifier', 'user_message_preview', 'created_at']
     list_filter = ['created_at']
-    search_fields = ['user_message', 'ai_response', 'user__email', 'session_id']
+    list_select_related = ['user']
+    search_fields = ['user_message']   # enables the search box; see get_search_results()
+    search_help_text = 'Words from the message or the answer, a user email or a visitor id.'
     readonly_fields = ['user', 'session_id', 'user_message', 'ai_response', 'created_at']
-    date_hierarchy = 'created_at'
+    ordering = ['-id']   # creation order, straight from the primary key index
     list_per_page = 50
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
     fieldsets = (
         ('User Information', {
@@ -20,6 +30,16 @@ class ChatMessageAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_search_results(self, request, queryset, search_term):
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        # Full-text index for the message text; exact, indexed lookups for the rest
+        match = text_matches(queryset, term) | Q(session_id=term)
+        if '@' in term:
+            match |= Q(user__in=User.all_objects.filter(email=term).values('pk'))
+        return queryset.filter(match), False
+
     def get_user_identifier(self, obj):
         if obj.user:
             return obj.user.email
@@ -0,0 +1,45 @@
+"""
+Stable ids for anonymous chat visitors, without server-side sessions.
+
+The id lives in a signed cookie (CHAT_VISITOR_COOKIE), so recognising a
+visitor costs no query and no session row is ever written.  ChatMessage
+keeps it in `session_id`.
+
+Visitors from before the cookie existed keep their history: their messages
+are keyed by their Django session key, which is adopted as their visitor id.
+"""
+
+import re
+import uuid
+
+from django.conf import settings
+
+SALT = "chat.visitor"
+_SESSION_KEY = re.compile(r"^[a-z0-9]{32}$")
+
+
+def visitor_id(request):
+    """The visitor id carried by this request, or None for a first-time visitor."""
+    value = request.get_signed_cookie(settings.CHAT_VISITOR_COOKIE, default=None, salt=SALT)
+    if value:
+        return value
+    legacy = request.COOKIES.get(settings.SESSION_COOKIE_NAME, "")
+    return legacy if _SESSION_KEY.match(legacy) else None
+
+
+def new_visitor_id() -> str:
+    return uuid.uuid4().hex
+
+
+def remember_visitor(response, visitor):
+    """(Re)issue the visitor cookie — every response extends its lifetime."""
+    response.set_signed_cookie(
+        settings.CHAT_VISITOR_COOKIE,
+        visitor,
+        salt=SALT,
+        max_age=settings.CHAT_VISITOR_COOKIE_MAX_AGE,
+        httponly=True,
+        secure=settings.JWT_AUTH_COOKIE_SECURE,
+        samesite=settings.JWT_AUTH_COOKIE_SAMESITE,
+        path=settings.JWT_AUTH_COOKIE_PATH,
+    )
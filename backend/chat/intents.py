@@ -0,0 +1,203 @@
+"""
+Answers simple, structured catalog questions without calling the LLM.
+
+    "products under $30"              price range   (max)
+    "anything over 100 dollars?"      price range   (min)
+    "show me items between 10 and 50" price range   (min + max)
+    "what does Acme sell"             business
+    "products from Acme under $20"    business + price range
+    "how much is the Blue Mug?"       name lookup
+    "do you have headphones"          name lookup
+
+Patterns are anchored to the whole message, so anything more open-ended
+("which of your mugs under $30 is best for tea?") doesn't match and goes to
+the LLM.  A name lookup without a match also falls through — the question
+may not have been about a product name at all.
+
+Names are matched as whole words ("pen" finds "Pen Set", not "Pencil"):
+exactly, then as the leading words of a name — both through the
+lower(name) indexes — and only then anywhere in the name, among the
+CHAT_FAST_PATH_SCAN_LIMIT newest products.
+"""
+
+import re
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Value
+from django.db.models.functions import Lower
+
+from monitoring.metrics import registry
+from products.models import Product
+from users.models import Business
+
+
+# ─── Parsing ─────────────────────────────────────────────────────────────────
+
+_LEAD  = (
+    r"(?:(?:can|could) you |please )?"
+    r"(?:(?:show|list|find|give|get)(?: me)?|do you have|are there|what are|what's|what is"
+    r"|i(?:'m| am) looking for|i (?:want|need)|any)?"
+)
+_NOUN  = r"(?:\s*(?:all|some|the|any|your))?(?:\s*(?:products?|items?|things?|stuff|options?))?"
+_PRICE = r"\$?\s*(\d+(?:\.\d{1,2})?)\s*(?:\$|dollars?|bucks|usd)?"
+_TAIL  = r"\s*(?:please)?\s*[?.!]*\s*$"
+
+_MAX   = rf"(?:under|below|less than|cheaper than|at most|up to|max(?:imum)?|<=?)\s*{_PRICE}(?:\s*or (?:less|under))?"
+_MIN   = rf"(?:over|above|more than|at least|min(?:imum)?|>=?)\s*{_PRICE}(?:\s*or (?:more|over))?"
+_RANGE = rf"(?:between|from)?\s*{_PRICE}\s*(?:-|to|and)\s*{_PRICE}"
+_FROM  = r"(?:from|by|at|sold by|made by)\s+(.+?)"
+
+_PRICE_QUESTION = re.compile(
+    rf"^{_LEAD}{_NOUN}(?:\s+{_FROM})?\s*(?:(?:that )?(?:cost(?:s|ing)?|priced)\s*)?(?:{_MAX}|{_MIN}|{_RANGE})"
+    rf"(?:\s+{_FROM})?{_TAIL}",
+    re.IGNORECASE,
+)
+_BUSINESS_QUESTIONS = [
+    re.compile(rf"^what (?:does|do) (.+?) (?:sell|offer|have|make){_TAIL}", re.IGNORECASE),
+    re.compile(rf"^{_LEAD}{_NOUN}\s+{_FROM}{_TAIL}", re.IGNORECASE),
+]
+_NAME_QUESTIONS = [
+    re.compile(rf"^how much (?:is|are|does|do)(?: the| an?)? (.+?)(?: cost)?{_TAIL}", re.IGNORECASE),
+    re.compile(rf"^(?:what(?:'s| is) the )?price (?:of|for)(?: the| an?)? (.+?){_TAIL}", re.IGNORECASE),
+    re.compile(rf"^do you (?:have|sell|carry)(?: an?| the| any)? (.+?){_TAIL}", re.IGNORECASE),
+]
+
+
+def parse(message):
+    """(intent, slots) for a recognised question, else None."""
+    text = " ".join(message.split())
+
+    match = _PRICE_QUESTION.match(text)
+    if match:
+        business_before, max_price, min_price, low, high, business_after = match.groups()
+        slots = {"business": business_before or business_after}
+        if max_price:
+            slots["max_price"] = Decimal(max_price)
+        elif min_price:
+            slots["min_price"] = Decimal(min_price)
+        else:
+            slots["min_price"], slots["max_price"] = sorted([Decimal(low), Decimal(high)])
+        return "price", slots
+
+    for pattern in _BUSINESS_QUESTIONS:
+        match = pattern.match(text)
+        if match:
+            return "business", {"business": match.group(1)}
+
+    for pattern in _NAME_QUESTIONS:
+        match = pattern.match(text)
+        if match:
+            return "name", {"name": match.group(1)}
+    return None
+
+
+# ─── Name matching ───────────────────────────────────────────────────────────
+
+def name_is(queryset, name):
+    """Case-insensitive equality, served by the lower(name) index."""
+    return queryset.alias(name_lower=Lower("name")).filter(name_lower=Lower(Value(name)))
+
+
+def name_starts_with(queryset, words):
+    """
+    Names whose leading words are `words`.  PostgreSQL: a LIKE prefix on the
+    text_pattern_ops index (its collation can't bound a range); elsewhere a
+    range scan of the lower(name) index.
+    """
+    queryset = queryset.alias(name_lower=Lower("name"))
+    if connections[queryset.db].vendor == "postgresql":
+        return queryset.filter(name_lower__startswith=words.lower() + " ")
+    # "words " ≤ name < "words!" — "!" is the character after " "
+    return queryset.filter(name_lower__gte=Lower(Value(words + " ")), name_lower__lt=Lower(Value(words + "!")))
+
+
+def name_contains(queryset, words, limit) -> list:
+    """Up to `limit` names with `words` anywhere in them — a scan, so bounded to the newest products."""
+    newest  = queryset.order_by("-created_at", "-id").values("pk")[:settings.CHAT_FAST_PATH_SCAN_LIMIT]
+    pattern = re.compile(rf"(?<!\w){re.escape(words)}(?!\w)", re.IGNORECASE)
+    candidates = queryset.filter(pk__in=newest, name__icontains=words).order_by("price", "id")
+    return [product for product in candidates if pattern.search(product.name)][:limit]
+
+
+# ─── Answering ───────────────────────────────────────────────────────────────
+
+def _line(product) -> str:
+    return f"- {product.name} — ${product.price} ({product.business.name})"
+
+
+def _listing(products, heading, empty):
+    limit = settings.CHAT_FAST_PATH_MAX_RESULTS
+    rows  = list(products[:limit + 1])   # one extra tells us whether there are more
+    if not rows:
+        return empty
+    lines = [heading] + [_line(p) for p in rows[:limit]]
+    if len(rows) > limit:
+        lines.append("…and more — try narrowing the price range.")
+    return "\n".join(lines)
+
+
+def _price_text(slots) -> str:
+    low, high = slots.get("min_price"), slots.get("max_price")
+    if low is not None and high is not None:
+        return f"between ${low} and ${high}"
+    if high is not None:
+        return f"under ${high}"
+    return f"over ${low}"
+
+
+def _answer(intent, slots):
+    approved = Product.objects.public().select_related("business")
+
+    business = None
+    if slots.get("business"):
+        # Exact name only — "from a friend" must not guess a business
+        business = name_is(Business.objects.all(), slots["business"].strip()).first()
+        if business is None:
+            return None
+        approved = approved.filter(business=business)
+
+    if intent == "price":
+        if "min_price" in slots:
+            approved = approved.filter(price__gte=slots["min_price"])
+        if "max_price" in slots:
+            approved = approved.filter(price__lte=slots["max_price"])
+        where = _price_text(slots) + (f" from {business.name}" if business else "")
+        return _listing(
+            approved.order_by("price", "id"),
+            f"Here's what we have {where}:",
+            f"Sorry, we don't have any products {where} right now.",
+        )
+
+    if intent == "business":
+        return _listing(
+            approved.order_by("-created_at", "-id"),
+            f"{business.name} currently offers:",
+            f"{business.name} doesn't have any products available right now.",
+        )
+
+    # Name lookup — an unknown name may not have been a product question at all
+    name  = slots["name"]
+    limit = settings.CHAT_FAST_PATH_MAX_RESULTS
+    products = (
+        list(name_is(approved, name)[:1])
+        or list(name_starts_with(approved, name).order_by("price", "id")[:limit])
+        or name_contains(approved, name, limit)
+    )
+    if not products:
+        return None
+    if len(products) == 1:
+        product = products[0]
+        return f"{product.name} costs ${product.price} and is sold by {product.business.name}."
+    return "\n".join([f"Here are the products matching \"{name}\":"] + [_line(p) for p in products])
+
+
+def answer(message):
+    """A templated reply from the catalog, or None → ask the LLM."""
+    parsed = parse(message)
+    intent = parsed[0] if parsed else "none"
+    reply  = _answer(*parsed) if parsed else None
+    if settings.METRICS_ENABLED:
+        registry.inc("chat_fast_path_total", (("intent", intent), ("result", "hit" if reply else "miss")))
+    return reply
@@ -0,0 +1,280 @@
+"""
+LLM providers behind the chat assistant, with the resilience policy around them.
+
+    completion = complete(messages, max_tokens=400, temperature=0.7)
+    completion.text, completion.input_tokens, completion.output_tokens
+
+CHAT_LLM_PROVIDER picks the backend:
+
+    openai   the OpenAI chat completions API (needs OPENAI_API_KEY)
+    stub     deterministic offline answers — tests, benchmarks, local dev
+
+Every call gets
+
+    - an overall deadline (CHAT_LLM_DEADLINE_SECONDS) and a per-attempt
+      timeout (CHAT_LLM_TIMEOUT_SECONDS) within it
+    - up to CHAT_LLM_MAX_RETRIES retries of transient failures (timeouts,
+      connection errors, 429, 5xx) with full-jitter exponential backoff
+    - a per-process circuit breaker: after CHAT_LLM_BREAKER_FAILURES transient
+      failures in a row, calls fail immediately for
+      CHAT_LLM_BREAKER_RESET_SECONDS, then a single probe call decides
+    - optionally a hedged request: if the first attempt hasn't answered
+      after CHAT_LLM_HEDGE_AFTER_SECONDS, a second identical one is sent and
+      whichever answers first wins (doubles cost on slow calls — off by default)
+
+Callers see LLMUnavailable when the upstream can't answer in time and
+LLMError for anything else.
+"""
+
+import contextvars
+import random
+import threading
+import time
+from concurrent import futures
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from monitoring.metrics import registry
+from monitoring.tracing import span
+from .prompt import count_tokens
+
+
+class LLMError(Exception):
+    retryable = False
+
+
+class LLMTransientError(LLMError):
+    """Timeouts, connection problems, rate limits, 5xx — worth retrying."""
+    retryable = True
+
+
+class LLMUnavailable(LLMError):
+    """Circuit open, deadline exceeded or retries exhausted."""
+
+
+class Completion:
+    __slots__ = ("text", "input_tokens", "output_tokens")
+
+    def __init__(self, text, input_tokens=None, output_tokens=None):
+        self.text          = text
+        self.input_tokens  = input_tokens
+        self.output_tokens = output_tokens
+
+
+# ─── Providers ───────────────────────────────────────────────────────────────
+
+class OpenAIProvider:
+    name = "openai"
+
+    def __init__(self):
+        if not settings.OPENAI_API_KEY:
+            raise ImproperlyConfigured("OPENAI_API_KEY not configured in settings")
+        import openai
+        self._openai = openai
+        # Retries and timeouts are ours; one client keeps connections alive between calls
+        self.client = openai.OpenAI(api_key=settings.OPENAI_API_KEY, max_retries=0)
+
+    def complete(self, messages, max_tokens, temperature, timeout) -> Completion:
+        openai = self._openai
+        try:
+            response = self.client.chat.completions.create(
+                model=settings.CHAT_MODEL,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                timeout=timeout,
+            )
+        except (openai.APITimeoutError, openai.APIConnectionError,
+                openai.RateLimitError, openai.InternalServerError) as exc:
+            raise LLMTransientError(str(exc)) from exc
+        except openai.OpenAIError as exc:
+            raise LLMError(str(exc)) from exc
+        usage = response.usage
+        return Completion(
+            response.choices[0].message.content,
+            usage.prompt_tokens if usage else None,
+            usage.completion_tokens if usage else None,
+        )
+
+
+class StubProvider:
+    """Answers instantly (or after CHAT_LLM_STUB_LATENCY_MS) from the prompt alone."""
+    name = "stub"
+
+    def complete(self, messages, max_tokens, temperature, timeout) -> Completion:
+        latency = settings.CHAT_LLM_STUB_LATENCY_MS / 1000
+        if latency:
+            time.sleep(min(latency, timeout))
+            if latency > timeout:
+                raise LLMTransientError("stub: timed out")
+        question = messages[-1]["content"]
+        products = sum(line.startswith("- ") for line in messages[0]["content"].splitlines())
+        text = (
+            f"(offline assistant) You asked: “{question}”. "
+            f"I can see {products} product(s) in the catalog right now."
+        )
+        input_tokens = sum(count_tokens(m["content"]) for m in messages)
+        return Completion(text, input_tokens, count_tokens(text))
+
+
+PROVIDERS = {"openai": OpenAIProvider, "stub": StubProvider}
+
+
+# ─── Circuit breaker ─────────────────────────────────────────────────────────
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold, reset_seconds):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds     = reset_seconds
+        self._failures  = 0
+        self._opened_at = None    # monotonic time the circuit opened
+        self._probing   = False   # half-open: one call is testing the upstream
+        self._lock      = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        return "half-open" if time.monotonic() - self._opened_at >= self.reset_seconds else "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._probing or time.monotonic() - self._opened_at < self.reset_seconds:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures, self._opened_at, self._probing = 0, None, False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._probing = False
+
+    def release(self):
+        """The call ended without telling us anything about the upstream."""
+        with self._lock:
+            self._probing = False
+
+
+# ─── Calling ─────────────────────────────────────────────────────────────────
+
+_provider = None
+_breakers = {}   # provider name → CircuitBreaker (survives provider resets)
+_hedge_pool = futures.ThreadPoolExecutor(max_workers=16, thread_name_prefix="llm-hedge")
+
+
+def get_provider():
+    global _provider
+    if _provider is None:
+        name = settings.CHAT_LLM_PROVIDER
+        if name not in PROVIDERS:
+            raise ImproperlyConfigured(f"Unknown CHAT_LLM_PROVIDER {name!r} (choose from {', '.join(PROVIDERS)})")
+        _provider = PROVIDERS[name]()
+    return _provider
+
+
+def get_breaker(provider) -> CircuitBreaker:
+    breaker = _breakers.get(provider.name)
+    if breaker is None:
+        breaker = _breakers.setdefault(provider.name, CircuitBreaker(
+            settings.CHAT_LLM_BREAKER_FAILURES, settings.CHAT_LLM_BREAKER_RESET_SECONDS,
+        ))
+    return breaker
+
+
+@receiver(setting_changed)
+def _reset_provider(setting, **kwargs):
+    global _provider
+    if setting.startswith("CHAT_LLM_") or setting == "OPENAI_API_KEY":
+        _provider = None
+        _breakers.clear()
+
+
+def _count(provider, outcome):
+    if settings.METRICS_ENABLED:
+        registry.inc("llm_calls_total", (("provider", provider.name), ("outcome", outcome)))
+
+
+def _submit(fn, *args):
+    # Carries the current trace into the pool thread
+    return _hedge_pool.submit(contextvars.copy_context().run, fn, *args)
+
+
+def _attempt(provider, messages, max_tokens, temperature, timeout) -> Completion:
+    hedge_after = settings.CHAT_LLM_HEDGE_AFTER_SECONDS
+    if not hedge_after or hedge_after >= timeout:
+        return provider.complete(messages, max_tokens, temperature, timeout)
+
+    args = (messages, max_tokens, temperature)
+    started = time.monotonic()
+    pending = [_submit(provider.complete, *args, timeout)]
+    done, _ = futures.wait(pending, timeout=hedge_after)
+    if not done:
+        _count(provider, "hedged")
+        pending.append(_submit(provider.complete, *args, timeout - hedge_after))
+
+    error = None
+    try:
+        for future in futures.as_completed(pending, timeout=timeout - (time.monotonic() - started)):
+            try:
+                return future.result()
+            except LLMError as exc:
+                error = exc   # the other request may still succeed
+    except futures.TimeoutError:
+        raise LLMTransientError(f"no answer within {timeout:.1f}s")
+    raise error
+
+
+def complete(messages, max_tokens=400, temperature=0.7) -> Completion:
+    provider = get_provider()
+    breaker  = get_breaker(provider)
+    deadline = time.monotonic() + settings.CHAT_LLM_DEADLINE_SECONDS
+
+    for attempt in range(settings.CHAT_LLM_MAX_RETRIES + 1):
+        if not breaker.allow():
+            _count(provider, "rejected")
+            raise LLMUnavailable("The AI service is failing; not calling it for a while.")
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            breaker.release()
+            break
+        timeout = min(settings.CHAT_LLM_TIMEOUT_SECONDS, remaining)
+
+        try:
+            with span("llm.attempt", {"attempt": attempt + 1, "timeout_s": round(timeout, 3)}):
+                completion = _attempt(provider, messages, max_tokens, temperature, timeout)
+        except LLMError as exc:
+            if not exc.retryable:
+                breaker.release()
+                _count(provider, "error")
+                raise
+            breaker.record_failure()
+            _count(provider, "transient_error")
+            last_error = exc
+        except Exception:
+            # A bug or an unwrapped client error: still end a half-open probe
+            breaker.record_failure()
+            _count(provider, "error")
+            raise
+        else:
+            breaker.record_success()
+            _count(provider, "ok")
+            return completion
+
+        if attempt < settings.CHAT_LLM_MAX_RETRIES:
+            # Full jitter, never sleeping past the deadline
+            delay = random.uniform(0, settings.CHAT_LLM_RETRY_BACKOFF_SECONDS * 2 ** attempt)
+            time.sleep(max(0.0, min(delay, deadline - time.monotonic())))
+    else:
+        raise LLMUnavailable(f"The AI service did not answer: {last_error}")
+    raise LLMUnavailable("The AI service did not answer in time.")
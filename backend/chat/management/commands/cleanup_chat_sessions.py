@@ -0,0 +1,44 @@
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from chat.models import ChatMessage
+from core.deletion import delete_in_batches
+
+
+# Before visitor cookies, messages of visitors without a saved session were
+# stored under this id — nobody can see them in their history any more
+UNATTRIBUTED = ["anonymous", ""]
+
+
+class Command(BaseCommand):
+    help = (
+        "Remove expired rows from the session table in small batches (anonymous chat no "
+        "longer creates sessions) and report — or with --delete-unattributed, delete — "
+        "anonymous chat messages that no visitor can see any more."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--delete-unattributed", action="store_true")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+
+        if settings.SESSION_ENGINE.endswith((".db", ".cached_db")):
+            expired = Session.objects.filter(expire_date__lt=timezone.now())
+            deleted = delete_in_batches(expired, batch_size)
+            self.stdout.write(f"Deleted {deleted} expired session(s); {Session.objects.count()} left.")
+
+        orphaned = ChatMessage.objects.filter(user=None, session_id__in=UNATTRIBUTED)
+        if options["delete_unattributed"]:
+            deleted = delete_in_batches(orphaned, batch_size)
+            self.stdout.write(f"Deleted {deleted} unattributed anonymous chat message(s).")
+        else:
+            count = orphaned.count()
+            if count:
+                self.stdout.write(
+                    f"{count} anonymous chat message(s) have no visitor id; "
+                    "rerun with --delete-unattributed to remove them."
+                )
@@ -0,0 +1,17 @@
+# Generated by Django 6.0.2 on 2026-02-17 17:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='chatmessage',
+            index=models.Index(fields=['session_id', '-created_at'], name='chat_session_created_idx'),
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 6.0.2 on 2026-02-17 18:10
+#
+# Full-text search for chat/search.py.  Careful on SQLite: a later migration
+# that makes Django rebuild chat_chatmessage also drops these triggers — run
+# this migration's SQL again after one.
+
+from django.db import migrations, OperationalError
+
+
+SQLITE = [
+    """CREATE VIRTUAL TABLE chat_chatmessage_fts USING fts5(
+        user_message, ai_response, content='chat_chatmessage', content_rowid='id'
+    )""",
+    """CREATE TRIGGER chat_chatmessage_fts_insert AFTER INSERT ON chat_chatmessage BEGIN
+        INSERT INTO chat_chatmessage_fts(rowid, user_message, ai_response)
+        VALUES (new.id, new.user_message, new.ai_response);
+    END""",
+    """CREATE TRIGGER chat_chatmessage_fts_delete AFTER DELETE ON chat_chatmessage BEGIN
+        INSERT INTO chat_chatmessage_fts(chat_chatmessage_fts, rowid, user_message, ai_response)
+        VALUES ('delete', old.id, old.user_message, old.ai_response);
+    END""",
+    """CREATE TRIGGER chat_chatmessage_fts_update AFTER UPDATE ON chat_chatmessage BEGIN
+        INSERT INTO chat_chatmessage_fts(chat_chatmessage_fts, rowid, user_message, ai_response)
+        VALUES ('delete', old.id, old.user_message, old.ai_response);
+        INSERT INTO chat_chatmessage_fts(rowid, user_message, ai_response)
+        VALUES (new.id, new.user_message, new.ai_response);
+    END""",
+    "INSERT INTO chat_chatmessage_fts(chat_chatmessage_fts) VALUES ('rebuild')",
+]
+SQLITE_REVERSE = [
+    "DROP TRIGGER IF EXISTS chat_chatmessage_fts_insert",
+    "DROP TRIGGER IF EXISTS chat_chatmessage_fts_delete",
+    "DROP TRIGGER IF EXISTS chat_chatmessage_fts_update",
+    "DROP TABLE IF EXISTS chat_chatmessage_fts",
+]
+POSTGRES = [
+    "CREATE INDEX chat_message_search_idx ON chat_chatmessage "
+    "USING gin (to_tsvector('simple', user_message || ' ' || ai_response))",
+]
+POSTGRES_REVERSE = ["DROP INDEX IF EXISTS chat_message_search_idx"]
+
+
+def create_search(apps, schema_editor):
+    statements = {"sqlite": SQLITE, "postgresql": POSTGRES}.get(schema_editor.connection.vendor, [])
+    try:
+        for sql in statements:
+            schema_editor.execute(sql)
+    except OperationalError:
+        if schema_editor.connection.vendor != "sqlite":
+            raise
+        # SQLite built without FTS5: search falls back to LIKE
+
+
+def drop_search(apps, schema_editor):
+    statements = {"sqlite": SQLITE_REVERSE, "postgresql": POSTGRES_REVERSE}.get(schema_editor.connection.vendor, [])
+    for sql in statements:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0002_chatmessage_session_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search, drop_search),
+    ]
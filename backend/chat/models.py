@@ -16,6 +16,10 @@ class ChatMessage(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # History of an anonymous visitor (session_id is their visitor id)
+            models.Index(fields=['session_id', '-created_at'], name='chat_session_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user or self.session_id} - {self.created_at}"
\ No newline at end of file
@@ -0,0 +1,156 @@
+"""
+Token-budgeted prompt assembly for the chat assistant.
+
+The prompt for one LLM call is packed into CHAT_PROMPT_TOKEN_BUDGET:
+
+    1. instructions + the new user message                  always
+    2. product context, newest first                        up to CHAT_PRODUCT_CONTEXT_SHARE of what's left
+    3. earlier turns of this conversation, newest first     whatever is left
+    4. turns that no longer fit are condensed into a short  "Earlier, the user asked about: …"
+       note (or dropped once even that doesn't fit)
+
+Tokens are counted with tiktoken when it is installed, otherwise estimated
+locally (slightly high, so the budget is never exceeded in practice).
+"""
+
+import math
+import re
+
+from django.conf import settings
+
+from products.models import Product
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - optional dependency
+    tiktoken = None
+
+
+SYSTEM_PROMPT = """You are a helpful product assistant for an e-commerce marketplace. Answer questions about these approved products:
+
+{products}
+
+Instructions:
+- Be concise and friendly
+- If asked about products not in the list, politely say they're not currently available
+- When recommending products, mention the price and business name
+- If asked about price ranges, filter and list matching products
+- Keep responses under 200 words"""
+
+MESSAGE_OVERHEAD = 4    # role + separators per chat message
+SUMMARY_CHARS    = 60   # per condensed earlier question
+SUMMARY_TOKENS   = 120  # kept free for the note when not every turn fits
+
+
+# ─── Token counting ──────────────────────────────────────────────────────────
+
+_encoding = None
+_PIECES = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+
+
+def count_tokens(text) -> int:
+    global _encoding
+    if tiktoken is not None:
+        if _encoding is None:
+            try:
+                _encoding = tiktoken.encoding_for_model(settings.CHAT_MODEL)
+            except KeyError:
+                _encoding = tiktoken.get_encoding("o200k_base")
+        return len(_encoding.encode(text))
+    # Offline estimate: ~4 characters per token for words, one per symbol
+    return sum(math.ceil(len(piece) / 4) for piece in _PIECES.findall(text))
+
+
+# ─── Assembly ────────────────────────────────────────────────────────────────
+
+class Prompt:
+    def __init__(self, messages, usage):
+        self.messages = messages   # OpenAI chat "messages"
+        self.usage    = usage      # token accounting, see build_prompt()
+
+
+def product_lines():
+    """Catalog context lines, newest first (lazily, so a big catalog isn't loaded whole)."""
+    rows = (
+        Product.objects.public()
+        .order_by("-created_at", "-id")
+        .values_list("name", "description", "price", "business__name")
+    )
+    for name, description, price, business in rows[:settings.CHAT_PRODUCT_CONTEXT_MAX].iterator(chunk_size=100):
+        yield f"- {name}: {description} | Price: ${price} | Business: {business}"
+
+
+def _summary(turns) -> str:
+    questions = []
+    for user_message, _ in turns:
+        text = " ".join(user_message.split())
+        questions.append(text if len(text) <= SUMMARY_CHARS else text[:SUMMARY_CHARS - 1] + "…")
+    return "Earlier in this conversation, the user asked about: " + "; ".join(questions)
+
+
+def build_prompt(user_message, history=(), products=None, budget=None) -> Prompt:
+    """
+    `history` is the conversation so far as (user_message, ai_response) pairs,
+    oldest first; `products` the context lines (default: product_lines()).
+    """
+    budget   = budget or settings.CHAT_PROMPT_TOKEN_BUDGET
+    products = product_lines() if products is None else products
+
+    fixed = (
+        count_tokens(SYSTEM_PROMPT.format(products="")) + MESSAGE_OVERHEAD
+        + count_tokens(user_message) + MESSAGE_OVERHEAD
+    )
+    remaining = budget - fixed
+
+    # Product context
+    product_budget = int(max(remaining, 0) * settings.CHAT_PRODUCT_CONTEXT_SHARE)
+    included, product_tokens = [], 0
+    for line in products:
+        cost = count_tokens(line) + 1   # newline
+        if product_tokens + cost > product_budget:
+            break
+        included.append(line)
+        product_tokens += cost
+    remaining -= product_tokens
+
+    # Conversation, newest turn first
+    history = list(history)
+    costs   = [count_tokens(u) + count_tokens(a) + 2 * MESSAGE_OVERHEAD for u, a in history]
+    history_budget = remaining if sum(costs) <= remaining else remaining - SUMMARY_TOKENS
+    turns, history_tokens = [], 0
+    for turn, cost in zip(reversed(history), reversed(costs)):
+        if history_tokens + cost > history_budget:
+            break
+        turns.append(turn)
+        history_tokens += cost
+    turns.reverse()
+    remaining -= history_tokens
+
+    # Older turns: a one-line note if it fits, otherwise they are dropped
+    older, summary, summary_tokens = history[:len(history) - len(turns)], None, 0
+    while older:
+        summary = _summary(older)
+        summary_tokens = count_tokens(summary) + MESSAGE_OVERHEAD
+        if summary_tokens <= remaining:
+            break
+        older, summary, summary_tokens = older[1:], None, 0   # forget the oldest first
+
+    messages = [{"role": "system", "content": SYSTEM_PROMPT.format(products="\n".join(included))}]
+    if summary:
+        messages.append({"role": "system", "content": summary})
+    for user_text, ai_text in turns:
+        messages += [{"role": "user", "content": user_text}, {"role": "assistant", "content": ai_text}]
+    messages.append({"role": "user", "content": user_message})
+
+    usage = {
+        "budget":            budget,
+        "total":             fixed + product_tokens + history_tokens + summary_tokens,
+        "products":          len(included),
+        "product_tokens":    product_tokens,
+        "turns":             len(turns),
+        "history_tokens":    history_tokens,
+        "summarized_turns":  len(older),
+        "dropped_turns":     len(history) - len(turns) - len(older),
+        "exact":             tiktoken is not None,
+    }
+    return Prompt(messages, usage)
@@ -0,0 +1,51 @@
+"""
+Full-text search over chat messages, used by the admin.
+
+    SQLite      an FTS5 table, chat_chatmessage_fts, kept in step by triggers
+    PostgreSQL  a GIN index over the to_tsvector() of both message columns
+
+Both are created by migration 0003.  Elsewhere (or on an SQLite built
+without FTS5) search falls back to a LIKE scan.
+"""
+
+import re
+
+from django.db import connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = "chat_chatmessage_fts"
+PG_DOCUMENT = "to_tsvector('simple', user_message || ' ' || ai_response)"
+
+_WORDS = re.compile(r"\w+", re.UNICODE)
+_has_fts = {}   # database alias → FTS5 table present
+
+
+def _sqlite_fts(connection) -> bool:
+    if connection.alias not in _has_fts:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE name = %s", [FTS_TABLE])
+            _has_fts[connection.alias] = cursor.fetchone() is not None
+    return _has_fts[connection.alias]
+
+
+def text_matches(queryset, term):
+    """A Q() for messages whose user message or AI response contain every word of `term`."""
+    words = _WORDS.findall(term)
+    if not words:
+        return Q(pk__in=[])
+    connection = connections[queryset.db]
+
+    if connection.vendor == "sqlite" and _sqlite_fts(connection):
+        query = " ".join('"%s"' % word for word in words)   # quoted: FTS5 syntax is not for end users
+        return Q(pk__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [query]))
+    if connection.vendor == "postgresql":
+        table = queryset.model._meta.db_table
+        return Q(pk__in=RawSQL(
+            f"SELECT id FROM {table} WHERE {PG_DOCUMENT} @@ plainto_tsquery('simple', %s)", [" ".join(words)],
+        ))
+
+    match = Q()
+    for word in words:
+        match &= Q(user_message__icontains=word) | Q(ai_response__icontains=word)
+    return match
@@ -1,3 +1,391 @@
-from django.test import TestCase
+import io
+import time
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.sessions.models import Session
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.pagination import EstimatedCountPaginator
+from monitoring.metrics import registry
+from products.models import Product, ProductStatus
+from users.models import Business, Role, User
+from . import llm
+from .intents import name_contains, name_is, name_starts_with, parse
+from .models import ChatMessage
+from .prompt import build_prompt, count_tokens
+
+
+class IntentParserTests(SimpleTestCase):
+    def test_recognised_questions(self):
+        cases = {
+            "products under $30":                  ("price", {"business": None, "max_price": Decimal("30")}),
+            "Show me items between 50 and 10?":    ("price", {"business": None, "min_price": Decimal("10"), "max_price": Decimal("50")}),
+            "anything over 100 dollars":           ("price", {"business": None, "min_price": Decimal("100")}),
+            "things under 30 from Acme Corp":      ("price", {"business": "Acme Corp", "max_price": Decimal("30")}),
+            "What does Acme Corp sell?":           ("business", {"business": "Acme Corp"}),
+            "how much is the Blue Mug?":           ("name", {"name": "Blue Mug"}),
+            "do you have  headphones":             ("name", {"name": "headphones"}),
+        }
+        for message, expected in cases.items():
+            self.assertEqual(parse(message), expected, message)
+
+    def test_open_ended_questions_are_left_to_the_llm(self):
+        for message in ["Which of your mugs under $30 is best for tea?", "Tell me a joke",
+                        "What's a good gift under $30 for my mom?"]:
+            self.assertIsNone(parse(message), message)
+
+
+@override_settings(METRICS_ENABLED=True, CHAT_FAST_PATH_MAX_RESULTS=2)
+@mock.patch("chat.views.ChatView._get_ai_response", return_value="From the LLM")
+class ChatFastPathTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        acme = Business.objects.create(name="Acme Corp", email="acme@example.com")
+        for name, price in [("Blue Mug", "12.00"), ("Red Mug", "18.50"), ("Teapot", "45.00")]:
+            Product.objects.create(name=name, price=Decimal(price), status=ProductStatus.APPROVED, business=acme)
+        Product.objects.create(name="Secret Mug", price=Decimal("1.00"), business=acme)   # draft
+
+    def setUp(self):
+        registry.clear()
+
+    def ask(self, message):
+        response = self.client.post("/api/chat/", {"message": message}, content_type="application/json")
+        self.assertEqual(response.status_code, 200)
+        return response.json()["ai_response"]
+
+    def hits(self, intent, result):
+        return registry.snapshot()["counters"].get(("chat_fast_path_total", (("intent", intent), ("result", result))), 0)
+
+    def test_price_range(self, llm):
+        self.assertEqual(self.ask("products under $20"), "\n".join([
+            "Here's what we have under $20:",
+            "- Blue Mug — $12.00 (Acme Corp)",
+            "- Red Mug — $18.50 (Acme Corp)",
+        ]))
+        self.assertEqual(self.ask("anything over $100?"), "Sorry, we don't have any products over $100 right now.")
+        llm.assert_not_called()
+        self.assertEqual(self.hits("price", "hit"), 2)
+
+    def test_business_and_name(self, llm):
+        self.assertTrue(self.ask("what does acme corp sell?").endswith("…and more — try narrowing the price range."))
+        self.assertEqual(self.ask("How much is the teapot?"), "Teapot costs $45.00 and is sold by Acme Corp.")
+        llm.assert_not_called()
+
+    def test_falls_through_to_the_llm(self, llm):
+        for message in ["Which mug is best for tea?", "what does Globex sell?", "do you have the secret mug"]:
+            self.assertEqual(self.ask(message), "From the LLM")
+        self.assertEqual(llm.call_count, 3)
+        self.assertEqual((self.hits("none", "miss"), self.hits("business", "miss"), self.hits("name", "miss")), (1, 1, 1))
+
+    @override_settings(CHAT_FAST_PATH_ENABLED=False)
+    def test_can_be_disabled(self, llm):
+        self.assertEqual(self.ask("products under $20"), "From the LLM")
+
+
+class NameMatchingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        business = Business.objects.create(name="Acme Corp", email="acme@example.com")
+        for price, name in enumerate(["Pencil", "Pen Set", "Blue Pen", "Pen", "Fountain Pen Refill"], start=1):
+            Product.objects.create(name=name, price=Decimal(price), status=ProductStatus.APPROVED, business=business)
+
+    def names(self, products):
+        return [p.name for p in products]
+
+    def test_whole_words_only(self):
+        products = Product.objects.all()
+        self.assertEqual(self.names(name_is(products, "PEN")), ["Pen"])
+        self.assertEqual(self.names(name_starts_with(products, "pen")), ["Pen Set"])
+        self.assertEqual(self.names(name_contains(products, "pen", 10)), ["Pen Set", "Blue Pen", "Pen", "Fountain Pen Refill"])
+        self.assertEqual(self.names(name_contains(products, "pen", 2)), ["Pen Set", "Blue Pen"])
+        self.assertEqual(name_is(Business.objects.all(), "acme corp").get().name, "Acme Corp")
+
+    @override_settings(CHAT_FAST_PATH_SCAN_LIMIT=2)
+    def test_substring_fallback_is_bounded(self):
+        self.assertEqual(self.names(name_contains(Product.objects.all(), "pen", 10)), ["Pen", "Fountain Pen Refill"])
+
+    def test_lookups_use_the_lower_name_indexes(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("SQLite query plans")
+        self.assertIn("product_name_lower_idx", name_is(Product.objects.all(), "pen").explain())
+        self.assertIn("product_name_lower_idx", name_starts_with(Product.objects.all(), "pen").explain())
+        self.assertIn("business_name_lower_idx", name_is(Business.objects.all(), "acme").explain())
+
+
+class PromptAssemblyTests(SimpleTestCase):
+    products = [f"- Product {i}: A fine product | Price: $10.00 | Business: Acme" for i in range(500)]
+
+    def test_stays_within_budget(self):
+        history = [(f"Question {i} about mugs and teapots?", "An answer " * 40) for i in range(30)]
+        prompt = build_prompt("What about cups?", history, self.products, budget=1500)
+        usage  = prompt.usage
+        self.assertLessEqual(usage["total"], 1500)
+        self.assertGreater(usage["products"], 0)
+        self.assertLess(usage["products"], 500)
+        self.assertGreater(usage["turns"], 0)
+        self.assertEqual(usage["turns"] + usage["summarized_turns"] + usage["dropped_turns"], 30)
+        counted = sum(count_tokens(m["content"]) + 4 for m in prompt.messages)
+        self.assertLessEqual(counted, usage["total"])
+
+        # Newest turns are kept verbatim, older ones condensed into a note
+        self.assertEqual(prompt.messages[-1], {"role": "user", "content": "What about cups?"})
+        self.assertEqual(prompt.messages[-3]["content"], "Question 29 about mugs and teapots?")
+        self.assertTrue(prompt.messages[1]["content"].startswith("Earlier in this conversation"))
+
+    def test_small_conversation_is_sent_whole(self):
+        prompt = build_prompt("And the red one?", [("How much is the blue mug?", "$12.")], self.products[:3], budget=3000)
+        self.assertEqual(prompt.usage["products"], 3)
+        self.assertEqual([m["role"] for m in prompt.messages], ["system", "user", "assistant", "user"])
+
+
+class ChatConversationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        business = Business.objects.create(name="Acme Corp", email="acme@example.com")
+        cls.user = User.objects.create_user(
+            email="viewer@acme.com", password="password123", role=Role.VIEWER, business=business,
+        )
+        Product.objects.create(name="Blue Mug", price=Decimal("12.00"), status=ProductStatus.APPROVED, business=business)
+        ChatMessage.objects.create(user=cls.user, user_message="Do you sell mugs?", ai_response="Yes, the Blue Mug.")
+        ChatMessage.objects.create(session_id="anonymous", user_message="Someone else's question", ai_response="...")
+
+    def send(self):
+        with mock.patch("chat.views.ChatView._get_ai_response", return_value="It's blue.") as llm:
+            self.client.post("/api/chat/", {"message": "What colour is it?"}, content_type="application/json")
+        [messages], _ = llm.call_args
+        return messages
+
+    def test_includes_the_users_earlier_turns(self):
+        self.client.cookies["access_token"] = str(RefreshToken.for_user(self.user).access_token)
+        messages = self.send()
+        self.assertIn("- Blue Mug:", messages[0]["content"])
+        self.assertEqual([m["content"] for m in messages[1:]], ["Do you sell mugs?", "Yes, the Blue Mug.", "What colour is it?"])
+
+    def test_anonymous_without_session_gets_no_history(self):
+        self.assertEqual(len(self.send()), 2)
+
+
+class FakeProvider:
+    name = "fake"
+
+    def __init__(self, *outcomes, delay=0):
+        self.outcomes = list(outcomes)   # exceptions to raise, then answers
+        self.delay    = delay
+        self.calls    = 0
+
+    def complete(self, messages, max_tokens, temperature, timeout):
+        self.calls += 1
+        outcome = self.outcomes.pop(0) if self.outcomes else "ok"
+        if self.delay:
+            time.sleep(self.delay if self.calls == 1 else 0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return llm.Completion(outcome, 10, 2)
+
+
+@override_settings(
+    CHAT_LLM_PROVIDER="stub", CHAT_LLM_RETRY_BACKOFF_SECONDS=0, CHAT_LLM_MAX_RETRIES=2,
+    CHAT_LLM_BREAKER_FAILURES=3, CHAT_LLM_BREAKER_RESET_SECONDS=60,
+)
+class LLMProviderTests(SimpleTestCase):
+    messages = [{"role": "system", "content": "- Mug: nice"}, {"role": "user", "content": "Hi"}]
+
+    def use(self, provider):
+        patcher = mock.patch("chat.llm.get_provider", return_value=provider)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return provider
+
+    def test_retries_transient_errors(self):
+        provider = self.use(FakeProvider(llm.LLMTransientError("502"), llm.LLMTransientError("timeout"), "Hello"))
+        self.assertEqual(llm.complete(self.messages).text, "Hello")
+        self.assertEqual(provider.calls, 3)
+
+    def test_does_not_retry_other_errors(self):
+        provider = self.use(FakeProvider(llm.LLMError("400 bad request")))
+        with self.assertRaises(llm.LLMError):
+            llm.complete(self.messages)
+        self.assertEqual(provider.calls, 1)
+
+    def test_breaker_fails_fast_then_probes(self):
+        provider = self.use(FakeProvider(*[llm.LLMTransientError("down")] * 3))
+        with self.assertRaises(llm.LLMUnavailable):
+            llm.complete(self.messages)
+        with self.assertRaises(llm.LLMUnavailable):
+            llm.complete(self.messages)
+        self.assertEqual(provider.calls, 3)   # the second call never reached the provider
+
+        breaker = llm.get_breaker(provider)
+        self.assertEqual(breaker.state, "open")
+        breaker._opened_at -= 60
+        self.assertEqual(llm.complete(self.messages).text, "ok")   # probe succeeds → closed
+        self.assertEqual(breaker.state, "closed")
+
+    def test_unexpected_error_ends_the_probe(self):
+        provider = self.use(FakeProvider(*[llm.LLMTransientError("down")] * 3, KeyError("choices")))
+        with self.assertRaises(llm.LLMUnavailable):
+            llm.complete(self.messages)
+        breaker = llm.get_breaker(provider)
+        breaker._opened_at -= 60   # half-open
+        with self.assertRaises(KeyError):
+            llm.complete(self.messages)
+        self.assertEqual(breaker.state, "open")   # the probe failed, not stuck
+        breaker._opened_at -= 60
+        self.assertEqual(llm.complete(self.messages).text, "ok")
+        self.assertEqual(breaker.state, "closed")
+
+    @override_settings(CHAT_LLM_HEDGE_AFTER_SECONDS=0.05)
+    def test_hedged_request_wins_when_the_first_is_slow(self):
+        provider = self.use(FakeProvider("slow", "fast", delay=0.5))
+        started = time.monotonic()
+        self.assertEqual(llm.complete(self.messages).text, "fast")
+        self.assertLess(time.monotonic() - started, 0.4)
+
+    @override_settings(CHAT_LLM_DEADLINE_SECONDS=0.2, CHAT_LLM_TIMEOUT_SECONDS=0.1, CHAT_LLM_STUB_LATENCY_MS=150)
+    def test_deadline(self):
+        started = time.monotonic()
+        with self.assertRaises(llm.LLMUnavailable):
+            llm.complete(self.messages)
+        self.assertLess(time.monotonic() - started, 0.5)
+
+    def test_stub_is_deterministic(self):
+        first, second = llm.complete(self.messages), llm.complete(self.messages)
+        self.assertEqual(first.text, second.text)
+        self.assertIn("1 product(s)", first.text)
+
+
+@override_settings(CHAT_LLM_PROVIDER="stub")
+class ChatProviderTests(TestCase):
+    def ask(self, message="Which one is best?"):
+        return self.client.post("/api/chat/", {"message": message}, content_type="application/json")
+
+    def test_whole_path_with_stub_provider(self):
+        response = self.ask()
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()["ai_response"].startswith("(offline assistant) You asked: “Which one is best?”"))
+
+    def test_unavailable_upstream_is_a_503(self):
+        with mock.patch("chat.llm.complete", side_effect=llm.LLMUnavailable("down")):
+            response = self.ask()
+        self.assertEqual(response.status_code, 503)
+        self.assertFalse(ChatMessage.objects.exists())
+
+    @override_settings(CHAT_LLM_PROVIDER="openai", OPENAI_API_KEY="")
+    def test_missing_api_key(self):
+        response = self.ask()
+        self.assertEqual(response.status_code, 500)
+        self.assertIn("OPENAI_API_KEY", response.json()["error"])
+
+
+@override_settings(CHAT_LLM_PROVIDER="stub")
+class AnonymousVisitorTests(TestCase):
+    def ask(self, message):
+        return self.client.post("/api/chat/", {"message": message}, content_type="application/json")
+
+    def visitor(self):
+        value, _timestamp, _signature = self.client.cookies["chat_visitor"].value.split(":")
+        return value
+
+    def test_cookie_gives_a_stable_identity_without_sessions(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.ask("Tell me a joke")
+            visitor = self.visitor()
+            self.ask("Another one")
+            history = self.client.get("/api/chat/history/").json()
+        self.assertFalse([q for q in queries if "django_session" in q["sql"]])
+        self.assertEqual([m["user_message"] for m in history], ["Another one", "Tell me a joke"])
+        self.assertEqual(self.visitor(), visitor)   # re-signed on every response, same id
+        self.assertEqual(set(ChatMessage.objects.values_list("session_id", flat=True)), {ChatMessage.objects.first().session_id})
+
+        # A new visitor sees nothing of it, with no query at all
+        self.client.cookies.clear()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get("/api/chat/history/").json(), [])
+
+    def test_tampered_cookie_is_ignored(self):
+        self.ask("Tell me a joke")
+        self.client.cookies["chat_visitor"] = "someone-else:forged"
+        self.assertEqual(self.client.get("/api/chat/history/").json(), [])
+
+    def test_legacy_session_key_keeps_its_history(self):
+        key = "a" * 32
+        ChatMessage.objects.create(session_id=key, user_message="Old question", ai_response="Old answer")
+        self.client.cookies["sessionid"] = key
+        self.assertEqual(self.client.get("/api/chat/history/").json()[0]["user_message"], "Old question")
+        self.ask("New question")
+        self.assertEqual(ChatMessage.objects.filter(session_id=key).count(), 2)
+
+    def test_cleanup_command(self):
+        Session.objects.create(session_key="old", session_data="", expire_date=timezone.now() - timedelta(days=1))
+        Session.objects.create(session_key="new", session_data="", expire_date=timezone.now() + timedelta(days=1))
+        ChatMessage.objects.create(session_id="anonymous", user_message="?", ai_response="!")
+        ChatMessage.objects.create(session_id="b" * 32, user_message="?", ai_response="!")
+
+        out = io.StringIO()
+        call_command("cleanup_chat_sessions", batch_size=1, stdout=out)
+        self.assertIn("1 anonymous chat message(s) have no visitor id", out.getvalue())
+        self.assertEqual(list(Session.objects.values_list("session_key", flat=True)), ["new"])
+
+        call_command("cleanup_chat_sessions", delete_unattributed=True, stdout=out)
+        self.assertEqual(list(ChatMessage.objects.values_list("session_id", flat=True)), ["b" * 32])
+
+
+class ChatAdminTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_superuser(
+            email="root@example.com", password="password123", first_name="Root", last_name="Admin",
+        )
+        cls.viewer = User.objects.create_user(
+            email="viewer@acme.com", password="password123", first_name="Vic", last_name="Viewer",
+        )
+        ChatMessage.objects.bulk_create(
+            [ChatMessage(user=cls.viewer, user_message=f"Question {i}", ai_response="Try the mugs") for i in range(30)]
+            + [ChatMessage(session_id="b" * 32, user_message="Any teapots?", ai_response="Yes, ceramic teapots.")]
+        )
+
+    def setUp(self):
+        self.client.force_login(self.staff)
+
+    def changelist(self, **params):
+        response = self.client.get("/admin/chat/chatmessage/", params)
+        self.assertEqual(response.status_code, 200)
+        return [row.user_message for row in response.context["cl"].result_list]
+
+    def test_changelist_query_count_does_not_grow_with_rows(self):
+        with CaptureQueriesContext(connection) as small:
+            self.changelist()
+        ChatMessage.objects.bulk_create([ChatMessage(user=self.viewer, user_message="More", ai_response="!")] * 100)
+        with CaptureQueriesContext(connection) as large:
+            self.assertEqual(len(self.changelist()), 50)
+        self.assertEqual(len(large), len(small))
+
+    def test_search_uses_text_index_and_exact_ids(self):
+        self.assertEqual(self.changelist(q="ceramic"), ["Any teapots?"])
+        self.assertEqual(self.changelist(q="b" * 32), ["Any teapots?"])
+        self.assertEqual(len(self.changelist(q="viewer@acme.com")), 30)
+        self.assertEqual(self.changelist(q="question 7"), ["Question 7"])
+
+        # The index follows updates and deletes
+        ChatMessage.objects.filter(user_message="Any teapots?").update(ai_response="Only kettles.")
+        self.assertEqual(self.changelist(q="ceramic"), [])
+        self.assertEqual(self.changelist(q="kettles"), ["Any teapots?"])
+        ChatMessage.objects.filter(user_message="Any teapots?").delete()
+        self.assertEqual(self.changelist(q="kettles"), [])
+
+    @override_settings(ADMIN_LIST_MAX_ROWS=20)
+    def test_paginator_estimates_and_caps(self):
+        everything = EstimatedCountPaginator(ChatMessage.objects.order_by("-id"), 10)
+        self.assertEqual(everything.count, ChatMessage.objects.latest("id").pk)   # estimate, no COUNT(*)
+        self.assertEqual(everything.num_pages, 2)
+
+        filtered = EstimatedCountPaginator(ChatMessage.objects.filter(user=self.viewer).order_by("-id"), 10)
+        self.assertEqual((filtered.count, filtered.num_pages), (20, 2))
@@ -4,10 +4,14 @@ from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import AllowAny
 from django.conf import settings
-from products.models import Product, ProductStatus
+from . import llm
+from .identity import new_visitor_id, remember_visitor, visitor_id
+from .intents import answer
 from .models import ChatMessage
+from .prompt import build_prompt
 from .serializers import ChatMessageSerializer
-import openai 
+from monitoring.metrics import registry
+from monitoring.tracing import CLIENT, span
 
 class ChatView(APIView):
     permission_classes = [AllowAny]  # IsAuthenticated if you want login required
@@ -21,71 +25,82 @@ class ChatView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # Get approved products from database
-        products = Product.objects.filter(status=ProductStatus.APPROVED)
-        
-        # Build context for AI
-        product_data = "\n".join([
-            f"- {p.name}: {p.description} | Price: ${p.price} | Business: {p.business_name}"
-            for p in products[:20]  # Limit to avoid token overflow
-        ])
-
-        # Call AI API
-        try:
-            ai_response = self._get_ai_response(user_message, product_data)
-        except Exception as e:
-            return Response(
-                {'error': f'AI service error: {str(e)}'},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
+        # Anonymous visitors are told apart by a signed cookie, not a session
+        user    = request.user if request.user.is_authenticated else None
+        visitor = None if user else (visitor_id(request) or new_visitor_id())
+
+        # Simple catalog questions ("under $30", "what does Acme sell") are
+        # answered straight from the database
+        ai_response = answer(user_message) if settings.CHAT_FAST_PATH_ENABLED else None
+
+        if ai_response is None:
+            # Product context + earlier turns, packed into CHAT_PROMPT_TOKEN_BUDGET
+            with span("chat.prompt") as current:
+                prompt = build_prompt(user_message, history=conversation(user, visitor))
+                for key, value in prompt.usage.items():
+                    current.set(f"chat.prompt.{key}", value)
+            if settings.METRICS_ENABLED:
+                registry.observe("chat_prompt_tokens", (), prompt.usage["total"])
+
+            # Call AI API
+            try:
+                ai_response = self._get_ai_response(prompt.messages)
+            except llm.LLMUnavailable:
+                return Response(
+                    {'error': 'The AI assistant is temporarily unavailable. Please try again shortly.'},
+                    status=status.HTTP_503_SERVICE_UNAVAILABLE
+                )
+            except Exception as e:
+                return Response(
+                    {'error': f'AI service error: {str(e)}'},
+                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                )
 
         # Save to database
         chat_message = ChatMessage.objects.create(
-            user=request.user if request.user.is_authenticated else None,
-            session_id=request.session.session_key or 'anonymous',
+            user=user,
+            session_id=visitor or '',
             user_message=user_message,
             ai_response=ai_response,
         )
 
-        return Response({
+        response = Response({
             'id': chat_message.id,
             'user_message': user_message,
             'ai_response': ai_response,
             'created_at': chat_message.created_at,
         })
+        if visitor:
+            remember_visitor(response, visitor)
+        return response
 
-    def _get_ai_response(self, user_message: str, product_data: str) -> str:
-        """Call OpenAI API"""
-        
-        if not settings.OPENAI_API_KEY:
-            raise ValueError("OPENAI_API_KEY not configured in settings")
-        
-        client = openai.OpenAI(api_key=settings.OPENAI_API_KEY)
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",  # Cheap and fast
-            messages=[
-                {
-                    "role": "system",
-                    "content": f"""You are a helpful product assistant for an e-commerce marketplace. Answer questions about these approved products:
-
-{product_data}
-
-Instructions:
-- Be concise and friendly
-- If asked about products not in the list, politely say they're not currently available
-- When recommending products, mention the price and business name
-- If asked about price ranges, filter and list matching products
-- Keep responses under 200 words"""
-                },
-                {
-                    "role": "user",
-                    "content": user_message
-                }
-            ],
-            max_tokens=400,
-            temperature=0.7,
-        )
-        return response.choices[0].message.content
+    def _get_ai_response(self, messages: list) -> str:
+        """Call the configured LLM provider (deadline, retries and breaker in chat/llm.py)"""
+        provider = llm.get_provider()
+        attributes = {"gen_ai.system": provider.name, "gen_ai.request.model": settings.CHAT_MODEL}
+        with span("llm.chat_completion", attributes, CLIENT) as current:
+            completion = llm.complete(messages, max_tokens=400, temperature=0.7)
+            if completion.input_tokens is not None:
+                current.set("gen_ai.usage.input_tokens", completion.input_tokens)
+                current.set("gen_ai.usage.output_tokens", completion.output_tokens)
+        return completion.text
+
+
+def chat_messages(user, visitor):
+    """The ChatMessage rows of a signed-in user or an anonymous visitor (None → nothing)."""
+    if user is not None:
+        return ChatMessage.objects.filter(user=user)
+    if visitor:
+        return ChatMessage.objects.filter(user=None, session_id=visitor)
+    return ChatMessage.objects.none()
+
+
+def conversation(user, visitor) -> list:
+    """Earlier (user_message, ai_response) turns, oldest first."""
+    if user is None and not visitor:
+        return []
+    turns = chat_messages(user, visitor).order_by("-created_at", "-id").values_list("user_message", "ai_response")
+    return list(reversed(turns[:settings.CHAT_HISTORY_MAX_TURNS]))
 
 
 class ChatHistoryView(APIView):
@@ -94,12 +109,12 @@ class ChatHistoryView(APIView):
 
     def get(self, request):
         if request.user.is_authenticated:
-            messages = ChatMessage.objects.filter(user=request.user)[:20]
+            messages = chat_messages(request.user, None)
         else:
-            session_id = request.session.session_key
-            if not session_id:
+            visitor = visitor_id(request)
+            if not visitor:
                 return Response([])
-            messages = ChatMessage.objects.filter(session_id=session_id)[:20]
+            messages = chat_messages(None, visitor)
 
-        serializer = ChatMessageSerializer(messages, many=True)
+        serializer = ChatMessageSerializer(messages[:20], many=True)
         return Response(serializer.data)
\ No newline at end of file
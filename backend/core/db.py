@@ -0,0 +1,79 @@
+"""
+Database helpers wired up by core/settings.py:
+
+    - SQLite tuning applied to every new connection (WAL, synchronous=NORMAL,
+      busy timeout) so concurrent readers don't block on the single writer.
+    - PrimaryReplicaRouter: reads go to a read replica, writes to "default".
+"""
+
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+# ─── SQLite ──────────────────────────────────────────────────────────────────
+
+@receiver(connection_created)
+def tune_sqlite(sender, connection, **kwargs):
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        # WAL lets readers proceed while a write is in progress (no-op for :memory:)
+        cursor.execute("PRAGMA journal_mode=WAL;")
+        # Safe with WAL: only the last transactions can be lost on power failure
+        cursor.execute("PRAGMA synchronous=NORMAL;")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)};")
+
+
+# ─── Read replicas ───────────────────────────────────────────────────────────
+
+_pinned = ContextVar("pinned_to_primary", default=False)
+
+
+@contextmanager
+def use_primary():
+    """Send every read inside the block to the primary (read-your-writes)."""
+    token = _pinned.set(True)
+    try:
+        yield
+    finally:
+        _pinned.reset(token)
+
+
+def replica_aliases() -> list:
+    return [alias for alias in settings.DATABASES if alias.startswith("replica")]
+
+
+class PrimaryReplicaRouter:
+    """
+    Spreads reads across the replicaN aliases and sends writes to "default".
+
+    Reads stay on the primary when inside `use_primary()` (ReplicaPinningMiddleware
+    does this for every unsafe request), or when they follow a relation from an
+    object that was itself loaded from a given database.
+    """
+
+    def __init__(self):
+        self.replicas = replica_aliases()
+
+    def db_for_read(self, model, **hints):
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db:
+            return instance._state.db
+        if _pinned.get() or not self.replicas:
+            return "default"
+        return random.choice(self.replicas)
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas mirror the primary, so objects from any alias can be related
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == "default"
@@ -0,0 +1,59 @@
+"""
+Helpers for deleting large amounts of data without long transactions.
+
+    class BusinessManager(HidePendingDeletion, models.Manager): ...
+
+hides rows whose `deletion_requested_at` is set: they stay in the table,
+invisible, until a background job has removed what depends on them (see
+users/deletion.py).  Related-object access and cascades go through the base
+manager, so they still see the row.
+
+delete_in_batches() / null_in_batches() work through a queryset a bounded
+batch at a time, each batch in its own short transaction.  With raw=True a
+batch is deleted with a single DELETE — no delete signals, no cascades — for
+models nothing references, whose signal work the caller has done in bulk.
+"""
+
+from django.db import transaction
+
+
+class HidePendingDeletion:
+    """Manager mixin: leaves out rows waiting for background deletion."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deletion_requested_at__isnull=True)
+
+
+def _batches(queryset, batch_size):
+    # Re-queried every time: the caller's update or delete takes the rows out of `queryset`
+    while True:
+        pks = list(queryset.values_list("pk", flat=True)[:batch_size])
+        if not pks:
+            return
+        yield queryset.model._base_manager.filter(pk__in=pks), len(pks)
+
+
+def delete_in_batches(queryset, batch_size, on_batch=None, raw=False) -> int:
+    """Delete the rows of `queryset` (with their cascades, unless `raw`), `batch_size` at a time."""
+    deleted = 0
+    for batch, size in _batches(queryset, batch_size):
+        with transaction.atomic():
+            if raw:
+                batch._raw_delete(batch.db)
+            else:
+                batch.delete()
+        deleted += size
+        if on_batch:
+            on_batch(size)
+    return deleted
+
+
+def null_in_batches(queryset, field, batch_size, on_batch=None) -> int:
+    """Set `field` to NULL on the rows of `queryset`, which must filter on that field."""
+    updated = 0
+    for batch, size in _batches(queryset, batch_size):
+        batch.update(**{field: None})
+        updated += size
+        if on_batch:
+            on_batch(size)
+    return updated
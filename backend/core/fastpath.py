@@ -0,0 +1,205 @@
+"""
+Read-only fast path for large list endpoints.
+
+DRF's ModelSerializer walks every field of every row through get_attribute()
+and to_representation(), which dominates CPU time once a list reaches a few
+thousand rows.  `ValuesSerializer` compiles a (possibly ?fields=-trimmed)
+serializer once into:
+
+    - the flat column list to pass to queryset.values_list()
+    - one precompiled converter per column (Decimal/datetime formatting etc.)
+
+and then builds each output dict straight from the row tuple.  The output is
+identical to `serializer.data` — fields that can't be compiled safely make the
+whole serializer fall back to the regular path (see `serialize_list`).
+"""
+
+import decimal
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.fields import ISO_8601
+from rest_framework.settings import api_settings
+
+from monitoring.tracing import span
+
+
+class NotCompilable(Exception):
+    """The serializer uses a field the fast path can't reproduce exactly."""
+
+
+# ─── Converters ──────────────────────────────────────────────────────────────
+
+def _decimal_converter(field):
+    coerce_to_string = getattr(field, "coerce_to_string", api_settings.COERCE_DECIMAL_TO_STRING)
+    if field.decimal_places is None or not coerce_to_string or field.localize or field.normalize_output:
+        return field.to_representation
+
+    context = decimal.getcontext().copy()
+    if field.max_digits is not None:
+        context.prec = field.max_digits
+    exponent = decimal.Decimal(".1") ** field.decimal_places
+    rounding = field.rounding
+    Decimal = decimal.Decimal
+
+    def convert(value):
+        if not isinstance(value, Decimal):
+            value = Decimal(str(value).strip())
+        return f"{value.quantize(exponent, rounding=rounding, context=context):f}"
+    return convert
+
+
+def _datetime_converter(field):
+    output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+    if output_format is None or output_format.lower() != ISO_8601:
+        return field.to_representation
+
+    field_timezone = field.timezone if hasattr(field, "timezone") else field.default_timezone()
+    if field_timezone is None:
+        return field.to_representation
+    slow = field.to_representation
+
+    def convert(value):
+        if value.tzinfo is None:
+            return slow(value)
+        value = value.astimezone(field_timezone).isoformat()
+        if value.endswith("+00:00"):
+            value = value[:-6] + "Z"
+        return value
+    return convert
+
+
+def _choice_converter(field):
+    lookup = field.choice_strings_to_values
+    return lambda value: lookup.get(str(value), value)
+
+
+def _overrides(field, base) -> bool:
+    """True if a subclass replaced base.to_representation with its own."""
+    return type(field).to_representation is not base.to_representation
+
+
+def _converter(field):
+    """Return a fast callable equivalent to field.to_representation for non-None values."""
+    if isinstance(field, serializers.DecimalField) and not _overrides(field, serializers.DecimalField):
+        return _decimal_converter(field)
+    if isinstance(field, serializers.DateTimeField) and not _overrides(field, serializers.DateTimeField):
+        return _datetime_converter(field)
+    if isinstance(field, serializers.ChoiceField) and not _overrides(field, serializers.ChoiceField):
+        return _choice_converter(field)
+    if isinstance(field, serializers.CharField) and not _overrides(field, serializers.CharField):
+        return str
+    if isinstance(field, serializers.IntegerField) and not _overrides(field, serializers.IntegerField):
+        return int
+    if isinstance(field, serializers.ReadOnlyField) and not _overrides(field, serializers.ReadOnlyField):
+        return None
+    return field.to_representation
+
+
+# ─── Compilation ─────────────────────────────────────────────────────────────
+
+class ValuesSerializer:
+    """
+    Compiled, read-only equivalent of `serializer.data` for a queryset.
+
+        fast = ValuesSerializer(ProductSerializer(fields="id,name,price"))
+        rows = fast.serialize(queryset)
+
+    Raises NotCompilable if any field can't be reproduced from a DB column.
+    """
+
+    def __init__(self, serializer):
+        self.columns = []
+        self._index  = {}
+        self.model   = serializer.Meta.model
+        self._build  = self._compile(serializer, self.model, "", nullable=False)
+
+    def _column(self, path) -> int:
+        if path not in self._index:
+            self._index[path] = len(self.columns)
+            self.columns.append(path)
+        return self._index[path]
+
+    def _compile(self, serializer, model, prefix, nullable):
+        pk_index = self._column(prefix + model._meta.pk.attname)
+        steps = []
+
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if isinstance(field, serializers.SerializerMethodField) or field.source == "*":
+                raise NotCompilable(name)
+
+            if isinstance(field, serializers.BaseSerializer):
+                related = self._relation(model, field.source, name)
+                builder = self._compile(field, related.related_model, prefix + field.source + "__", nullable=True)
+                steps.append((name, None, builder))
+                continue
+
+            current, path = model, prefix
+            attrs = field.source.split(".")
+            for attr in attrs[:-1]:
+                current = self._relation(current, attr, name).related_model
+                path += attr + "__"
+            try:
+                model_field = current._meta.get_field(attrs[-1])
+            except FieldDoesNotExist:
+                raise NotCompilable(name)
+            if model_field.is_relation:
+                # A plain FK field renders the related pk
+                if not isinstance(field, serializers.PrimaryKeyRelatedField) or field.pk_field is not None:
+                    raise NotCompilable(name)
+                steps.append((name, self._column(path + model_field.attname), None))
+                continue
+            steps.append((name, self._column(path + model_field.attname), _converter(field)))
+
+        return self._make_builder(steps, pk_index if nullable else None)
+
+    @staticmethod
+    def _relation(model, attr, name):
+        try:
+            model_field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            raise NotCompilable(name)
+        if not (model_field.many_to_one or model_field.one_to_one):
+            raise NotCompilable(name)
+        return model_field
+
+    @staticmethod
+    def _make_builder(steps, null_index):
+        steps = tuple(steps)
+
+        def build(row):
+            if null_index is not None and row[null_index] is None:
+                return None
+            out = {}
+            for name, index, conv in steps:
+                if index is None:
+                    out[name] = conv(row)  # nested serializer
+                    continue
+                value = row[index]
+                out[name] = value if value is None or conv is None else conv(value)
+            return out
+        return build
+
+    def serialize(self, queryset) -> list:
+        build = self._build
+        return [build(row) for row in queryset.values_list(*self.columns).iterator(chunk_size=2000)]
+
+
+def serialize_list(serializer_class, queryset, fields=None, expand=None) -> list:
+    """
+    Serialize a read-only list through the fast path, falling back to the
+    regular (projected) serializer if it can't be compiled.
+    """
+    serializer = serializer_class(fields=fields, expand=expand)
+    try:
+        fast = ValuesSerializer(serializer)
+    except NotCompilable:
+        queryset = serializer_class.project(queryset, fields=fields, expand=expand)
+        return serializer_class(queryset, many=True, fields=fields, expand=expand).data
+
+    with span("serialize", {"serializer": serializer_class.__name__, "many": True, "fast_path": True}) as current:
+        rows = fast.serialize(queryset)
+        current.set("rows", len(rows))
+    return rows
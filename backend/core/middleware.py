@@ -0,0 +1,252 @@
+import gzip
+import secrets
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+from .db import replica_aliases, use_primary
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+
+# ─── Codecs ──────────────────────────────────────────────────────────────────
+# Each codec compresses a whole body in one go, and hands out an incremental
+# compressor (compress(chunk) / finish()) for streaming responses.
+
+class _ZlibStream:
+    def __init__(self, level):
+        self._obj = zlib.compressobj(level, zlib.DEFLATED, 31)  # 31 → gzip container
+
+    def compress(self, chunk):
+        return self._obj.compress(chunk)
+
+    def finish(self):
+        return self._obj.flush()
+
+
+class GzipCodec:
+    name = "gzip"
+
+    def __init__(self, level=6):
+        self.level = level
+
+    def compress(self, data):
+        compressed = memoryview(gzip.compress(data, compresslevel=self.level, mtime=0))
+        # Pad the header with a random-length file name (BREACH mitigation), as
+        # django.utils.text.compress_string() does — but that one is fixed at level 6
+        header = bytearray(compressed[:10])
+        header[3] = gzip.FNAME
+        return b"".join((header, b"a" * secrets.randbelow(100), b"\x00", compressed[10:]))
+
+    def stream(self):
+        return _ZlibStream(self.level)
+
+
+class _BrotliStream:
+    def __init__(self, quality):
+        self._obj = brotli.Compressor(quality=quality)
+
+    def compress(self, chunk):
+        return self._obj.process(chunk)
+
+    def finish(self):
+        return self._obj.finish()
+
+
+class BrotliCodec:
+    name = "br"
+
+    def __init__(self, level=5):
+        self.level = level
+
+    def compress(self, data):
+        return brotli.compress(data, quality=self.level)
+
+    def stream(self):
+        return _BrotliStream(self.level)
+
+
+class _ZstdStream:
+    def __init__(self, level):
+        self._obj = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, chunk):
+        return self._obj.compress(chunk)
+
+    def finish(self):
+        return self._obj.flush()
+
+
+class ZstdCodec:
+    name = "zstd"
+
+    def __init__(self, level=3):
+        self.level = level
+
+    def compress(self, data):
+        return zstandard.ZstdCompressor(level=self.level).compress(data)
+
+    def stream(self):
+        return _ZstdStream(self.level)
+
+
+def available_codecs() -> dict:
+    """Codecs usable in this process, keyed by Content-Encoding token."""
+    levels = getattr(settings, "COMPRESSION_LEVELS", {})
+    codecs = {"gzip": GzipCodec(levels.get("gzip", 6))}
+    if brotli is not None:
+        codecs["br"] = BrotliCodec(levels.get("br", 5))
+    if zstandard is not None:
+        codecs["zstd"] = ZstdCodec(levels.get("zstd", 3))
+    return codecs
+
+
+def parse_accept_encoding(header: str) -> dict:
+    """"br;q=1.0, gzip;q=0.8, *;q=0" → {"br": 1.0, "gzip": 0.8, "*": 0.0}"""
+    accepted = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+# ─── Middleware ──────────────────────────────────────────────────────────────
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Compresses responses with the best encoding the client accepts
+    (COMPRESSION_ALGORITHMS order, e.g. br → zstd → gzip; br/zstd only when
+    the optional packages are installed).
+
+    Skipped when:
+        - the body is smaller than COMPRESSION_MIN_SIZE
+        - the content type isn't in COMPRESSION_CONTENT_TYPES
+        - the path starts with one of COMPRESSION_EXCLUDE_PATHS
+        - the response sets the JWT auth cookies — login/refresh bodies carry
+          the tokens themselves, and compressing secrets next to
+          attacker-influenced input is what BREACH-style attacks exploit
+
+    Streaming responses (e.g. exports) are compressed chunk by chunk.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.codecs        = available_codecs()
+        self.preference    = [c for c in settings.COMPRESSION_ALGORITHMS if c in self.codecs]
+        self.min_size      = settings.COMPRESSION_MIN_SIZE
+        self.content_types = set(settings.COMPRESSION_CONTENT_TYPES)
+        self.exclude_paths = tuple(settings.COMPRESSION_EXCLUDE_PATHS)
+        self.auth_cookies  = {settings.JWT_AUTH_COOKIE, settings.JWT_AUTH_REFRESH_COOKIE}
+
+    def select_codec(self, request):
+        accepted = parse_accept_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        wildcard = accepted.get("*", 0.0)
+        best, best_q = None, 0.0
+        for name in self.preference:
+            q = accepted.get(name, wildcard)
+            if q > best_q:
+                best, best_q = self.codecs[name], q
+        return best
+
+    def is_compressible(self, request, response) -> bool:
+        if response.has_header("Content-Encoding") or response.status_code in (204, 206, 304):
+            return False
+        content_type = response.get("Content-Type", "").split(";")[0].strip().lower()
+        if content_type not in self.content_types:
+            return False
+        if request.path.startswith(self.exclude_paths):
+            return False
+        if self.auth_cookies & set(response.cookies):
+            return False
+        if response.streaming:
+            length = response.get("Content-Length")
+            return not (length and int(length) < self.min_size)
+        return len(response.content) >= self.min_size
+
+    def process_response(self, request, response):
+        if not self.is_compressible(request, response):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        codec = self.select_codec(request)
+        if codec is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = _compress_async(codec, response.streaming_content)
+            else:
+                response.streaming_content = _compress_sync(codec, response.streaming_content)
+            # The compressed size isn't known until the stream is done
+            del response.headers["Content-Length"]
+        else:
+            compressed = codec.compress(response.content)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers["Content-Length"] = str(len(compressed))
+
+        # A strong ETag no longer matches the encoded bytes (RFC 9110 §8.8.1)
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = codec.name
+        return response
+
+
+def _compress_sync(codec, iterator):
+    stream = codec.stream()
+    for chunk in iterator:
+        data = stream.compress(chunk)
+        if data:
+            yield data
+    yield stream.finish()
+
+
+async def _compress_async(codec, iterator):
+    stream = codec.stream()
+    async for chunk in iterator:
+        data = stream.compress(chunk)
+        if data:
+            yield data
+    yield stream.finish()
+
+
+class ReplicaPinningMiddleware:
+    """
+    Keeps every query of an unsafe request (POST/PUT/PATCH/DELETE) on the
+    primary, so the response never reads stale rows from a lagging replica.
+    A no-op unless read replicas are configured (see core/db.py).
+    """
+
+    SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = bool(replica_aliases())
+
+    def __call__(self, request):
+        if not self.enabled or request.method in self.SAFE_METHODS:
+            return self.get_response(request)
+        with use_primary():
+            return self.get_response(request)
@@ -0,0 +1,29 @@
+"""
+orjson-backed JSON parser — drop-in for DRF's JSONParser.
+
+Only UTF-8 bodies take the fast path; anything orjson rejects (other
+encodings, NaN/Infinity literals when STRICT_JSON is off) is re-parsed by the
+stdlib parser so accepted input and error messages stay the same.
+"""
+
+import io
+
+from rest_framework.parsers import JSONParser
+
+from .renderers import ORJSONRenderer, orjson
+
+
+class ORJSONParser(JSONParser):
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding") or "utf-8"
+        if orjson is None or encoding.lower().replace("_", "-") not in ("utf-8", "utf8"):
+            return super().parse(stream, media_type, parser_context)
+
+        body = stream.read() if stream is not None else b""
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            return super().parse(io.BytesIO(body), media_type, parser_context)
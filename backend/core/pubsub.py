@@ -0,0 +1,208 @@
+"""
+Publish/subscribe fanout for server-push events.
+
+    broker = get_broker()
+    broker.publish("business.3", {"type": "product.approved", ...})
+
+    with broker.subscribe("business.3") as subscription:               # WSGI
+        event = subscription.get(timeout=15)
+    async with broker.subscribe_async("business.3") as subscription:   # ASGI
+        event = await subscription.get(timeout=15)
+
+`get()` returns None on timeout and RESYNC once if the subscriber fell so far
+behind that events were dropped (the client should refetch).
+
+EVENTS_BROKER picks the implementation:
+
+    core.pubsub.InProcessBroker   fanout to subscribers of this process only —
+                                  enough for a single server process
+    core.pubsub.RedisBroker       publishes go through Redis PUBLISH and every
+                                  process runs one listener thread feeding its
+                                  local fanout (needs the `redis` package)
+"""
+
+import asyncio
+import json
+import queue
+import sys
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.module_loading import import_string
+
+
+RESYNC = {"type": "resync"}
+
+
+# ─── Subscriptions ───────────────────────────────────────────────────────────
+
+class SyncSubscription:
+    """Blocking subscription for a WSGI worker thread."""
+
+    def __init__(self, maxsize):
+        self._queue     = queue.Queue(maxsize)
+        self.overflowed = False
+
+    def deliver(self, event):   # any thread
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.overflowed = True
+
+    def get(self, timeout=None):
+        if self.overflowed:
+            self.overflowed = False
+            _drain(self._queue)
+            return RESYNC
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class AsyncSubscription:
+    """Subscription bound to the event loop it was created on."""
+
+    def __init__(self, maxsize):
+        self._loop      = asyncio.get_running_loop()
+        self._queue     = asyncio.Queue(maxsize)
+        self.overflowed = False
+
+    def deliver(self, event):   # any thread
+        try:
+            self._loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            pass  # loop closed — the subscriber is gone
+
+    def _put(self, event):
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def get(self, timeout=None):
+        if self.overflowed:
+            self.overflowed = False
+            _drain(self._queue)
+            return RESYNC
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+def _drain(q):
+    while not q.empty():
+        q.get_nowait()
+
+
+# ─── Brokers ─────────────────────────────────────────────────────────────────
+
+class InProcessBroker:
+    def __init__(self):
+        self._topics = {}   # topic → set of subscriptions
+        self._lock   = threading.Lock()
+
+    def publish(self, topic, event):
+        self._fanout(topic, event)
+
+    def _fanout(self, topic, event):
+        with self._lock:
+            subscribers = list(self._topics.get(topic, ()))
+        for subscription in subscribers:
+            subscription.deliver(event)
+
+    def _add(self, topic, subscription):
+        with self._lock:
+            self._topics.setdefault(topic, set()).add(subscription)
+
+    def _remove(self, topic, subscription):
+        with self._lock:
+            subscribers = self._topics.get(topic)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._topics[topic]
+
+    def subscriber_count(self, topic) -> int:
+        with self._lock:
+            return len(self._topics.get(topic, ()))
+
+    @contextmanager
+    def subscribe(self, topic):
+        subscription = SyncSubscription(settings.EVENTS_QUEUE_SIZE)
+        self._add(topic, subscription)
+        try:
+            yield subscription
+        finally:
+            self._remove(topic, subscription)
+
+    @asynccontextmanager
+    async def subscribe_async(self, topic):
+        subscription = AsyncSubscription(settings.EVENTS_QUEUE_SIZE)
+        self._add(topic, subscription)
+        try:
+            yield subscription
+        finally:
+            self._remove(topic, subscription)
+
+
+class RedisBroker(InProcessBroker):
+    """Cross-process fanout over Redis pub/sub (EVENTS_REDIS_URL)."""
+
+    CHANNEL_PREFIX = "events:"
+
+    def __init__(self):
+        super().__init__()
+        try:
+            import redis
+        except ImportError:
+            raise ImproperlyConfigured("RedisBroker needs the `redis` package (pip install redis)")
+        self._client   = redis.Redis.from_url(settings.EVENTS_REDIS_URL)
+        self._listener = None
+        self._listener_lock = threading.Lock()
+
+    def publish(self, topic, event):
+        self._client.publish(self.CHANNEL_PREFIX + topic, json.dumps(event, cls=DjangoJSONEncoder))
+
+    def _add(self, topic, subscription):
+        super()._add(topic, subscription)
+        if self._listener is None:
+            with self._listener_lock:
+                if self._listener is None:
+                    self._listener = threading.Thread(target=self._listen, name="events-redis", daemon=True)
+                    self._listener.start()
+
+    def _listen(self):
+        backoff = 1
+        while True:
+            try:
+                pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+                pubsub.psubscribe(self.CHANNEL_PREFIX + "*")
+                backoff = 1
+                for message in pubsub.listen():
+                    if message["type"] != "pmessage":
+                        continue
+                    topic = message["channel"].decode()[len(self.CHANNEL_PREFIX):]
+                    self._fanout(topic, json.loads(message["data"]))
+            except Exception as exc:  # connection lost — subscribers just see a gap
+                sys.stderr.write(f"events: Redis listener error ({exc}), reconnecting in {backoff}s\n")
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = import_string(settings.EVENTS_BROKER)()
+    return _broker
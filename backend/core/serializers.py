@@ -0,0 +1,183 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+from monitoring.tracing import span
+
+
+def parse_field_spec(value):
+    """
+    Turn "id,name,created_by.email" into a nested dict:
+        {"id": {}, "name": {}, "created_by": {"email": {}}}
+    An empty dict means "every field of that (nested) serializer".
+    """
+    spec = {}
+    if not value:
+        return spec
+    for path in value.split(","):
+        parts = [p.strip() for p in path.split(".") if p.strip()]
+        node = spec
+        for part in parts:
+            node = node.setdefault(part, {})
+    return spec
+
+
+def field_options(request) -> dict:
+    """Read ?fields= and ?expand= from a DRF request into serializer kwargs."""
+    return {
+        "fields": request.query_params.get("fields"),
+        "expand": request.query_params.get("expand"),
+    }
+
+
+def _build_spec(fields, expand):
+    """Combine ?fields= and ?expand= into a single spec (None = no trimming)."""
+    if not fields:
+        # The default output already includes every nested relation
+        return None
+    spec = parse_field_spec(fields)
+    for name, sub in parse_field_spec(expand).items():
+        spec.setdefault(name, sub)
+    return spec
+
+
+def _unknown_names(serializer, spec, prefix="", relations_only=False) -> list:
+    """
+    Error messages for the names in spec that the serializer can't output,
+    each listing the names that are allowed at that level.
+    """
+    readable = {name: field for name, field in serializer.fields.items() if not field.write_only}
+    if relations_only:
+        readable = {name: field for name, field in readable.items() if isinstance(field, serializers.BaseSerializer)}
+
+    errors = []
+    for name, sub in spec.items():
+        field = readable.get(name)
+        if field is None:
+            errors.append(f"Unknown field '{prefix}{name}'. Allowed: {', '.join(readable) or 'none'}.")
+        elif sub and not isinstance(field, serializers.BaseSerializer):
+            errors.append(f"Field '{prefix}{name}' has no nested fields.")
+        elif sub:
+            errors += _unknown_names(field, sub, f"{prefix}{name}.")
+    return errors
+
+
+def _prune(serializer, spec):
+    """Drop fields not named in spec, recursing into nested serializers."""
+    if not spec:
+        return
+    for name in list(serializer.fields):
+        if name not in spec:
+            serializer.fields.pop(name)
+            continue
+        field = serializer.fields[name]
+        if isinstance(field, serializers.BaseSerializer):
+            _prune(field, spec[name])
+
+
+class TracedListSerializer(serializers.ListSerializer):
+    """ListSerializer whose `.data` is a tracing span (with the row count)."""
+
+    @property
+    def data(self):
+        with span("serialize", {"serializer": type(self.child).__name__, "many": True}) as current:
+            data = super().data
+            current.set("rows", len(data))
+            return data
+
+
+class DynamicFieldsMixin:
+    """
+    Lets a ModelSerializer trim its output to what the client asked for.
+
+        ?fields=id,name,price                → only those fields
+        ?fields=id,created_by.email          → nested serializers can be trimmed too
+        ?fields=id,name&expand=created_by    → add a full nested relation
+
+    Without ?fields= the serializer behaves exactly as before.  Unknown names
+    raise a ValidationError (a 400 listing the allowed names).
+    Use `project()` on the queryset so the DB work shrinks with the output.
+    """
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop("fields", None)
+        expand = kwargs.pop("expand", None)
+        super().__init__(*args, **kwargs)
+
+        errors = {}
+        for param, value, relations_only in (("fields", fields, False), ("expand", expand, True)):
+            unknown = _unknown_names(self, parse_field_spec(value), relations_only=relations_only)
+            if unknown:
+                errors[param] = unknown
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        spec = _build_spec(fields, expand)
+        if spec:
+            _prune(self, spec)
+
+    @property
+    def data(self):
+        with span("serialize", {"serializer": type(self).__name__}):
+            return super().data
+
+    @classmethod
+    def project(cls, queryset, fields=None, expand=None):
+        """
+        Restrict a queryset to the columns and joins this serializer will read:
+        `select_related()` for every nested relation still in the output and
+        `only()` for the concrete columns behind the remaining fields.
+        """
+        serializer = cls(fields=fields, expand=expand)
+        only, related = set(), set()
+        resolved = _collect(serializer, queryset.model, "", only, related)
+
+        if related:
+            queryset = queryset.select_related(*sorted(related))
+        if resolved:
+            queryset = queryset.only(*sorted(only))
+        return queryset
+
+
+def _collect(serializer, model, prefix, only, related) -> bool:
+    """
+    Walk a (pruned) serializer, filling `only` with column paths and `related`
+    with relation paths.  Returns False if some field could not be mapped onto
+    the model, in which case the caller must not use only().
+    """
+    resolved = True
+    only.add(prefix + model._meta.pk.name)
+
+    for field in serializer.fields.values():
+        if field.source == "*" or field.write_only:
+            continue
+
+        if isinstance(field, serializers.BaseSerializer):
+            try:
+                model_field = model._meta.get_field(field.source)
+            except FieldDoesNotExist:
+                resolved = False
+                continue
+            if model_field.many_to_many or model_field.one_to_many:
+                # select_related() can't follow these — leave them to the serializer
+                resolved = False
+                continue
+            path = prefix + field.source
+            related.add(path)
+            only.add(path)
+            resolved &= _collect(field, model_field.related_model, path + "__", only, related)
+            continue
+
+        current, path = model, prefix
+        for attr in field.source.split("."):
+            try:
+                model_field = current._meta.get_field(attr)
+            except FieldDoesNotExist:
+                resolved = False
+                break
+            if model_field.is_relation:
+                related.add(path + attr)
+                only.add(path + attr)
+                current, path = model_field.related_model, path + attr + "__"
+            else:
+                only.add(path + attr)
+    return resolved
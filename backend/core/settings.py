@@ -36,14 +36,22 @@ INSTALLED_APPS = [
     "rest_framework_simplejwt.token_blacklist",
     "corsheaders",
     # local
+    "core",
     "users",
     "products",
     "chat",
+    "monitoring",
+    "jobs",
 ]
 
 MIDDLEWARE = [
+    "monitoring.middleware.MetricsMiddleware",
+    "monitoring.middleware.TracingMiddleware",
+    "monitoring.middleware.ProfilingMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "core.middleware.CompressionMiddleware",
+    "core.middleware.ReplicaPinningMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -72,12 +80,50 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "core.wsgi.application"
 
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+# ─── Database ────────────────────────────────────────────────────────────────
+# DB_ENGINE=sqlite (default, local dev) or postgres (production).
+# See core/db.py for the SQLite PRAGMAs and the read-replica router.
+DB_ENGINE = os.getenv("DB_ENGINE", "sqlite")
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+
+if DB_ENGINE == "postgres":
+    _primary = {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": os.getenv("DB_NAME", "marketplace"),
+        "USER": os.getenv("DB_USER", "postgres"),
+        "PASSWORD": os.getenv("DB_PASSWORD", ""),
+        "HOST": os.getenv("DB_HOST", "localhost"),
+        "PORT": os.getenv("DB_PORT", "5432"),
+        # Keep connections open between requests, but verify them before reuse
+        "CONN_MAX_AGE": int(os.getenv("DB_CONN_MAX_AGE", "60")),
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {},
+    }
+    if os.getenv("DB_POOL", "False") == "True":
+        # psycopg 3 connection pool inside each worker (requires CONN_MAX_AGE=0)
+        _primary["CONN_MAX_AGE"] = 0
+        _primary["OPTIONS"]["pool"] = {
+            "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+            "max_size": int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+            "timeout": int(os.getenv("DB_POOL_TIMEOUT", "10")),
+        }
+    if os.getenv("DB_PGBOUNCER", "False") == "True":
+        # Transaction-pooling PgBouncer can't hold server-side cursors open
+        _primary["DISABLE_SERVER_SIDE_CURSORS"] = True
+
+    DATABASES = {"default": _primary}
+    for i, host in enumerate(h for h in os.getenv("DB_REPLICA_HOSTS", "").split(",") if h):
+        DATABASES[f"replica{i}"] = {**_primary, "HOST": host, "TEST": {"MIRROR": "default"}}
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.getenv("DB_NAME", BASE_DIR / "db.sqlite3"),
+            "OPTIONS": {"timeout": SQLITE_BUSY_TIMEOUT_MS / 1000},
+        }
     }
-}
+
+DATABASE_ROUTERS = ["core.db.PrimaryReplicaRouter"] if len(DATABASES) > 1 else []
 
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
@@ -105,8 +151,45 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
     ),
+    # orjson-backed JSON (falls back to the stdlib encoder when orjson is missing)
+    "DEFAULT_RENDERER_CLASSES": (
+        "core.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "core.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
 }
 
+# Build read-only list responses straight from values_list() rows instead of
+# walking ModelSerializer field by field (identical output, see core/fastpath.py)
+FAST_LIST_SERIALIZATION = os.getenv("FAST_LIST_SERIALIZATION", "True") == "True"
+
+# Public catalog change feed (/api/products/public/changes/)
+CATALOG_FEED_PAGE_SIZE = int(os.getenv("CATALOG_FEED_PAGE_SIZE", "500"))
+CATALOG_FEED_MAX_PAGE_SIZE = 2000
+# Changes younger than this are held back so out-of-order commits can't be skipped
+CATALOG_FEED_SETTLE_SECONDS = float(os.getenv("CATALOG_FEED_SETTLE_SECONDS", "2"))
+# Pre-rendered public catalog served from mmap'd files (see products/snapshot.py)
+CATALOG_SNAPSHOT_ENABLED = os.getenv("CATALOG_SNAPSHOT_ENABLED", "False") == "True"
+CATALOG_SNAPSHOT_DIR = os.getenv("CATALOG_SNAPSHOT_DIR", str(BASE_DIR / "catalog_snapshot"))
+CATALOG_SNAPSHOT_DEBOUNCE_SECONDS = float(os.getenv("CATALOG_SNAPSHOT_DEBOUNCE_SECONDS", "5"))
+# Upper bounds of the ?facets=price bands on the public catalog (last band is open)
+CATALOG_PRICE_BUCKETS = os.getenv("CATALOG_PRICE_BUCKETS", "10,25,50,100,250").split(",")
+
+# Admin user directory (/api/users/), cursor-paginated
+USERS_PAGE_SIZE = int(os.getenv("USERS_PAGE_SIZE", "50"))
+USERS_MAX_PAGE_SIZE = 500
+# Bulk provisioning (/api/users/bulk/, manage.py provision_users); 0 workers = one per CPU
+USERS_BULK_MAX_ROWS = int(os.getenv("USERS_BULK_MAX_ROWS", "5000"))
+USERS_BULK_HASH_WORKERS = int(os.getenv("USERS_BULK_HASH_WORKERS", "0"))
+# Rows per transaction when a deleted business or user is purged (users/deletion.py)
+DELETION_BATCH_SIZE = int(os.getenv("DELETION_BATCH_SIZE", "500"))
+# Django admin changelists count and page through at most this many rows (core/pagination.py)
+ADMIN_LIST_MAX_ROWS = int(os.getenv("ADMIN_LIST_MAX_ROWS", "10000"))
+
 # ─── Simple JWT ─────────────────────────────────────────────────────────────
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=30),
@@ -128,9 +211,105 @@ JWT_AUTH_COOKIE_PATH = "/"
 JWT_AUTH_COOKIE_DOMAIN = None 
 
 
+# ─── Response compression ────────────────────────────────────────────────────
+# br / zstd are used only when the `brotli` / `zstandard` packages are installed
+COMPRESSION_ALGORITHMS = os.getenv("COMPRESSION_ALGORITHMS", "br,zstd,gzip").split(",")
+COMPRESSION_LEVELS = {"gzip": 6, "br": 5, "zstd": 3}
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))   # bytes
+COMPRESSION_CONTENT_TYPES = [
+    "application/json",
+    "text/csv",
+    "text/html",
+    "text/plain",
+    "application/javascript",
+    "text/css",
+]
+# Auth responses carry the JWTs in their body — never compress them (BREACH)
+COMPRESSION_EXCLUDE_PATHS = ["/api/auth/"]
+
+
+# ─── Metrics ─────────────────────────────────────────────────────────────────
+# Scraped at /metrics with "Authorization: Bearer $METRICS_TOKEN" (404 while unset).
+# With several workers, point METRICS_DIR at a directory they share (on one host,
+# cleared on deploy) so every scrape reports the whole server; the counts of
+# workers that died are kept in METRICS_DIR/archived.json.
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "True") == "True"
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+METRICS_DIR = os.getenv("METRICS_DIR", "")
+METRICS_FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL", "5"))   # seconds
+
+# ─── Tracing ─────────────────────────────────────────────────────────────────
+# Spans around auth, SQL, serializers and the LLM call (see monitoring/tracing.py).
+# TRACING_EXPORTER: "" (off) | "otlp" | "file" | "console"
+TRACING_EXPORTER = os.getenv("TRACING_EXPORTER", "")
+TRACING_SAMPLE_RATE = float(os.getenv("TRACING_SAMPLE_RATE", "0.05"))   # share of requests traced
+TRACING_OTLP_ENDPOINT = os.getenv("TRACING_OTLP_ENDPOINT", "http://localhost:4318")
+TRACING_FILE = os.getenv("TRACING_FILE", str(BASE_DIR / "traces.jsonl"))
+TRACING_SERVICE_NAME = os.getenv("TRACING_SERVICE_NAME", "marketplace-api")
+
+# ─── Profiling ───────────────────────────────────────────────────────────────
+# Statistical profiles of sampled / slow requests (see monitoring/profiling.py);
+# summarise them with `python manage.py profile_summary`.
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "False") == "True"
+PROFILING_SAMPLE_RATE = float(os.getenv("PROFILING_SAMPLE_RATE", "0.01"))
+PROFILING_SLOW_MS = float(os.getenv("PROFILING_SLOW_MS", "1000"))   # 0 → only sampled requests
+PROFILING_INTERVAL_MS = float(os.getenv("PROFILING_INTERVAL_MS", "5"))
+PROFILING_DIR = os.getenv("PROFILING_DIR", str(BASE_DIR / "profiles"))
+PROFILING_FORMATS = os.getenv("PROFILING_FORMATS", "collapsed,speedscope").split(",")
+
+
+# ─── Background jobs ─────────────────────────────────────────────────────────
+# Queue table + `python manage.py run_jobs` worker (see jobs/runner.py)
+JOBS_EAGER = os.getenv("JOBS_EAGER", "False") == "True"   # run inline in enqueue() (tests)
+JOBS_CONCURRENCY = int(os.getenv("JOBS_CONCURRENCY", "4"))
+JOBS_POLL_SECONDS = 1.0
+JOBS_LEASE_SECONDS = 60              # renewed every poll; a dead worker's jobs are requeued after this
+JOBS_MAX_ATTEMPTS = 3
+JOBS_RETRY_BACKOFF_SECONDS = 10      # doubles per attempt
+JOBS_RETRY_BACKOFF_MAX_SECONDS = 600
+
+# ─── Server-push events ──────────────────────────────────────────────────────
+# Product events for the dashboard (/api/products/events/, see core/pubsub.py).
+# Use "core.pubsub.RedisBroker" when running more than one server process.
+EVENTS_BROKER = os.getenv("EVENTS_BROKER", "core.pubsub.InProcessBroker")
+EVENTS_REDIS_URL = os.getenv("EVENTS_REDIS_URL", "redis://localhost:6379/0")
+EVENTS_QUEUE_SIZE = 100            # per subscriber; a client further behind gets "resync"
+EVENTS_HEARTBEAT_SECONDS = 15
+EVENTS_STREAM_MAX_SECONDS = int(os.getenv("EVENTS_STREAM_MAX_SECONDS", "300"))
+
+
 # ─── CORS ────────────────────────────────────────────────────────────────────
 CORS_ALLOWED_ORIGINS = os.getenv("CORS_ALLOWED_ORIGINS", "http://localhost:3000").split(",")
 CORS_ALLOW_CREDENTIALS = True         # Required so cookies are sent cross-origin
 
 # ─── OpenAI ──────────────────────────────────────────────────────────────────
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
\ No newline at end of file
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
+
+CHAT_MODEL = os.getenv("CHAT_MODEL", "gpt-4o-mini")   # Cheap and fast
+
+# LLM provider and call policy (chat/llm.py). "stub" answers offline.
+CHAT_LLM_PROVIDER = os.getenv("CHAT_LLM_PROVIDER", "openai")
+CHAT_LLM_DEADLINE_SECONDS = float(os.getenv("CHAT_LLM_DEADLINE_SECONDS", "20"))   # whole call, retries included
+CHAT_LLM_TIMEOUT_SECONDS = float(os.getenv("CHAT_LLM_TIMEOUT_SECONDS", "10"))     # per attempt
+CHAT_LLM_MAX_RETRIES = 2
+CHAT_LLM_RETRY_BACKOFF_SECONDS = 0.5
+CHAT_LLM_BREAKER_FAILURES = 5
+CHAT_LLM_BREAKER_RESET_SECONDS = 30
+CHAT_LLM_HEDGE_AFTER_SECONDS = float(os.getenv("CHAT_LLM_HEDGE_AFTER_SECONDS", "0"))   # 0 → no hedging
+CHAT_LLM_STUB_LATENCY_MS = float(os.getenv("CHAT_LLM_STUB_LATENCY_MS", "0"))
+
+# Prompt assembly (chat/prompt.py): input tokens per LLM call, of which up to
+# this share goes to product context; the rest holds the conversation so far
+CHAT_PROMPT_TOKEN_BUDGET = int(os.getenv("CHAT_PROMPT_TOKEN_BUDGET", "3000"))
+CHAT_PRODUCT_CONTEXT_SHARE = 0.6
+CHAT_PRODUCT_CONTEXT_MAX = 200     # products considered for the context
+CHAT_HISTORY_MAX_TURNS = 20        # earlier turns considered
+
+# Anonymous chat visitors are identified by this signed cookie (chat/identity.py)
+CHAT_VISITOR_COOKIE = "chat_visitor"
+CHAT_VISITOR_COOKIE_MAX_AGE = 365 * 24 * 60 * 60
+
+# Answer simple catalog questions from the database without the LLM (chat/intents.py)
+CHAT_FAST_PATH_ENABLED = os.getenv("CHAT_FAST_PATH_ENABLED", "True") == "True"
+CHAT_FAST_PATH_MAX_RESULTS = 10
+CHAT_FAST_PATH_SCAN_LIMIT = 500   # newest products searched for a word in the middle of a name
\ No newline at end of file
@@ -0,0 +1,163 @@
+import gzip
+import zlib
+from unittest import mock, skipUnless
+
+from django.db import connection
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+
+from .db import PrimaryReplicaRouter, use_primary
+from .middleware import BrotliCodec, CompressionMiddleware, GzipCodec, ZstdCodec, brotli, zstandard
+
+
+class SQLiteTuningTests(TestCase):
+
+    def setUp(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("SQLite-only PRAGMAs")
+
+    def _pragma(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f"PRAGMA {name};")
+            return cursor.fetchone()[0]
+
+    def test_synchronous_normal(self):
+        self.assertEqual(self._pragma("synchronous"), 1)  # 1 == NORMAL
+
+    def test_busy_timeout(self):
+        from django.conf import settings
+        self.assertEqual(self._pragma("busy_timeout"), settings.SQLITE_BUSY_TIMEOUT_MS)
+
+
+REPLICATED = {
+    "default":  {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"},
+    "replica0": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"},
+    "replica1": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"},
+}
+
+
+class PrimaryReplicaRouterTests(SimpleTestCase):
+
+    @override_settings(DATABASES=REPLICATED)
+    def test_reads_go_to_replicas_and_writes_to_primary(self):
+        router = PrimaryReplicaRouter()
+        self.assertIn(router.db_for_read(None), {"replica0", "replica1"})
+        self.assertEqual(router.db_for_write(None), "default")
+        self.assertTrue(router.allow_migrate("default", "products"))
+        self.assertFalse(router.allow_migrate("replica0", "products"))
+
+    @override_settings(DATABASES=REPLICATED)
+    def test_use_primary_pins_reads(self):
+        router = PrimaryReplicaRouter()
+        with use_primary():
+            self.assertEqual(router.db_for_read(None), "default")
+
+    def test_without_replicas_everything_uses_default(self):
+        self.assertEqual(PrimaryReplicaRouter().db_for_read(None), "default")
+
+
+BODY = b'{"name": "Product", "description": "A compressible description."}' * 40
+
+
+class CompressionMiddlewareTests(SimpleTestCase):
+
+    def run_middleware(self, response, path="/api/products/", accept="gzip"):
+        request = RequestFactory().get(path, HTTP_ACCEPT_ENCODING=accept)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def json_response(self, body=BODY):
+        return HttpResponse(body, content_type="application/json")
+
+    def test_compresses_json(self):
+        response = self.run_middleware(self.json_response())
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.content), BODY)
+        self.assertEqual(response["Content-Length"], str(len(response.content)))
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+
+    def test_size_threshold(self):
+        with override_settings(COMPRESSION_MIN_SIZE=len(BODY) + 1):
+            response = self.run_middleware(self.json_response())
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertEqual(response.content, BODY)
+        self.assertFalse(response.has_header("Vary"))
+
+    def test_content_type_allow_list(self):
+        response = self.run_middleware(HttpResponse(BODY, content_type="image/png"))
+        self.assertFalse(response.has_header("Content-Encoding"))
+        response = self.run_middleware(HttpResponse(BODY, content_type="application/json; charset=utf-8"))
+        self.assertEqual(response["Content-Encoding"], "gzip")
+
+    def test_skips_excluded_paths_and_auth_cookies(self):
+        response = self.run_middleware(self.json_response(), path="/api/auth/login/")
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+        with_cookie = self.json_response()
+        with_cookie.set_cookie("access_token", "secret")
+        response = self.run_middleware(with_cookie, path="/api/products/")
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertEqual(response.content, BODY)
+
+    def test_no_acceptable_encoding(self):
+        response = self.run_middleware(self.json_response(), accept="identity, gzip;q=0")
+        self.assertFalse(response.has_header("Content-Encoding"))
+        # The response still depends on Accept-Encoding
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+
+    def test_streaming_response(self):
+        chunks = [BODY[i:i + 100] for i in range(0, len(BODY), 100)]
+        response = StreamingHttpResponse(iter(chunks), content_type="text/csv")
+        response["Content-Length"] = str(len(BODY))
+        response = self.run_middleware(response)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertFalse(response.has_header("Content-Length"))
+        self.assertEqual(zlib.decompress(b"".join(response.streaming_content), 31), BODY)
+
+    def test_etag_is_weakened(self):
+        response = self.json_response()
+        response["ETag"] = '"abc"'
+        self.assertEqual(self.run_middleware(response)["ETag"], 'W/"abc"')
+
+        response = self.json_response()
+        response["ETag"] = 'W/"abc"'
+        self.assertEqual(self.run_middleware(response)["ETag"], 'W/"abc"')
+
+    def test_gzip_uses_the_configured_level(self):
+        data = bytes(range(256)) * 64 + BODY
+        fast, best = GzipCodec(1).compress(data), GzipCodec(9).compress(data)
+        self.assertEqual(gzip.decompress(fast), data)
+        self.assertEqual(gzip.decompress(best), data)
+        self.assertLess(len(best) - best.index(b"\x00", 10), len(fast) - fast.index(b"\x00", 10))
+
+    def test_codec_negotiation(self):
+        codecs = {"gzip": GzipCodec(), "br": BrotliCodec(), "zstd": ZstdCodec()}
+        with mock.patch("core.middleware.available_codecs", return_value=codecs), \
+                override_settings(COMPRESSION_ALGORITHMS=["br", "zstd", "gzip"]):
+            middleware = CompressionMiddleware(lambda request: None)
+        cases = {
+            "gzip":                  "gzip",
+            "gzip, deflate, br":     "br",
+            "gzip, zstd":            "zstd",
+            "br;q=0.5, gzip;q=0.9":  "gzip",
+            "*":                     "br",
+            "*, br;q=0":             "zstd",
+            "identity":              None,
+            "":                      None,
+        }
+        for accept, expected in cases.items():
+            with self.subTest(accept=accept):
+                codec = middleware.select_codec(RequestFactory().get("/", HTTP_ACCEPT_ENCODING=accept))
+                self.assertEqual(codec and codec.name, expected)
+
+    @skipUnless(brotli, "brotli is not installed")
+    def test_brotli_round_trip(self):
+        response = self.run_middleware(self.json_response(), accept="br")
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(brotli.decompress(response.content), BODY)
+
+    @skipUnless(zstandard, "zstandard is not installed")
+    def test_zstd_round_trip(self):
+        with override_settings(COMPRESSION_ALGORITHMS=["zstd", "gzip"]):
+            response = self.run_middleware(self.json_response(), accept="zstd, gzip")
+        self.assertEqual(response["Content-Encoding"], "zstd")
+        self.assertEqual(zstandard.ZstdDecompressor().decompressobj().decompress(response.content), BODY)
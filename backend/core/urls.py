@@ -17,10 +17,14 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 
+from monitoring.views import metrics_view
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path("api/auth/", include("users.urls.auth_urls")),
     path("api/users/", include("users.urls.user_urls")),
     path("api/products/", include("products.urls")),
     path("api/chat/", include("chat.urls")),
+    path("api/jobs/", include("jobs.urls")),
+    path("metrics", metrics_view, name="metrics"),
 ]
\ No newline at end of file
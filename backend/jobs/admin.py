@@ -0,0 +1,19 @@
+from django.contrib import admin
+
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    # Read-only: jobs are created by enqueue() and updated by the workers
+    list_display    = ["id", "name", "status", "attempts", "created_by", "created_at", "finished_at"]
+    list_filter     = ["status", "name"]
+    list_select_related = ["created_by"]
+    readonly_fields = [field.name for field in Job._meta.fields]
+    ordering        = ["-id"]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
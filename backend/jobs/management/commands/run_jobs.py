@@ -0,0 +1,20 @@
+import signal
+
+from django.core.management.base import BaseCommand
+
+from jobs.runner import Worker
+
+
+class Command(BaseCommand):
+    help = "Run queued background jobs on a thread pool until stopped (SIGTERM / Ctrl-C finish running jobs first)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, help="Jobs run at once (default: JOBS_CONCURRENCY)")
+        parser.add_argument("--burst", action="store_true", help="Exit once no job is due")
+
+    def handle(self, *args, **options):
+        worker = Worker(concurrency=options["concurrency"])
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, lambda *_: worker.stop())
+        self.stdout.write(f"Job worker {worker.id} running {worker.concurrency} job(s) at a time")
+        worker.run(burst=options["burst"])
@@ -0,0 +1,28 @@
+# Generated by Django 6.0.2 on 2026-02-17 18:25
+
+from django.db import migrations, models
+
+
+def move_tracebacks(apps, schema_editor):
+    """Keep only the last line of a traceback in the user-visible error."""
+    Job = apps.get_model("jobs", "Job")
+    failed = Job.objects.filter(error__startswith="Traceback (most recent call last):")
+    for job in failed.only("pk", "error").iterator():
+        last_line = job.error.strip().splitlines()[-1]
+        Job.objects.filter(pk=job.pk).update(traceback=job.error, error=last_line[:200])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='traceback',
+            field=models.TextField(blank=True),
+        ),
+        migrations.RunPython(move_tracebacks, migrations.RunPython.noop),
+    ]
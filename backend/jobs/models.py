@@ -0,0 +1,63 @@
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+
+
+class JobStatus(models.TextChoices):
+    QUEUED    = "queued",    "Queued"
+    RUNNING   = "running",   "Running"
+    SUCCEEDED = "succeeded", "Succeeded"
+    FAILED    = "failed",    "Failed"
+
+
+class Job(models.Model):
+    """
+    One unit of background work (see jobs/runner.py).  Rows are the queue:
+    workers claim due `queued` rows and hold a lease on them while running.
+    """
+    name         = models.CharField(max_length=100)
+    args         = models.JSONField(default=dict, encoder=DjangoJSONEncoder)   # keyword arguments
+    status       = models.CharField(max_length=20, choices=JobStatus.choices, default=JobStatus.QUEUED)
+    attempts     = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=1)
+    run_at       = models.DateTimeField(default=timezone.now)   # not before (retry backoff)
+    progress     = models.FloatField(default=0)                 # 0.0 – 1.0
+    message      = models.CharField(max_length=255, blank=True)
+    result       = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    error        = models.TextField(blank=True)                 # last failure, one line (shown to users)
+    traceback    = models.TextField(blank=True)                 # its traceback (Django admin only)
+    created_by   = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="jobs",
+    )
+    business     = models.ForeignKey(
+        "users.Business",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="jobs",
+    )
+    locked_by    = models.CharField(max_length=100, blank=True)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    created_at   = models.DateTimeField(auto_now_add=True)
+    started_at   = models.DateTimeField(null=True, blank=True)
+    finished_at  = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes  = [
+            models.Index(fields=["status", "run_at"], name="job_status_run_at_idx"),   # claiming
+        ]
+
+    def __str__(self):
+        return f"#{self.pk} {self.name} [{self.status}]"
+
+    def report(self, progress, message=""):
+        """Called by a running job function to publish its progress (0.0 – 1.0)."""
+        self.progress = max(0.0, min(1.0, progress))
+        self.message  = message[:255]
+        Job.objects.filter(pk=self.pk).update(progress=self.progress, message=self.message)
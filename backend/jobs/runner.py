@@ -0,0 +1,202 @@
+"""
+Database-backed background jobs.
+
+    # products/jobs.py
+    @job("products.build_catalog_snapshot")
+    def build_catalog_snapshot(job, **kwargs):
+        job.report(0.5, "rendering")
+        return {"count": 42}                 # stored as Job.result
+
+    job = enqueue("products.build_catalog_snapshot", user=request.user)
+    return Response({"id": job.pk}, status=202)
+
+`python manage.py run_jobs` claims due jobs and runs them on a thread pool.
+A job that raises is retried with exponential backoff until it has run
+`max_attempts` times.  Workers hold a lease on their running jobs and renew it
+every poll; the jobs of a worker that died are requeued once the lease runs
+out, so a job may run more than once — keep job functions idempotent.
+
+With JOBS_EAGER the job runs inside enqueue() (tests).
+"""
+
+import os
+import random
+import socket
+import sys
+import threading
+import traceback
+from concurrent import futures
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job, JobStatus
+
+
+_registry = {}   # name → (function, max_attempts)
+
+
+def job(name, max_attempts=None):
+    """Register a job function under `name`; it is called as func(job, **kwargs)."""
+    def register(func):
+        _registry[name] = (func, max_attempts)
+        return func
+    return register
+
+
+def enqueue(name, user=None, run_at=None, **kwargs) -> Job:
+    """Queue `name(**kwargs)`; kwargs must be JSON-serializable."""
+    if name not in _registry:
+        raise LookupError(f"No job registered as {name!r}")
+    _, max_attempts = _registry[name]
+    new_job = Job.objects.create(
+        name=name,
+        args=kwargs,
+        max_attempts=max_attempts or settings.JOBS_MAX_ATTEMPTS,
+        run_at=run_at or timezone.now(),
+        created_by=user,
+        business_id=getattr(user, "business_id", None),
+    )
+    if settings.JOBS_EAGER:
+        while new_job.status == JobStatus.QUEUED:   # retries run back to back
+            _claim_one(new_job, "eager")
+            execute(new_job, "eager")
+    return new_job
+
+
+# ─── Running ─────────────────────────────────────────────────────────────────
+
+def _lease():
+    return timezone.now() + timedelta(seconds=settings.JOBS_LEASE_SECONDS)
+
+
+def _claim_one(job_obj, worker_id) -> bool:
+    now = timezone.now()
+    claimed = Job.objects.filter(pk=job_obj.pk, status=JobStatus.QUEUED).update(
+        status=JobStatus.RUNNING, attempts=F("attempts") + 1,
+        locked_by=worker_id, locked_until=_lease(), started_at=now,
+    )
+    if claimed:
+        job_obj.refresh_from_db()
+    return bool(claimed)
+
+
+def claim(worker_id, limit) -> list:
+    """Atomically take up to `limit` due jobs for `worker_id`."""
+    due = (
+        Job.objects.filter(status=JobStatus.QUEUED, run_at__lte=timezone.now())
+        .order_by("run_at", "pk")
+        .values_list("pk", flat=True)[:limit * 2]   # some may be taken by other workers meanwhile
+    )
+    claimed = []
+    for pk in due:
+        job_obj = Job(pk=pk)
+        if _claim_one(job_obj, worker_id):
+            claimed.append(job_obj)
+            if len(claimed) == limit:
+                break
+    return claimed
+
+
+def backoff(attempt) -> float:
+    """Seconds before retry number `attempt` (1-based): exponential, capped, jittered."""
+    delay = min(settings.JOBS_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1), settings.JOBS_RETRY_BACKOFF_MAX_SECONDS)
+    return delay * random.uniform(0.5, 1.0)
+
+
+def _describe(exc) -> str:
+    """"RuntimeError: attempt 3 failed" — the last line of the traceback, shortened."""
+    message = traceback.format_exception_only(exc)[-1].strip()
+    return message if len(message) <= 200 else message[:199] + "…"
+
+
+def execute(job_obj, worker_id):
+    """Run a claimed job and record the outcome (unless the lease was lost meanwhile)."""
+    func, _ = _registry.get(job_obj.name, (None, None))
+    try:
+        if func is None:
+            raise LookupError(f"No job registered as {job_obj.name!r}")
+        result = func(job_obj, **job_obj.args)
+    except Exception as exc:
+        # The traceback would reveal code and data to everyone who can poll the job
+        failure = {"error": _describe(exc), "traceback": traceback.format_exc()}
+        if job_obj.attempts < job_obj.max_attempts:
+            retry_at = timezone.now() + timedelta(seconds=backoff(job_obj.attempts))
+            update = {"status": JobStatus.QUEUED, "run_at": retry_at, **failure}
+        else:
+            update = {"status": JobStatus.FAILED, "finished_at": timezone.now(), **failure}
+    else:
+        update = {"status": JobStatus.SUCCEEDED, "finished_at": timezone.now(), "result": result, "progress": 1.0}
+
+    update.update(locked_by="", locked_until=None)
+    if Job.objects.filter(pk=job_obj.pk, status=JobStatus.RUNNING, locked_by=worker_id).update(**update):
+        for field, value in update.items():
+            setattr(job_obj, field, value)
+
+
+def requeue_expired() -> int:
+    """Give the jobs of dead workers (lease ran out) back to the queue, or fail them."""
+    now = timezone.now()
+    expired = Job.objects.filter(status=JobStatus.RUNNING, locked_until__lt=now)
+    error = "Worker stopped responding while running this job."
+    requeued = expired.filter(attempts__lt=F("max_attempts")).update(
+        status=JobStatus.QUEUED, run_at=now, locked_by="", locked_until=None, error=error, traceback="",
+    )
+    failed = expired.update(
+        status=JobStatus.FAILED, finished_at=now, locked_by="", locked_until=None, error=error, traceback="",
+    )
+    return requeued + failed
+
+
+def _has_due_jobs() -> bool:
+    return Job.objects.filter(status=JobStatus.QUEUED, run_at__lte=timezone.now()).exists()
+
+
+class Worker:
+    def __init__(self, concurrency=None, poll_interval=None):
+        self.id            = f"{socket.gethostname()}:{os.getpid()}"
+        self.concurrency   = concurrency or settings.JOBS_CONCURRENCY
+        self.poll_interval = poll_interval if poll_interval is not None else settings.JOBS_POLL_SECONDS
+        self.stopping      = threading.Event()
+        self._pool         = futures.ThreadPoolExecutor(self.concurrency, thread_name_prefix="job")
+        self._running      = set()
+
+    def stop(self):
+        """Stop claiming; run() returns once the running jobs have finished."""
+        self.stopping.set()
+
+    def run(self, burst=False):
+        """Process jobs until stop() — or, with burst, until nothing is due."""
+        try:
+            while not self.stopping.is_set():
+                requeue_expired()
+                Job.objects.filter(status=JobStatus.RUNNING, locked_by=self.id).update(locked_until=_lease())
+
+                self._running = {f for f in self._running if not f.done()}
+                free = self.concurrency - len(self._running)
+                claimed = claim(self.id, free) if free else []
+                for job_obj in claimed:
+                    self._running.add(self._pool.submit(self._execute, job_obj))
+
+                if burst and not claimed:
+                    futures.wait(self._running)
+                    if not _has_due_jobs():
+                        break
+                elif len(self._running) >= self.concurrency:
+                    futures.wait(self._running, timeout=self.poll_interval, return_when=futures.FIRST_COMPLETED)
+                elif not claimed:
+                    self.stopping.wait(self.poll_interval)
+        finally:
+            self._pool.shutdown(wait=True)
+            connections.close_all()
+
+    def _execute(self, job_obj):
+        try:
+            execute(job_obj, self.id)
+        except Exception:  # a database error while recording the outcome — the lease will expire
+            traceback.print_exc(file=sys.stderr)
+        finally:
+            connections.close_all()   # this pool thread's connections
@@ -0,0 +1,12 @@
+from rest_framework import serializers
+
+from .models import Job
+
+
+class JobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model  = Job
+        fields = [
+            "id", "name", "status", "progress", "message", "result", "error",
+            "attempts", "max_attempts", "created_at", "started_at", "finished_at",
+        ]
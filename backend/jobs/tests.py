@@ -0,0 +1,148 @@
+from concurrent import futures
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from users.models import Business, Role, User
+from .models import Job, JobStatus
+from .runner import Worker, _claim_one, claim, enqueue, job, requeue_expired
+
+
+calls = []
+
+
+@job("tests.add")
+def add(job, a, b):
+    job.report(0.5, "halfway")
+    calls.append((a, b))
+    return {"sum": a + b}
+
+
+@job("tests.flaky", max_attempts=3)
+def flaky(job, fail_times):
+    if job.attempts <= fail_times:
+        raise RuntimeError(f"attempt {job.attempts} failed")
+    return job.attempts
+
+
+def login(client, user):
+    client.cookies["access_token"] = str(RefreshToken.for_user(user).access_token)
+
+
+@override_settings(JOBS_EAGER=True)
+class EagerJobTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.business = Business.objects.create(name="Acme Corp", email="acme@example.com")
+        cls.admin = User.objects.create_user(
+            email="admin@acme.com", password="password123", role=Role.ADMIN, business=cls.business,
+        )
+        cls.editor = User.objects.create_user(
+            email="editor@acme.com", password="password123", role=Role.EDITOR, business=cls.business,
+        )
+
+    def test_runs_inline(self):
+        done = enqueue("tests.add", user=self.editor, a=2, b=3)
+        done.refresh_from_db()
+        self.assertEqual((done.status, done.result, done.progress, done.attempts), (JobStatus.SUCCEEDED, {"sum": 5}, 1.0, 1))
+
+    def test_retries_then_gives_up(self):
+        self.assertEqual(enqueue("tests.flaky", fail_times=2).result, 3)
+        failed = enqueue("tests.flaky", fail_times=5)
+        self.assertEqual((failed.status, failed.attempts), (JobStatus.FAILED, 3))
+        self.assertEqual(failed.error, "RuntimeError: attempt 3 failed")
+        self.assertIn("Traceback (most recent call last):", failed.traceback)
+
+    def test_unknown_job(self):
+        with self.assertRaises(LookupError):
+            enqueue("tests.nope")
+
+    def test_traceback_is_not_exposed(self):
+        failed = enqueue("tests.flaky", user=self.editor, fail_times=5)
+        login(self.client, self.editor)
+        body = self.client.get(f"/api/jobs/{failed.pk}/").json()
+        self.assertEqual(body["error"], "RuntimeError: attempt 3 failed")
+        self.assertNotIn("traceback", body)
+        self.assertNotIn("Traceback", str(body))
+
+    def test_status_endpoint_visibility(self):
+        own = enqueue("tests.add", user=self.editor, a=1, b=1)
+        login(self.client, self.editor)
+        response = self.client.get(f"/api/jobs/{own.pk}/")
+        self.assertEqual(response.json()["status"], "succeeded")
+
+        admins = enqueue("tests.add", user=self.admin, a=1, b=1)
+        self.assertEqual(self.client.get(f"/api/jobs/{admins.pk}/").status_code, 404)
+        login(self.client, self.admin)
+        self.assertEqual([j["id"] for j in self.client.get("/api/jobs/").json()], [admins.pk, own.pk])
+
+    def test_snapshot_rebuild_returns_the_job(self):
+        login(self.client, self.admin)
+        with mock.patch("products.jobs.build_snapshot", return_value={"version": "1", "count": 0}):
+            response = self.client.post("/api/products/snapshot/")
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()["result"], {"version": "1", "count": 0})
+        login(self.client, self.editor)
+        self.assertEqual(self.client.post("/api/products/snapshot/").status_code, 403)
+
+
+class InlineExecutor(futures.Executor):
+    """Runs each submitted call right away on the calling thread."""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def submit(self, fn, /, *args, **kwargs):
+        future = futures.Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as exc:
+            future.set_exception(exc)
+        return future
+
+
+class WorkerTests(TransactionTestCase):
+    def setUp(self):
+        calls.clear()
+        # Single-threaded: SQLite's shared in-memory test database can't take
+        # concurrent writers (the claim race itself is test_claims_never_overlap)
+        patcher = mock.patch("jobs.runner.futures.ThreadPoolExecutor", InlineExecutor)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_burst_runs_everything_due(self):
+        jobs = [enqueue("tests.add", a=i, b=i) for i in range(6)]
+        later = enqueue("tests.add", run_at=timezone.now() + timedelta(hours=1), a=0, b=0)
+        Worker(concurrency=3, poll_interval=0.01).run(burst=True)
+        self.assertEqual(sorted(calls), [(i, i) for i in range(6)])
+        self.assertEqual(
+            set(Job.objects.filter(pk__in=[j.pk for j in jobs]).values_list("status", flat=True)), {JobStatus.SUCCEEDED},
+        )
+        self.assertEqual(Job.objects.get(pk=later.pk).status, JobStatus.QUEUED)
+
+    def test_failed_job_waits_for_backoff(self):
+        flaky_job = enqueue("tests.flaky", fail_times=1)
+        Worker(concurrency=1, poll_interval=0.01).run(burst=True)
+        flaky_job.refresh_from_db()
+        self.assertEqual((flaky_job.status, flaky_job.attempts), (JobStatus.QUEUED, 1))
+        self.assertGreater(flaky_job.run_at, timezone.now())
+
+    def test_claims_never_overlap(self):
+        jobs = [enqueue("tests.add", a=i, b=0) for i in range(3)]
+        first = claim("w1", 2)
+        # A worker that read the queue before w1 claimed loses the race for those rows
+        self.assertFalse(_claim_one(Job(pk=first[0].pk), "w2"))
+        second = claim("w2", 5)
+        self.assertEqual(sorted(j.pk for j in first + second), [j.pk for j in jobs])
+        self.assertEqual(Job.objects.get(pk=second[0].pk).locked_by, "w2")
+
+    def test_expired_lease_is_requeued(self):
+        stuck = enqueue("tests.add", a=1, b=1)
+        claim("dead-worker", 1)
+        Job.objects.filter(pk=stuck.pk).update(locked_until=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(requeue_expired(), 1)
+        stuck.refresh_from_db()
+        self.assertEqual((stuck.status, stuck.locked_by), (JobStatus.QUEUED, ""))
@@ -0,0 +1,41 @@
+from django.db.models import Q
+from django.shortcuts import get_object_or_404
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from users.permissions import IsInternalUser
+from .models import Job
+from .serializers import JobSerializer
+
+
+LIST_LIMIT = 100
+
+
+def visible_jobs(user):
+    """A user sees their own jobs; admins see every job of their business."""
+    if user.is_admin and user.business_id:
+        return Job.objects.filter(Q(created_by=user) | Q(business_id=user.business_id))
+    return Job.objects.filter(created_by=user)
+
+
+class JobListView(APIView):
+    """
+    GET /api/jobs/   → the latest 100 visible jobs, newest first (all internal roles)
+    """
+    permission_classes = [IsInternalUser]
+
+    def get(self, request):
+        jobs = visible_jobs(request.user)[:LIST_LIMIT]
+        return Response(JobSerializer(jobs, many=True).data)
+
+
+class JobDetailView(APIView):
+    """
+    GET /api/jobs/:id/   → status, progress, result or error of one job.
+    Poll it with the id returned when the job was started.
+    """
+    permission_classes = [IsInternalUser]
+
+    def get(self, request, pk):
+        job = get_object_or_404(visible_jobs(request.user), pk=pk)
+        return Response(JobSerializer(job).data)
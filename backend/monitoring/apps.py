@@ -0,0 +1,12 @@
+import atexit
+
+from django.apps import AppConfig
+
+
+class MonitoringConfig(AppConfig):
+    name = 'monitoring'
+
+    def ready(self):
+        from . import metrics
+        # Don't lose the counts since the last periodic flush when a worker exits
+        atexit.register(metrics.flush, force=True)
@@ -0,0 +1,81 @@
+import json
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from monitoring.profiling import parse_collapsed, to_collapsed, to_speedscope
+
+
+class Command(BaseCommand):
+    help = (
+        "Aggregate the request profiles in PROFILING_DIR per view: top frames by "
+        "self and total time, plus (with --output) one merged flame graph per view."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dir", default=settings.PROFILING_DIR, help="Profile directory (default: PROFILING_DIR)")
+        parser.add_argument("--route", action="append", help="Only these route names (repeatable)")
+        parser.add_argument("--top", type=int, default=15, help="Frames listed per view")
+        parser.add_argument(
+            "--interval-ms", type=float, default=settings.PROFILING_INTERVAL_MS,
+            help="Sampling interval the profiles were taken with (default: PROFILING_INTERVAL_MS)",
+        )
+        parser.add_argument("--output", help="Write <route>.collapsed and <route>.speedscope.json here")
+
+    def handle(self, *args, **options):
+        root = Path(options["dir"])
+        if not root.is_dir():
+            raise CommandError(f"No profiles in {root}")
+        interval_ms = options["interval_ms"]
+        output = Path(options["output"]) if options["output"] else None
+        if output:
+            output.mkdir(parents=True, exist_ok=True)
+
+        views = []
+        for folder in sorted(p for p in root.iterdir() if p.is_dir()):
+            if options["route"] and folder.name not in options["route"]:
+                continue
+            files = sorted(folder.glob("*.collapsed"))
+            if not files:
+                continue
+            samples = Counter()
+            for path in files:
+                samples.update(parse_collapsed(path.read_text()))
+            views.append((folder.name, len(files), samples))
+
+        if not views:
+            raise CommandError("No matching profiles found")
+
+        # Heaviest views first
+        views.sort(key=lambda view: sum(view[2].values()), reverse=True)
+        for route, profiles, samples in views:
+            self._summarise(route, profiles, samples, interval_ms, options["top"])
+            if output:
+                (output / f"{route}.collapsed").write_text(to_collapsed(samples))
+                (output / f"{route}.speedscope.json").write_text(
+                    json.dumps(to_speedscope(samples, route, interval_ms))
+                )
+        if output:
+            self.stdout.write(f"Merged profiles written to {output}")
+
+    def _summarise(self, route, profiles, samples, interval_ms, top):
+        total = sum(samples.values())
+        self_counts, total_counts = Counter(), Counter()
+        for stack, count in samples.items():
+            frames = stack.split(";")
+            self_counts[frames[-1]] += count
+            for frame in set(frames):   # recursion counts a frame once per sample
+                total_counts[frame] += count
+
+        seconds = total * interval_ms / 1000
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"{route} — {profiles} profile(s), {total:,} samples (~{seconds:.2f}s)"
+        ))
+        self.stdout.write(f"  {'self %':>7} {'total %':>8}  frame")
+        for frame, count in self_counts.most_common(top):
+            self.stdout.write(
+                f"  {100 * count / total:>7.1f} {100 * total_counts[frame] / total:>8.1f}  {frame}"
+            )
+        self.stdout.write("")
@@ -0,0 +1,312 @@
+"""
+In-process metrics with Prometheus text exposition.
+
+Recording is lock-free: every thread writes to its own shard (plain dicts
+only that thread mutates), and a scrape merges the shards.  When a thread
+exits, its shard is folded into a shared one, so thread-per-request servers
+don't pile up shards.  Each process periodically dumps its merged snapshot
+to METRICS_DIR/<pid>.json, and the /metrics view sums the files of all
+workers, so any worker can answer a scrape for the whole server.  The files
+of workers that have died are folded into METRICS_DIR/archived.json.
+Without METRICS_DIR only the answering process is reported (fine for
+runserver / a single worker).
+"""
+
+import json
+import os
+import threading
+import time
+import weakref
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows: dead workers' files are left in place
+    fcntl = None
+
+from django.conf import settings
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS    = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+QUERY_BUCKETS   = (0, 1, 2, 5, 10, 20, 50, 100)
+TOKEN_BUCKETS   = (250, 500, 1000, 2000, 4000, 8000, 16000)
+
+# name → (type, help, buckets)
+METRICS = {
+    "http_requests_total": (
+        "counter", "HTTP responses by route, method and status code.", None),
+    "http_request_duration_seconds": (
+        "histogram", "Time spent producing the response.", LATENCY_BUCKETS),
+    "http_response_size_bytes": (
+        "histogram", "Response body size as sent (after compression).", SIZE_BUCKETS),
+    "db_queries_per_request": (
+        "histogram", "SQL queries executed per request.", QUERY_BUCKETS),
+    "db_query_duration_seconds_total": (
+        "counter", "Time spent executing SQL queries.", None),
+    "chat_prompt_tokens": (
+        "histogram", "Input tokens per LLM chat request (as counted when the prompt was assembled).", TOKEN_BUCKETS),
+    "llm_calls_total": (
+        "counter", "LLM provider attempts by outcome (ok, transient_error, error, rejected by the breaker, hedged).", None),
+    "chat_fast_path_total": (
+        "counter", "Chat messages answered from the catalog (hit) or sent to the LLM (miss), by intent.", None),
+}
+
+
+# ─── Recording ───────────────────────────────────────────────────────────────
+
+class _Shard:
+    __slots__ = ("counters", "histograms")
+
+    def __init__(self):
+        self.counters   = {}   # (name, labels) → value
+        self.histograms = {}   # (name, labels) → [bucket counts..., +Inf count, sum]
+
+
+class _Owner:
+    """Referenced only from a thread's local storage, so it dies with the thread."""
+    __slots__ = ("__weakref__",)
+
+
+class Registry:
+    def __init__(self):
+        self._local   = threading.local()
+        self._lock    = threading.Lock()   # guards _shards and _retired, not recording
+        self._shards  = set()              # shards of live threads
+        self._retired = _Shard()           # what exited threads recorded
+
+    def _shard(self):
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = _Shard()
+            with self._lock:
+                self._shards.add(shard)
+            self._local.shard = shard
+            self._local.owner = owner = _Owner()
+            weakref.finalize(owner, self._retire, shard).atexit = False
+            return shard
+
+    def _retire(self, shard):
+        """Fold an exited thread's shard into _retired (it is no longer written to)."""
+        with self._lock:
+            self._shards.discard(shard)
+            _merge(self._retired, shard.counters, shard.histograms)
+
+    def inc(self, name, labels, amount=1):
+        counters = self._shard().counters
+        counters[name, labels] = counters.get((name, labels), 0) + amount
+
+    def observe(self, name, labels, value):
+        histograms = self._shard().histograms
+        buckets = METRICS[name][2]
+        slots = histograms.get((name, labels))
+        if slots is None:
+            slots = histograms[name, labels] = [0] * (len(buckets) + 2)
+        for i, bound in enumerate(buckets):
+            if value <= bound:
+                slots[i] += 1
+                break
+        else:
+            slots[-2] += 1
+        slots[-1] += value
+
+    def snapshot(self) -> dict:
+        """Merge every thread's shard into {"counters": {...}, "histograms": {...}}."""
+        merged = _Shard()
+        with self._lock:
+            for shard in (self._retired, *self._shards):
+                # dict.copy() runs without releasing the GIL, so the copies are consistent
+                _merge(merged, shard.counters.copy(), shard.histograms.copy())
+        return {"counters": merged.counters, "histograms": merged.histograms}
+
+    def clear(self):
+        with self._lock:
+            for shard in (self._retired, *self._shards):
+                shard.counters.clear()
+                shard.histograms.clear()
+
+
+def _merge(into, counters, histograms):
+    """Add counters/histograms into the _Shard `into` (slot lists are copied)."""
+    for key, value in counters.items():
+        into.counters[key] = into.counters.get(key, 0) + value
+    for key, slots in histograms.items():
+        _add_slots(into.histograms, key, list(slots))
+
+
+def _add_slots(histograms, key, slots):
+    merged = histograms.get(key)
+    if merged is None:
+        histograms[key] = slots
+    else:
+        for i, value in enumerate(slots):
+            merged[i] += value
+
+
+registry = Registry()
+
+
+# ─── Cross-process aggregation ───────────────────────────────────────────────
+
+def _metrics_dir():
+    path = getattr(settings, "METRICS_DIR", "")
+    return Path(path) if path else None
+
+
+def _encode(snapshot) -> dict:
+    return {
+        "counters":   [[name, list(map(list, labels)), value] for (name, labels), value in snapshot["counters"].items()],
+        "histograms": [[name, list(map(list, labels)), slots] for (name, labels), slots in snapshot["histograms"].items()],
+    }
+
+
+def _decode(data) -> dict:
+    def key(name, labels):
+        return name, tuple(tuple(pair) for pair in labels)
+    return {
+        "counters":   {key(name, labels): value for name, labels, value in data["counters"]},
+        "histograms": {key(name, labels): slots for name, labels, slots in data["histograms"]},
+    }
+
+
+_last_flush = 0.0
+
+
+def flush(force=False):
+    """Write this process's snapshot to METRICS_DIR (at most every METRICS_FLUSH_INTERVAL s)."""
+    global _last_flush
+    directory = _metrics_dir()
+    now = time.monotonic()
+    if directory is None or (not force and now - _last_flush < settings.METRICS_FLUSH_INTERVAL):
+        return
+    _last_flush = now
+
+    directory.mkdir(parents=True, exist_ok=True)
+    _write(directory / f"{os.getpid()}.json", registry.snapshot())
+    _reap(directory)
+
+
+def _write(path, snapshot):
+    tmp = path.with_name(f"{path.stem}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_text(json.dumps(_encode(snapshot)))
+    os.replace(tmp, path)  # atomic: readers never see half a file
+
+
+def _pid_alive(pid) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True   # alive, but another user's
+    return True
+
+
+def _reap(directory):
+    """
+    Fold the files of workers that have exited into archived.json, like
+    prometheus_client's mark_process_dead() — but keeping their counts, so
+    the server's totals never go backwards.  The workers must share a host
+    (their pids are checked).
+    """
+    if fcntl is None:
+        return
+    own  = os.getpid()
+    dead = [
+        path for path in directory.glob("*.json")
+        if path.stem.isdigit() and int(path.stem) != own and not _pid_alive(int(path.stem))
+    ]
+    if not dead:
+        return
+
+    with open(directory / "archived.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)   # one reaper at a time
+        archive_path = directory / "archived.json"
+        try:
+            archive = _decode(json.loads(archive_path.read_text()))
+        except (OSError, ValueError):
+            archive = {"counters": {}, "histograms": {}}
+        merged = _Shard()
+        _merge(merged, archive["counters"], archive["histograms"])
+
+        reaped = []
+        for path in dead:
+            try:
+                other = _decode(json.loads(path.read_text()))
+            except FileNotFoundError:
+                continue   # another worker reaped it first
+            except (OSError, ValueError):
+                other = {"counters": {}, "histograms": {}}   # corrupt: drop it
+            _merge(merged, other["counters"], other["histograms"])
+            reaped.append(path)
+
+        _write(archive_path, {"counters": merged.counters, "histograms": merged.histograms})
+        for path in reaped:
+            path.unlink(missing_ok=True)
+
+
+def collect() -> dict:
+    """This process's live snapshot plus the last flushed snapshot of every other (and every dead) worker."""
+    combined = registry.snapshot()
+    directory = _metrics_dir()
+    if directory is None or not directory.is_dir():
+        return combined
+
+    own = f"{os.getpid()}.json"
+    for path in directory.glob("*.json"):
+        if path.name == own:
+            continue
+        try:
+            other = _decode(json.loads(path.read_text()))
+        except (OSError, ValueError):
+            continue  # being replaced or corrupt — skip this scrape
+        for key, value in other["counters"].items():
+            combined["counters"][key] = combined["counters"].get(key, 0) + value
+        for key, slots in other["histograms"].items():
+            _add_slots(combined["histograms"], key, slots)
+    return combined
+
+
+# ─── Exposition ──────────────────────────────────────────────────────────────
+
+def _escape(value) -> str:
+    return str(value).replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _labels(labels, extra=()) -> str:
+    pairs = [*labels, *extra]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _number(value) -> str:
+    if isinstance(value, float):
+        return repr(round(value, 9))
+    return str(value)
+
+
+def render(snapshot) -> str:
+    """Prometheus text format (version 0.0.4)."""
+    lines = []
+    for name, (kind, help_text, buckets) in METRICS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        if kind == "counter":
+            for (metric, labels), value in sorted(snapshot["counters"].items()):
+                if metric == name:
+                    lines.append(f"{name}{_labels(labels)} {_number(value)}")
+            continue
+        for (metric, labels), slots in sorted(snapshot["histograms"].items()):
+            if metric != name:
+                continue
+            cumulative = 0
+            for bound, count in zip(buckets, slots):
+                cumulative += count
+                lines.append(f"{name}_bucket{_labels(labels, [('le', bound)])} {cumulative}")
+            cumulative += slots[-2]
+            lines.append(f"{name}_bucket{_labels(labels, [('le', '+Inf')])} {cumulative}")
+            lines.append(f"{name}_sum{_labels(labels)} {_number(slots[-1])}")
+            lines.append(f"{name}_count{_labels(labels)} {cumulative}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,168 @@
+import random
+import sys
+import time
+import uuid
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from . import metrics
+from .metrics import registry
+from .profiling import get_sampler, write_profile
+from .tracing import CLIENT, NOOP, span, start_trace
+
+
+KNOWN_METHODS = {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"}
+
+
+class _QueryTimer:
+    """connection.execute_wrapper() hook counting queries and their time."""
+
+    __slots__ = ("count", "seconds")
+
+    def __init__(self):
+        self.count   = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count   += 1
+            self.seconds += time.perf_counter() - started
+
+
+def route_name(request) -> str:
+    """The resolved URL name (namespaced, e.g. "admin:index"), or "unmatched"."""
+    match = getattr(request, "resolver_match", None)
+    if match is None or not match.url_name:
+        return "unmatched"
+    return match.view_name
+
+
+class MetricsMiddleware:
+    """
+    Records per-route latency, response size, status code and SQL query
+    count/time for every request (see monitoring/metrics.py).  Sits first in
+    MIDDLEWARE so latency covers the whole stack and size is what goes on the
+    wire.  Labels are bounded: route names come from urls.py, unknown HTTP
+    methods collapse into "other".
+    """
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timer = _QueryTimer()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timer))
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - started
+
+        route  = route_name(request)
+        method = request.method if request.method in KNOWN_METHODS else "other"
+        labels = (("route", route), ("method", method))
+
+        registry.inc("http_requests_total", labels + (("status", str(response.status_code)),))
+        registry.observe("http_request_duration_seconds", labels, elapsed)
+        registry.observe("db_queries_per_request", labels, timer.count)
+        registry.inc("db_query_duration_seconds_total", labels, timer.seconds)
+
+        if not response.streaming:
+            registry.observe("http_response_size_bytes", labels, len(response.content))
+        elif response.has_header("Content-Length"):
+            registry.observe("http_response_size_bytes", labels, int(response["Content-Length"]))
+
+        metrics.flush()
+        return response
+
+
+def _trace_query(execute, sql, params, many, context):
+    attributes = {"db.system": context["connection"].vendor, "db.statement": sql[:2000]}
+    with span("db.query", attributes, CLIENT) as current:
+        result = execute(sql, params, many, context)
+        rowcount = getattr(context["cursor"], "rowcount", -1)
+        if rowcount >= 0:
+            current.set("db.rows_affected", rowcount)
+        return result
+
+
+class TracingMiddleware:
+    """
+    Opens the root span of each sampled request (see monitoring/tracing.py)
+    and records every SQL query as a child span.  Not installed at all while
+    TRACING_EXPORTER is empty.
+    """
+
+    def __init__(self, get_response):
+        if not settings.TRACING_EXPORTER:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        attributes = {"http.request.method": request.method, "url.path": request.path}
+        with start_trace(f"{request.method}", request.headers.get("traceparent"), attributes) as root:
+            if root is NOOP:
+                return self.get_response(request)
+
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(_trace_query))
+                response = self.get_response(request)
+
+            route = route_name(request)
+            root.name = f"{request.method} {route}"
+            root.set("http.route", route)
+            root.set("http.response.status_code", response.status_code)
+            if response.status_code >= 500:
+                root.error = f"HTTP {response.status_code}"
+            return response
+
+
+class ProfilingMiddleware:
+    """
+    Opt-in statistical profiling (see monitoring/profiling.py).  Keeps the
+    profile of a random PROFILING_SAMPLE_RATE share of requests and of every
+    request slower than PROFILING_SLOW_MS, and names the file after the
+    route and the request id (X-Request-ID, or a generated one returned in
+    X-Profile-Id).
+    """
+
+    def __init__(self, get_response):
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sampler = get_sampler(settings.PROFILING_INTERVAL_MS)
+
+    def __call__(self, request):
+        sampled = random.random() < settings.PROFILING_SAMPLE_RATE
+        slow_ms = settings.PROFILING_SLOW_MS
+        if not sampled and not slow_ms:
+            return self.get_response(request)
+
+        recording = self.sampler.start(sys._getframe())
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            self.sampler.stop(recording)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        if sampled or elapsed_ms >= slow_ms:
+            # copy() first: the sampler may still be finishing a tick on this recording
+            samples = recording.samples.copy()
+            if samples:
+                request_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex[:12]
+                write_profile(
+                    settings.PROFILING_DIR, route_name(request), request_id, samples,
+                    settings.PROFILING_INTERVAL_MS, settings.PROFILING_FORMATS,
+                )
+                response["X-Profile-Id"] = request_id
+        return response
@@ -0,0 +1,180 @@
+"""
+Statistical profiler for individual requests.
+
+One daemon thread wakes every PROFILING_INTERVAL_MS, grabs the current stack
+of every registered request thread with sys._current_frames() and counts it
+in that request's recording — no tracing hooks, so the profiled code runs at
+full speed.  ProfilingMiddleware decides what to keep:
+
+    - a random PROFILING_SAMPLE_RATE share of requests, and
+    - any request slower than PROFILING_SLOW_MS (every request is then
+      recorded and the fast ones are thrown away)
+
+Kept profiles are written under PROFILING_DIR/<route>/ as
+
+    <timestamp>-<request id>.collapsed         "frame;frame;frame <count>" lines
+    <timestamp>-<request id>.speedscope.json   open in https://www.speedscope.app
+
+and `python manage.py profile_summary` aggregates them per view.
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+
+# ─── Sampler ─────────────────────────────────────────────────────────────────
+
+class Recording:
+    __slots__ = ("thread_id", "stop_frame", "samples")
+
+    def __init__(self, thread_id, stop_frame):
+        self.thread_id  = thread_id
+        self.stop_frame = stop_frame   # stacks are cut just above this frame
+        self.samples    = Counter()    # collapsed stack → sample count
+
+
+_labels = {}   # code object → frame label
+_LIBRARY_PREFIX = re.compile(r"^.*[/\\](?:site-packages|dist-packages|lib[/\\]python\d+\.\d+)[/\\]")
+
+
+def frame_label(code) -> str:
+    label = _labels.get(code)
+    if label is None:
+        filename, stripped = _LIBRARY_PREFIX.subn("", code.co_filename)
+        if not stripped and os.path.isabs(filename):
+            filename = os.path.relpath(filename)
+        label = _labels[code] = f"{code.co_name} ({filename}:{code.co_firstlineno})"
+    return label
+
+
+def collapse(frame, stop_frame) -> str:
+    """Root-first "a;b;c" for the stack ending at `frame`, excluding stop_frame and its callers."""
+    labels = []
+    while frame is not None and frame is not stop_frame:
+        labels.append(frame_label(frame.f_code))
+        frame = frame.f_back
+    labels.reverse()
+    return ";".join(labels)
+
+
+class Sampler:
+    def __init__(self, interval):
+        self.interval   = interval
+        self.recordings = {}   # thread id → Recording; written only by the owning request thread
+        self._busy      = threading.Event()   # lets the thread sleep while nothing is recorded
+        self._thread    = None
+        self._start_lock = threading.Lock()
+
+    def start(self, stop_frame) -> Recording:
+        self._ensure_running()
+        recording = Recording(threading.get_ident(), stop_frame)
+        self.recordings[recording.thread_id] = recording
+        self._busy.set()
+        return recording
+
+    def stop(self, recording):
+        self.recordings.pop(recording.thread_id, None)
+
+    def _ensure_running(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            self._busy.wait()
+            time.sleep(self.interval)
+            if not self.recordings:
+                self._busy.clear()
+                if self.recordings:   # a request started in between
+                    self._busy.set()
+                continue
+            frames = sys._current_frames()
+            for recording in list(self.recordings.values()):
+                frame = frames.get(recording.thread_id)
+                if frame is not None:
+                    recording.samples[collapse(frame, recording.stop_frame)] += 1
+            del frames   # don't keep every thread's frames alive until the next tick
+
+
+_sampler = None
+
+
+def get_sampler(interval_ms) -> Sampler:
+    global _sampler
+    if _sampler is None:
+        _sampler = Sampler(interval_ms / 1000)
+    return _sampler
+
+
+# ─── Output ──────────────────────────────────────────────────────────────────
+
+_UNSAFE = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+def safe_name(value) -> str:
+    return _UNSAFE.sub("_", value)[:100] or "_"
+
+
+def to_collapsed(samples) -> str:
+    return "".join(f"{stack} {count}\n" for stack, count in samples.most_common() if stack)
+
+
+def parse_collapsed(text) -> Counter:
+    samples = Counter()
+    for line in text.splitlines():
+        stack, _, count = line.rpartition(" ")
+        if stack and count.isdigit():
+            samples[stack] += int(count)
+    return samples
+
+
+def to_speedscope(samples, name, interval_ms) -> dict:
+    """A speedscope "sampled" profile (https://www.speedscope.app/file-format-schema.json)."""
+    frames, index = [], {}
+    stacks, weights = [], []
+    for stack, count in samples.most_common():
+        if not stack:
+            continue
+        ids = []
+        for label in stack.split(";"):
+            if label not in index:
+                index[label] = len(frames)
+                frames.append({"name": label})
+            ids.append(index[label])
+        stacks.append(ids)
+        weights.append(count * interval_ms)
+    total = sum(weights)
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "shared": {"frames": frames},
+        "profiles": [{
+            "type": "sampled", "name": name, "unit": "milliseconds",
+            "startValue": 0, "endValue": total, "samples": stacks, "weights": weights,
+        }],
+        "name": name,
+        "activeProfileIndex": 0,
+        "exporter": "monitoring.profiling",
+    }
+
+
+def write_profile(directory, route, request_id, samples, interval_ms, formats) -> Path:
+    """Write one request's profile; returns the path without extension."""
+    folder = Path(directory) / safe_name(route)
+    folder.mkdir(parents=True, exist_ok=True)
+    base = folder / f"{time.strftime('%Y%m%dT%H%M%S')}-{safe_name(request_id)}"
+    if "collapsed" in formats:
+        base.with_name(base.name + ".collapsed").write_text(to_collapsed(samples))
+    if "speedscope" in formats:
+        profile = to_speedscope(samples, f"{route} {request_id}", interval_ms)
+        base.with_name(base.name + ".speedscope.json").write_text(json.dumps(profile))
+    return base
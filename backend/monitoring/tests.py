@@ -0,0 +1,198 @@
+import gc
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import Counter
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from users.models import Business, Role, User
+from . import tracing
+from .metrics import Registry, collect, flush, registry, render
+from .profiling import parse_collapsed, to_collapsed
+
+
+class RegistryTests(SimpleTestCase):
+    def test_threads_record_into_separate_shards(self):
+        reg = Registry()
+
+        def work():
+            for _ in range(1000):
+                reg.inc("http_requests_total", (("route", "x"),))
+                reg.observe("http_request_duration_seconds", (("route", "x"),), 0.02)
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        snapshot = reg.snapshot()
+        self.assertEqual(snapshot["counters"]["http_requests_total", (("route", "x"),)], 4000)
+        slots = snapshot["histograms"]["http_request_duration_seconds", (("route", "x"),)]
+        self.assertEqual(sum(slots[:-1]), 4000)
+
+    def test_exited_threads_shards_are_folded(self):
+        reg = Registry()
+        labels = (("route", "x"),)
+        for _ in range(3):
+            thread = threading.Thread(target=reg.inc, args=("http_requests_total", labels, 5))
+            thread.start()
+            thread.join()
+        gc.collect()
+        self.assertEqual(reg._shards, set())
+        reg.inc("http_requests_total", labels)
+        self.assertEqual(len(reg._shards), 1)
+        self.assertEqual(reg.snapshot()["counters"]["http_requests_total", labels], 16)
+
+    def test_render_histogram_is_cumulative(self):
+        reg = Registry()
+        labels = (("route", 'a"b'),)
+        for value in (0.001, 0.03, 99):
+            reg.observe("http_request_duration_seconds", labels, value)
+        text = render(reg.snapshot())
+        self.assertIn('http_request_duration_seconds_bucket{route="a\\"b",le="0.005"} 1', text)
+        self.assertIn('http_request_duration_seconds_bucket{route="a\\"b",le="0.05"} 2', text)
+        self.assertIn('http_request_duration_seconds_bucket{route="a\\"b",le="+Inf"} 3', text)
+        self.assertIn('http_request_duration_seconds_count{route="a\\"b"} 3', text)
+
+
+class MetricsEndpointTests(TestCase):
+    def setUp(self):
+        registry.clear()
+
+    @override_settings(METRICS_TOKEN="secret")
+    def test_records_route_and_queries(self):
+        self.client.get("/api/products/public/products/")
+        response = self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer secret")
+        self.assertEqual(response.status_code, 200)
+        body = response.content.decode()
+        self.assertIn(
+            'http_requests_total{route="public-product-list",method="GET",status="200"} 1', body
+        )
+        self.assertIn('db_queries_per_request_count{route="public-product-list",method="GET"} 1', body)
+
+    @override_settings(METRICS_TOKEN="secret")
+    def test_requires_token(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 401)
+        self.assertEqual(self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer nope").status_code, 401)
+
+    @override_settings(METRICS_TOKEN="")
+    def test_disabled_without_token(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 404)
+
+    def test_sums_other_workers(self):
+        labels = (("route", "chat"), ("method", "POST"), ("status", "200"))
+        registry.inc("http_requests_total", labels, 2)
+        with tempfile.TemporaryDirectory() as directory, override_settings(METRICS_DIR=directory):
+            flush(force=True)
+            with open(os.path.join(directory, f"{os.getpid()}.json")) as own:
+                data = json.load(own)
+            # Pretend another worker flushed the same counts
+            with open(os.path.join(directory, "99999999.json"), "w") as other:
+                json.dump(data, other)
+            self.assertEqual(collect()["counters"]["http_requests_total", labels], 4)
+
+    def test_dead_workers_are_archived(self):
+        labels = (("route", "chat"), ("method", "POST"), ("status", "200"))
+        registry.inc("http_requests_total", labels, 2)
+        with tempfile.TemporaryDirectory() as directory, override_settings(METRICS_DIR=directory):
+            dead = os.path.join(directory, "99999999.json")
+            with open(dead, "w") as other:
+                json.dump({"counters": [["http_requests_total", list(map(list, labels)), 3]], "histograms": []}, other)
+
+            flush(force=True)
+            self.assertFalse(os.path.exists(dead))
+            self.assertEqual(set(os.listdir(directory)), {"archived.json", "archived.lock", f"{os.getpid()}.json"})
+            self.assertEqual(collect()["counters"]["http_requests_total", labels], 5)
+            # Reaping again finds nothing new to add
+            flush(force=True)
+            self.assertEqual(collect()["counters"]["http_requests_total", labels], 5)
+
+
+class RecordingExporter:
+    def __init__(self):
+        self.traces = []
+
+    def export(self, traces):
+        self.traces.extend(traces)
+
+
+@override_settings(TRACING_EXPORTER="console", TRACING_SAMPLE_RATE=1.0)
+class TracingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        business = Business.objects.create(name="Acme Corp", email="acme@example.com")
+        cls.user = User.objects.create_user(
+            email="viewer@acme.com", password="password123", role=Role.VIEWER, business=business,
+        )
+
+    def setUp(self):
+        self.recorder = RecordingExporter()
+        tracing.get_exporter().exporter = self.recorder
+
+    def traced_spans(self):
+        tracing.get_exporter().flush()
+        self.assertEqual(len(self.recorder.traces), 1)
+        return {s.name: s for s in self.recorder.traces[0].spans}
+
+    def test_request_spans(self):
+        self.client.cookies["access_token"] = str(RefreshToken.for_user(self.user).access_token)
+        self.client.get("/api/products/?fields=id,name")
+        spans = self.traced_spans()
+
+        root = spans["GET product-list-create"]
+        self.assertEqual(root.attributes["http.response.status_code"], 200)
+        self.assertIsNone(root.parent_id)
+        self.assertEqual(spans["auth.jwt"].parent_id, root.span_id)
+        self.assertEqual(spans["serialize"].attributes["rows"], 0)
+        self.assertIn("db.query", spans)
+
+    @override_settings(TRACING_SAMPLE_RATE=0.0)
+    def test_honours_sampled_traceparent(self):
+        tracing.get_exporter().exporter = self.recorder
+        trace_id, parent_id = "4bf92f3577b34da6a3ce929d0e0e4736", "00f067aa0ba902b7"
+        self.client.get("/api/products/public/products/", HTTP_TRACEPARENT=f"00-{trace_id}-{parent_id}-01")
+        root = self.traced_spans()["GET public-product-list"]
+        self.assertEqual(root.trace.trace_id, trace_id)
+        self.assertEqual(root.parent_id, parent_id)
+
+    @override_settings(TRACING_SAMPLE_RATE=0.0)
+    def test_unsampled_requests_record_nothing(self):
+        tracing.get_exporter().exporter = self.recorder
+        self.client.get("/api/products/public/products/")
+        tracing.get_exporter().flush()
+        self.assertEqual(self.recorder.traces, [])
+
+
+class ProfilingTests(TestCase):
+    def test_collapsed_round_trip(self):
+        samples = Counter({"a;b;c": 3, "a;b": 1})
+        self.assertEqual(parse_collapsed(to_collapsed(samples)), samples)
+
+    def test_slow_request_is_profiled_and_summarised(self):
+        with tempfile.TemporaryDirectory() as directory, override_settings(
+            PROFILING_ENABLED=True, PROFILING_SAMPLE_RATE=0.0, PROFILING_SLOW_MS=100,
+            PROFILING_INTERVAL_MS=1, PROFILING_DIR=directory,
+        ), mock.patch("chat.views.ChatView._get_ai_response", side_effect=lambda *a: time.sleep(0.2) or "Hi"):
+            fast = self.client.get("/api/products/public/products/")
+            slow = self.client.post(
+                "/api/chat/", {"message": "Hello"}, content_type="application/json",
+                HTTP_X_REQUEST_ID="req-42",
+            )
+            self.assertNotIn("X-Profile-Id", fast)
+            self.assertEqual(slow["X-Profile-Id"], "req-42")
+            self.assertEqual(os.listdir(directory), ["chat"])
+            files = sorted(os.listdir(os.path.join(directory, "chat")))
+            self.assertTrue(files[0].endswith("-req-42.collapsed"))
+            self.assertTrue(files[1].endswith("-req-42.speedscope.json"))
+
+            out = io.StringIO()
+            call_command("profile_summary", dir=directory, stdout=out)
+            self.assertIn("chat — 1 profile(s)", out.getvalue())
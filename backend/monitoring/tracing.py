@@ -0,0 +1,335 @@
+"""
+Lightweight request tracing.
+
+    with span("serialize", {"serializer": "ProductSerializer"}) as s:
+        data = serializer.data
+        s.set("rows", len(data))
+
+TracingMiddleware opens a root span per request and decides once whether the
+request is sampled (TRACING_SAMPLE_RATE, or the sampled flag of an incoming
+W3C `traceparent` header).  Inside an unsampled request — or outside any
+request — `span()` costs one ContextVar lookup and records nothing.
+
+Finished traces are handed to a background thread and exported as
+OTLP/HTTP JSON (TRACING_EXPORTER):
+
+    "otlp"     POST to TRACING_OTLP_ENDPOINT/v1/traces (any OpenTelemetry collector)
+    "file"     one OTLP JSON request per line in TRACING_FILE — the format the
+               collector's otlpjsonfile receiver replays
+    "console"  an indented span tree on stderr
+"""
+
+import atexit
+import functools
+import json
+import queue
+import random
+import re
+import sys
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+
+# OTLP span kinds
+INTERNAL, SERVER, CLIENT = 1, 2, 3
+
+_current = ContextVar("current_span", default=None)
+
+
+# ─── Spans ───────────────────────────────────────────────────────────────────
+
+class Span:
+    __slots__ = ("trace", "name", "kind", "span_id", "parent_id", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(self, trace, name, parent_id, attributes, kind=INTERNAL):
+        self.trace      = trace
+        self.name       = name
+        self.kind       = kind
+        self.span_id    = f"{random.getrandbits(64):016x}"
+        self.parent_id  = parent_id
+        self.attributes = dict(attributes or {})
+        self.error      = None
+        self.end_ns     = None
+        self.start_ns   = time.time_ns()
+
+    def set(self, key, value):
+        self.attributes[key] = value
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+    def to_otlp(self) -> dict:
+        data = {
+            "traceId":           self.trace.trace_id,
+            "spanId":            self.span_id,
+            "name":              self.name,
+            "kind":              self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano":   str(self.end_ns),
+            "attributes":        [_otlp_attribute(k, v) for k, v in self.attributes.items()],
+            "status":            {"code": 2, "message": self.error} if self.error else {"code": 0},
+        }
+        if self.parent_id:
+            data["parentSpanId"] = self.parent_id
+        return data
+
+
+class _NoopSpan:
+    """Stands in for a span when the request isn't sampled."""
+
+    def set(self, key, value):
+        pass
+
+
+NOOP = _NoopSpan()
+
+
+class Trace:
+    __slots__ = ("trace_id", "spans")
+
+    def __init__(self, trace_id):
+        self.trace_id = trace_id
+        self.spans    = []   # finished spans, root last
+
+
+def _otlp_attribute(key, value) -> dict:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}   # int64 is a string in proto3 JSON
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+@contextmanager
+def span(name, attributes=None, kind=INTERNAL):
+    """Child span of the current one; a no-op unless inside a sampled trace."""
+    parent = _current.get()
+    if parent is None:
+        yield NOOP
+        return
+
+    current = Span(parent.trace, name, parent.span_id, attributes, kind)
+    token = _current.set(current)
+    try:
+        yield current
+    except Exception as exc:
+        current.error = f"{type(exc).__name__}: {exc}"
+        raise
+    finally:
+        current.end_ns = time.time_ns()
+        _current.reset(token)
+        parent.trace.spans.append(current)
+
+
+def traced(name, attributes=None, kind=INTERNAL):
+    """Decorator form of `span()`."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current.get() is None:
+                return func(*args, **kwargs)
+            with span(name, attributes, kind):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# ─── Root spans and sampling ─────────────────────────────────────────────────
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+
+def parse_traceparent(header):
+    """"00-<trace id>-<parent id>-<flags>" → (trace_id, parent_id, sampled), or None."""
+    match = _TRACEPARENT.match((header or "").strip().lower())
+    if not match or match.group(1) == "0" * 32 or match.group(2) == "0" * 16:
+        return None
+    return match.group(1), match.group(2), bool(int(match.group(3), 16) & 1)
+
+
+@contextmanager
+def start_trace(name, traceparent=None, attributes=None):
+    """
+    Root span for one unit of work (a request).  Yields NOOP when tracing is
+    off or the trace isn't sampled; the finished trace is queued for export.
+    """
+    exporter = get_exporter()
+    if exporter is None or _current.get() is not None:
+        yield NOOP
+        return
+
+    incoming = parse_traceparent(traceparent)
+    if incoming:
+        trace_id, parent_id, sampled = incoming
+    else:
+        trace_id, parent_id = f"{random.getrandbits(128):032x}", None
+        sampled = random.random() < settings.TRACING_SAMPLE_RATE
+    if not sampled:
+        yield NOOP
+        return
+
+    trace = Trace(trace_id)
+    root  = Span(trace, name, parent_id, attributes, SERVER)
+    token = _current.set(root)
+    try:
+        yield root
+    except Exception as exc:
+        root.error = f"{type(exc).__name__}: {exc}"
+        raise
+    finally:
+        root.end_ns = time.time_ns()
+        _current.reset(token)
+        trace.spans.append(root)
+        exporter.submit(trace)
+
+
+# ─── Exporters ───────────────────────────────────────────────────────────────
+
+def _otlp_request(traces) -> dict:
+    return {"resourceSpans": [{
+        "resource": {"attributes": [_otlp_attribute("service.name", settings.TRACING_SERVICE_NAME)]},
+        "scopeSpans": [{
+            "scope": {"name": "monitoring.tracing"},
+            "spans": [s.to_otlp() for trace in traces for s in trace.spans],
+        }],
+    }]}
+
+
+class OTLPExporter:
+    def __init__(self, endpoint, timeout=5):
+        self.url     = endpoint.rstrip("/") + "/v1/traces"
+        self.timeout = timeout
+
+    def export(self, traces):
+        body = json.dumps(_otlp_request(traces)).encode()
+        request = urllib.request.Request(self.url, body, {"Content-Type": "application/json"})
+        with urllib.request.urlopen(request, timeout=self.timeout):
+            pass
+
+
+class FileExporter:
+    def __init__(self, path):
+        self.path = path
+
+    def export(self, traces):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(_otlp_request(traces)) + "\n")
+
+
+class ConsoleExporter:
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stderr
+
+    def export(self, traces):
+        for trace in traces:
+            children = {}
+            for s in trace.spans:
+                children.setdefault(s.parent_id, []).append(s)
+            root = trace.spans[-1]
+            lines = [f"trace {trace.trace_id}"]
+            self._walk(root, children, 1, lines)
+            self.stream.write("\n".join(lines) + "\n")
+
+    def _walk(self, current, children, depth, lines):
+        attributes = " ".join(f"{k}={v}" for k, v in current.attributes.items())
+        error = f" ERROR {current.error}" if current.error else ""
+        lines.append(f"{'  ' * depth}{current.name} {current.duration_ms:.2f}ms {attributes}{error}".rstrip())
+        for child in sorted(children.get(current.span_id, []), key=lambda s: s.start_ns):
+            self._walk(child, children, depth + 1, lines)
+
+
+class BackgroundExporter:
+    """
+    Exports finished traces off the request thread in small batches.  When
+    the queue is full (collector down or slow) new traces are dropped rather
+    than slowing requests down.
+    """
+
+    def __init__(self, exporter, max_queue=2048, batch_size=64):
+        self.exporter   = exporter
+        self.batch_size = batch_size
+        self.queue      = queue.Queue(max_queue)
+        self.dropped    = 0
+        self._thread    = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+        self._thread.start()
+        atexit.register(self.shutdown)
+
+    def submit(self, trace):
+        try:
+            self.queue.put_nowait(trace)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in batch
+            traces = [t for t in batch if t is not None]
+            if traces:
+                try:
+                    self.exporter.export(traces)
+                except Exception as exc:  # never let a broken exporter kill the thread
+                    sys.stderr.write(f"trace export failed: {exc}\n")
+            for _ in batch:
+                self.queue.task_done()
+            if stop:
+                return
+
+    def flush(self):
+        self.queue.join()
+
+    def shutdown(self, timeout=2):
+        if self._thread.is_alive():
+            try:
+                self.queue.put(None, timeout=timeout)
+            except queue.Full:
+                return
+            self._thread.join(timeout)
+
+
+EXPORTERS = {
+    "otlp":    lambda: OTLPExporter(settings.TRACING_OTLP_ENDPOINT),
+    "file":    lambda: FileExporter(settings.TRACING_FILE),
+    "console": lambda: ConsoleExporter(),
+}
+
+_exporter = None
+_exporter_lock = threading.Lock()
+
+
+def get_exporter():
+    """The configured BackgroundExporter, or None while tracing is off."""
+    global _exporter
+    name = settings.TRACING_EXPORTER
+    if not name:
+        return None
+    if _exporter is None:
+        with _exporter_lock:
+            if _exporter is None:
+                if name not in EXPORTERS:
+                    raise ValueError(f"Unknown TRACING_EXPORTER {name!r} (expected one of {', '.join(EXPORTERS)})")
+                _exporter = BackgroundExporter(EXPORTERS[name]())
+    return _exporter
+
+
+@receiver(setting_changed)
+def _reset_exporter(setting, **kwargs):
+    global _exporter
+    if setting.startswith("TRACING_") and _exporter is not None:
+        _exporter.shutdown()
+        _exporter = None
@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.http import require_GET
+
+from .metrics import collect, render
+
+
+@require_GET
+def metrics_view(request):
+    """
+    GET /metrics → Prometheus text format, summed across workers.
+
+    Requires `Authorization: Bearer <METRICS_TOKEN>`; the endpoint doesn't
+    exist at all while METRICS_TOKEN is unset.
+    """
+    token = settings.METRICS_TOKEN
+    if not token:
+        raise Http404
+    if not constant_time_compare(request.headers.get("Authorization", ""), f"Bearer {token}"):
+        response = HttpResponse("Unauthorized\n", status=401, content_type="text/plain")
+        response["WWW-Authenticate"] = 'Bearer realm="metrics"'
+        return response
+    return HttpResponse(render(collect()), content_type="text/plain; version=0.0.4; charset=utf-8")
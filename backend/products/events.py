@@ -0,0 +1,32 @@
+"""
+Product events pushed to the dashboards of the product's business
+(see products/views/event_views.py and core/pubsub.py).
+"""
+
+from django.db import transaction
+from django.utils import timezone
+
+from core.pubsub import get_broker
+
+
+def business_topic(business_id) -> str:
+    return f"business.{business_id}"
+
+
+def publish_product_event(kind, business_id, product_id, actor=None, product=None):
+    """
+    Queue `product.<kind>` for every dashboard of `business_id`.  Sent only
+    once the surrounding transaction commits, so listeners never see a
+    change that was rolled back.  `product` is the already serialized
+    ProductSerializer data (omitted for deletions).
+    """
+    event = {
+        "type":  f"product.{kind}",
+        "id":    product_id,
+        "actor": actor.pk if actor is not None else None,
+        "at":    timezone.now().isoformat(),
+    }
+    if product is not None:
+        event["product"] = product
+    topic = business_topic(business_id)
+    transaction.on_commit(lambda: get_broker().publish(topic, event))
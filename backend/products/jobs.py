@@ -0,0 +1,9 @@
+from jobs.runner import job
+from .snapshot import build_snapshot
+
+
+@job("products.build_catalog_snapshot", max_attempts=2)
+def build_catalog_snapshot(job):
+    job.report(0.0, "Rendering the approved catalog")
+    manifest = build_snapshot()
+    return {"version": manifest["version"], "count": manifest["count"]}
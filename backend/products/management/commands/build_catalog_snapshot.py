@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from products.snapshot import build_snapshot
+
+
+class Command(BaseCommand):
+    help = (
+        "Render the approved public catalog into CATALOG_SNAPSHOT_DIR so the public "
+        "list/detail views can serve it from memory-mapped files."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dir", help="Snapshot directory (default: CATALOG_SNAPSHOT_DIR)")
+
+    def handle(self, *args, **options):
+        manifest = build_snapshot(options["dir"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Snapshot {manifest['version']}: {manifest['count']} product(s) → {manifest['data']}"
+        ))
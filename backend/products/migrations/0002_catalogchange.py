@@ -0,0 +1,37 @@
+# Generated by Django 6.0.2 on 2026-02-17 16:05
+
+from django.db import migrations, models
+
+
+def backfill(apps, schema_editor):
+    """Publish the already-approved catalog so the feed starts complete."""
+    Product = apps.get_model("products", "Product")
+    CatalogChange = apps.get_model("products", "CatalogChange")
+    ids = Product.objects.filter(status="approved").order_by("pk").values_list("pk", flat=True)
+    batch = []
+    for pk in ids.iterator(chunk_size=2000):
+        batch.append(CatalogChange(product_id=pk, op="upsert"))
+        if len(batch) == 2000:
+            CatalogChange.objects.bulk_create(batch)
+            batch = []
+    CatalogChange.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('product_id', models.BigIntegerField(db_index=True)),
+                ('op', models.CharField(choices=[('upsert', 'Upsert'), ('delete', 'Delete')], max_length=10)),
+                ('changed_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 6.0.2 on 2026-02-17 18:20
+
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def drop_duplicates(apps, schema_editor):
+    """Keep only the newest row of products that concurrent writers logged twice."""
+    CatalogChange = apps.get_model("products", "CatalogChange")
+    duplicated = (
+        CatalogChange.objects.values("product_id")
+        .annotate(newest=Max("id"), rows=models.Count("id"))
+        .filter(rows__gt=1)
+    )
+    for row in duplicated.iterator():
+        CatalogChange.objects.filter(product_id=row["product_id"], id__lt=row["newest"]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0003_product_catalog_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_duplicates, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='catalogchange',
+            name='product_id',
+            field=models.BigIntegerField(unique=True),
+        ),
+        migrations.AddIndex(
+            model_name='catalogchange',
+            index=models.Index(fields=['changed_at', 'id'], name='catalog_change_feed_idx'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 6.0.2 on 2026-02-17 18:30
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+# PostgreSQL's LIKE 'prefix%' can only use a btree index built with
+# text_pattern_ops (under a non-C collation), so chat/intents.py's prefix
+# matches get their own index there.
+POSTGRES = "CREATE INDEX product_name_prefix_idx ON products_product (lower(name) text_pattern_ops)"
+POSTGRES_REVERSE = "DROP INDEX IF EXISTS product_name_prefix_idx"
+
+
+def create_prefix_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(POSTGRES)
+
+
+def drop_prefix_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(POSTGRES_REVERSE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0004_catalogchange_upsert'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(django.db.models.functions.text.Lower('name'), name='product_name_lower_idx'),
+        ),
+        migrations.RunPython(create_prefix_index, drop_prefix_index),
+    ]
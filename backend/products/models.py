@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Lower
 from django.conf import settings
 
 
@@ -8,6 +9,12 @@ class ProductStatus(models.TextChoices):
     APPROVED         = "approved",         "Approved"
 
 
+class ProductQuerySet(models.QuerySet):
+    def public(self):
+        """The public catalog: approved products of businesses that aren't being deleted."""
+        return self.filter(status=ProductStatus.APPROVED, business__deletion_requested_at__isnull=True)
+
+
 class Product(models.Model):
     name        = models.CharField(max_length=255)
     description = models.TextField(blank=True)
@@ -38,8 +45,47 @@ class Product(models.Model):
     created_at  = models.DateTimeField(auto_now_add=True)
     updated_at  = models.DateTimeField(auto_now=True)
 
+    objects = ProductQuerySet.as_manager()
+
     class Meta:
         ordering = ["-created_at"]
+        indexes  = [
+            # Public catalog: approved products by price (range filters, price
+            # sort and facet bands) and by date (newest first)
+            models.Index(fields=["status", "price"], name="product_status_price_idx"),
+            models.Index(fields=["status", "created_at"], name="product_status_created_idx"),
+            # Chat name lookups (chat/intents.py); PostgreSQL also gets a
+            # text_pattern_ops twin for prefix matches (migration 0005)
+            models.Index(Lower("name"), name="product_name_lower_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.name} [{self.status}]"
+
+class ChangeOp(models.TextChoices):
+    UPSERT = "upsert", "Upsert"
+    DELETE = "delete", "Delete"
+
+
+class CatalogChange(models.Model):
+    """
+    Change log behind the public catalog feed (/api/products/public/changes/).
+
+    Compacted: a product has at most one row, holding its latest operation,
+    so the log stays as large as the catalog (plus tombstones) and a consumer
+    only ever sees the newest state of whatever changed since its cursor.
+    A change upserts the row, moving it to the end of the feed's
+    (changed_at, id) order.  Written by the signal handlers in
+    products/signals.py.
+    """
+    product_id = models.BigIntegerField(unique=True)   # no FK: tombstones outlive the product
+    op         = models.CharField(max_length=10, choices=ChangeOp.choices)
+    changed_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["changed_at", "id"], name="catalog_change_feed_idx"),
+        ]
 
     def __str__(self):
-        return f"{self.name} [{self.status}]"
\ No newline at end of file
+        return f"#{self.pk} {self.op} product {self.product_id}"
@@ -1,12 +1,14 @@
 from rest_framework import serializers
+from core.serializers import DynamicFieldsMixin, TracedListSerializer
 from .models import Product, ProductStatus
 from users.serializers import UserSerializer
 
 
-class ProductSerializer(serializers.ModelSerializer):
+class ProductSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Full product serializer — used for internal users.
     Includes who created and approved the product.
+    Supports ?fields= / ?expand= (see core.serializers.DynamicFieldsMixin).
     """
     created_by  = UserSerializer(read_only=True)
     approved_by = UserSerializer(read_only=True)
@@ -20,6 +22,7 @@ class ProductSerializer(serializers.ModelSerializer):
             "created_at", "updated_at",
         ]
         read_only_fields = ["id", "status", "created_by", "approved_by", "created_at", "updated_at"]
+        list_serializer_class = TracedListSerializer
 
 
 class ProductWriteSerializer(serializers.ModelSerializer):
@@ -38,13 +41,14 @@ class ProductWriteSerializer(serializers.ModelSerializer):
         return value
 
 
-class PublicProductSerializer(serializers.ModelSerializer):
+class PublicProductSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Lean serializer for public (unauthenticated) product listing.
-    Only exposes safe, approved-product fields.
+    Only exposes safe, approved-product fields. Supports ?fields=.
     """
     business_name = serializers.CharField(source="business.name", read_only=True)
 
     class Meta:
         model  = Product
-        fields = ["id", "name", "description", "price", "business_name", "created_at"]
\ No newline at end of file
+        fields = ["id", "name", "description", "price", "business_name", "created_at"]
+        list_serializer_class = TracedListSerializer
\ No newline at end of file
@@ -0,0 +1,77 @@
+"""
+Keeps the CatalogChange log in step with the public (approved) catalog.
+
+    approved product saved              → upsert
+    product leaves "approved" / deleted → delete (tombstone), if consumers
+                                          could have seen it
+    business renamed                    → upsert its approved products
+                                          (their business_name changed)
+
+Every recorded change also schedules a catalog snapshot rebuild when
+CATALOG_SNAPSHOT_ENABLED is on (see products/snapshot.py).
+
+Bulk queryset operations (update(), bulk_create()) bypass signals — call
+`record_changes()` yourself after those.
+"""
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from users.models import Business
+from .models import CatalogChange, ChangeOp, Product, ProductStatus
+from .snapshot import schedule_rebuild
+
+
+CHUNK_SIZE = 500   # keeps IN (...) lists well inside SQLite's variable limit
+
+
+def record_changes(product_ids, op):
+    """Upsert the log row of each of these products to `op`, changed now."""
+    product_ids = list(dict.fromkeys(product_ids))   # an upsert may touch each row once
+    with transaction.atomic():
+        for start in range(0, len(product_ids), CHUNK_SIZE):
+            CatalogChange.objects.bulk_create(
+                [CatalogChange(product_id=pk, op=op) for pk in product_ids[start:start + CHUNK_SIZE]],
+                update_conflicts=True, unique_fields=["product_id"], update_fields=["op", "changed_at"],
+            )
+    if product_ids and settings.CATALOG_SNAPSHOT_ENABLED:
+        transaction.on_commit(schedule_rebuild)
+
+
+def _tombstone(product_id):
+    # Only products the feed has published need a tombstone
+    latest = CatalogChange.objects.filter(product_id=product_id).values_list("op", flat=True).first()
+    if latest == ChangeOp.UPSERT:
+        record_changes([product_id], ChangeOp.DELETE)
+
+
+@receiver(post_save, sender=Product)
+def product_saved(sender, instance, raw=False, **kwargs):
+    if raw:  # loaddata
+        return
+    if instance.status == ProductStatus.APPROVED:
+        record_changes([instance.pk], ChangeOp.UPSERT)
+    else:
+        _tombstone(instance.pk)
+
+
+@receiver(post_delete, sender=Product)
+def product_deleted(sender, instance, **kwargs):
+    _tombstone(instance.pk)
+
+
+@receiver(pre_save, sender=Business)
+def business_renaming(sender, instance, raw=False, **kwargs):
+    instance._renamed = bool(
+        not raw and instance.pk
+        and Business.objects.filter(pk=instance.pk).exclude(name=instance.name).exists()
+    )
+
+
+@receiver(post_save, sender=Business)
+def business_saved(sender, instance, **kwargs):
+    if getattr(instance, "_renamed", False):
+        approved = Product.objects.filter(business=instance, status=ProductStatus.APPROVED)
+        record_changes(approved.values_list("pk", flat=True).iterator(chunk_size=2000), ChangeOp.UPSERT)
@@ -0,0 +1,187 @@
+"""
+Pre-rendered public catalog, served without touching the ORM.
+
+A build renders every approved product with PublicProductSerializer and
+writes one file holding the complete list response:
+
+    [{...product...},{...product...},...]      catalog-<version>.json
+
+Each product document is a contiguous byte range of that file, so the same
+file also answers detail requests.  manifest.json names the current file and
+maps product id → [offset, length].  Readers mmap the file and re-open it
+when the manifest changes; a build writes a new file and atomically replaces
+the manifest, so a reader never sees a half-written snapshot.
+
+Builds run `python manage.py build_catalog_snapshot`, or automatically as a
+background job (queued CATALOG_SNAPSHOT_DEBOUNCE_SECONDS after the first of a
+burst of catalog changes) when CATALOG_SNAPSHOT_ENABLED is on.  The manifest
+records when the catalog was read (`as_of`); until the next build, the views
+fall back to the database for anything the CatalogChange log shows changed
+since then.
+"""
+
+import json
+import mmap
+import os
+import tempfile
+import threading
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import timezone
+
+from core.fastpath import serialize_list
+from core.renderers import ORJSONRenderer
+from jobs.models import Job, JobStatus
+from jobs.runner import enqueue
+from .models import CatalogChange, Product
+from .serializers import PublicProductSerializer
+
+
+MANIFEST = "manifest.json"
+KEEP_FILES = 2   # the current data file plus the one readers may still have mapped
+REBUILD_JOB = "products.build_catalog_snapshot"   # see products/jobs.py
+CHUNK_SIZE = 64 * 1024   # bytes per chunk when streaming the list document
+
+
+# ─── Build ───────────────────────────────────────────────────────────────────
+
+def _write_atomic(path, data):
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def build_snapshot(directory=None) -> dict:
+    """Render the approved catalog into `directory` (default CATALOG_SNAPSHOT_DIR); returns the manifest."""
+    directory = Path(directory or settings.CATALOG_SNAPSHOT_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    # Changes stamped a little before the read may commit after it (see
+    # CATALOG_FEED_SETTLE_SECONDS): count them as newer than the snapshot
+    as_of = timezone.now() - timedelta(seconds=settings.CATALOG_FEED_SETTLE_SECONDS)
+
+    # Same order as PublicProductListView's default (?sort=newest)
+    products = Product.objects.public().order_by("-created_at", "-id")
+    render = ORJSONRenderer().render
+
+    parts, index, offset = [b"["], {}, 1
+    for i, doc in enumerate(serialize_list(PublicProductSerializer, products)):
+        if i:
+            parts.append(b",")
+            offset += 1
+        body = render(doc)
+        index[doc["id"]] = [offset, len(body)]
+        parts.append(body)
+        offset += len(body)
+    parts.append(b"]")
+
+    version  = f"{time.time_ns()}"
+    filename = f"catalog-{version}.json"
+    _write_atomic(directory / filename, b"".join(parts))
+    manifest = {
+        "version": version, "as_of": as_of.isoformat(), "data": filename, "count": len(index), "index": index,
+    }
+    _write_atomic(directory / MANIFEST, json.dumps(manifest, separators=(",", ":")).encode())
+
+    stale = sorted(directory.glob("catalog-*.json"), key=lambda p: p.name, reverse=True)[KEEP_FILES:]
+    for path in stale:
+        path.unlink(missing_ok=True)
+    return manifest
+
+
+# ─── Debounced rebuilds ──────────────────────────────────────────────────────
+
+def schedule_rebuild():
+    """
+    Queue a rebuild once the current burst of changes has had time to finish.
+    Changes made while a build is running queue the next one.
+    """
+    if Job.objects.filter(name=REBUILD_JOB, status=JobStatus.QUEUED).exists():
+        return
+    enqueue(REBUILD_JOB, run_at=timezone.now() + timedelta(seconds=settings.CATALOG_SNAPSHOT_DEBOUNCE_SECONDS))
+
+
+# ─── Reader ──────────────────────────────────────────────────────────────────
+
+class Snapshot:
+    __slots__ = ("version", "as_of", "data", "index")
+
+    def __init__(self, version, as_of, data, index):
+        self.version = version
+        self.as_of   = as_of   # the catalog as it was then
+        self.data    = data    # mmap of the data file
+        self.index   = index   # product id → (offset, length)
+
+    def changed_since(self, pk=None) -> bool:
+        """Whether the catalog — or product `pk` — has changed since this snapshot was rendered."""
+        changes = CatalogChange.objects.filter(changed_at__gt=self.as_of)
+        if pk is not None:
+            changes = changes.filter(product_id=pk)
+        return changes.exists()
+
+    @property
+    def size(self) -> int:
+        return len(self.data)
+
+    def list_chunks(self):
+        """The list document in CHUNK_SIZE slices of the mapping, without copying it whole."""
+        view = memoryview(self.data)
+        for start in range(0, len(view), CHUNK_SIZE):
+            yield view[start:start + CHUNK_SIZE]
+
+    def detail_document(self, pk):
+        entry = self.index.get(pk)
+        if entry is None:
+            return None
+        offset, length = entry
+        return self.data[offset:offset + length]
+
+
+class SnapshotReader:
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self._stamp    = None
+        self._current  = None
+        self._lock     = threading.Lock()
+
+    def current(self):
+        """The latest snapshot, or None if none has been built yet (one is then scheduled)."""
+        manifest = self.directory / MANIFEST
+        try:
+            stat = manifest.stat()
+        except FileNotFoundError:
+            schedule_rebuild()
+            return None
+        stamp = (stat.st_ino, stat.st_mtime_ns)
+        if stamp != self._stamp:
+            with self._lock:
+                if stamp != self._stamp:
+                    try:
+                        self._current = self._open(manifest)
+                        self._stamp   = stamp
+                    except FileNotFoundError:   # superseded mid-read; next request retries
+                        pass
+        return self._current
+
+    def _open(self, manifest_path):
+        manifest = json.loads(manifest_path.read_bytes())
+        with open(self.directory / manifest["data"], "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        # The previous mapping is released once no request is using it any more
+        index = {int(pk): tuple(entry) for pk, entry in manifest["index"].items()}
+        # Written before manifests recorded as_of: anything logged may be missing
+        as_of = datetime.fromisoformat(manifest["as_of"]) if "as_of" in manifest else datetime.min.replace(tzinfo=UTC)
+        return Snapshot(manifest["version"], as_of, data, index)
+
+
+_reader = None
+
+
+def get_reader() -> SnapshotReader:
+    global _reader
+    if _reader is None or _reader.directory != Path(settings.CATALOG_SNAPSHOT_DIR):
+        _reader = SnapshotReader(settings.CATALOG_SNAPSHOT_DIR)
+    return _reader
@@ -1,3 +1,521 @@
-from django.test import TestCase
+import base64
+import datetime
+import io
+import json
+import os
+import tempfile
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.core.management import call_command
+from django.db import IntegrityError, transaction
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.fastpath import ValuesSerializer, serialize_list
+from core.parsers import ORJSONParser
+from core.pubsub import RESYNC, get_broker
+from core.renderers import ORJSONRenderer
+from jobs.models import Job, JobStatus
+from users.models import Business, Role, User
+from users.serializers import UserSerializer
+from .events import business_topic
+from .models import CatalogChange, ChangeOp, Product, ProductStatus
+from .serializers import ProductSerializer, PublicProductSerializer
+from .signals import record_changes
+from .snapshot import build_snapshot, schedule_rebuild
+
+
+def _render(data) -> bytes:
+    return JSONRenderer().render(data)
+
+
+class FastPathEquivalenceTests(TestCase):
+    """The values_list() fast path must emit byte-identical JSON to the serializers."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.business = Business.objects.create(name="Acme Corp", email="acme@example.com")
+        cls.other    = Business.objects.create(name="Üñíçødé Ltd", email="other@example.com")
+        cls.editor   = User.objects.create_user(
+            email="editor@acme.com", password="password123",
+            first_name="Carol", last_name="Editor", role=Role.EDITOR, business=cls.business,
+        )
+        cls.approver = User.objects.create_user(
+            email="approver@acme.com", password="password123",
+            first_name="Bob", last_name="Approver", role=Role.APPROVER, business=cls.business,
+        )
+        cls.orphan = User.objects.create_user(
+            email="orphan@example.com", password="password123",
+            first_name="No", last_name="Business",
+        )
+
+        prices = ["0.01", "0.10", "9.99", "29.9", "149", "12345678.90"]
+        for i, price in enumerate(prices):
+            Product.objects.create(
+                name=f"Product {i}",
+                description="" if i % 2 else f"Description “{i}”\nwith newline",
+                price=Decimal(price),
+                status=ProductStatus.APPROVED if i % 3 else ProductStatus.DRAFT,
+                business=cls.business if i % 2 else cls.other,
+                created_by=cls.orphan if i == 5 else (cls.editor if i % 2 else None),
+                approved_by=cls.approver if i % 3 else None,
+            )
+
+    def assertEquivalent(self, serializer_class, queryset, fields=None, expand=None):
+        expected = serializer_class(
+            serializer_class.project(queryset, fields=fields, expand=expand),
+            many=True, fields=fields, expand=expand,
+        ).data
+        fast = ValuesSerializer(serializer_class(fields=fields, expand=expand)).serialize(queryset)
+        self.assertEqual(_render(fast), _render(expected))
+
+    def test_product_serializer_full(self):
+        self.assertEquivalent(ProductSerializer, Product.objects.all())
+
+    def test_public_product_serializer_full(self):
+        self.assertEquivalent(PublicProductSerializer, Product.objects.filter(status=ProductStatus.APPROVED))
+
+    def test_user_serializer_with_null_business(self):
+        self.assertEquivalent(UserSerializer, User.objects.order_by("date_joined"))
+
+    def test_sparse_fieldsets(self):
+        specs = [
+            ("id,name,price", None),
+            ("id,status,created_at,updated_at", None),
+            ("id,created_by.email,created_by.business.name", None),
+            ("name", "approved_by"),
+        ]
+        for fields, expand in specs:
+            with self.subTest(fields=fields, expand=expand):
+                self.assertEquivalent(ProductSerializer, Product.objects.all(), fields, expand)
+
+    def test_empty_queryset(self):
+        self.assertEquivalent(ProductSerializer, Product.objects.none())
+
+    def test_fast_path_is_one_query(self):
+        with self.assertNumQueries(1):
+            serialize_list(ProductSerializer, Product.objects.all())
+
+    def test_list_views_match_with_and_without_fast_path(self):
+        client = APIClient()
+        client.force_authenticate(self.editor)
+        urls = [
+            "/api/products/",
+            "/api/products/?fields=id,name,price",
+            "/api/products/public/products/",
+            "/api/products/public/products/?min_price=1&fields=name,price",
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                with override_settings(FAST_LIST_SERIALIZATION=False):
+                    slow = client.get(url)
+                with override_settings(FAST_LIST_SERIALIZATION=True):
+                    fast = client.get(url)
+                self.assertEqual(fast.status_code, 200)
+                self.assertEqual(fast.content, slow.content)
+
+
+class SparseFieldsetTests(TestCase):
+    """?fields= / ?expand= trim the output, and project() trims the query to match."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.business = Business.objects.create(name="Acme Corp", email="acme@example.com")
+        cls.editor   = User.objects.create_user(
+            email="editor@acme.com", password="password123", role=Role.EDITOR, business=cls.business,
+        )
+        Product.objects.create(name="Pen", price=Decimal("1.50"), business=cls.business, created_by=cls.editor)
+
+    def test_pruning(self):
+        serializer = ProductSerializer(fields="id,name,created_by.email")
+        self.assertEqual(list(serializer.fields), ["id", "name", "created_by"])
+        self.assertEqual(list(serializer.fields["created_by"].fields), ["email"])
+        self.assertEqual(list(ProductSerializer(fields=None).fields), ProductSerializer.Meta.fields)
+
+    def test_nested_expand(self):
+        serializer = ProductSerializer(fields="id", expand="created_by")
+        self.assertEqual(list(serializer.fields), ["id", "created_by"])
+        self.assertEqual(list(serializer.fields["created_by"].fields), UserSerializer.Meta.fields)
+        # ?fields= wins over ?expand= for a relation named in both
+        serializer = ProductSerializer(fields="created_by.email", expand="created_by")
+        self.assertEqual(list(serializer.fields["created_by"].fields), ["email"])
+
+    def test_project_only_and_select_related(self):
+        queryset = ProductSerializer.project(Product.objects.all(), fields="name,price")
+        self.assertEqual(queryset.query.deferred_loading, ({"id", "name", "price"}, False))
+        self.assertFalse(queryset.query.select_related)
+
+        queryset = ProductSerializer.project(Product.objects.all(), fields="id,business_name,created_by.email")
+        self.assertEqual(
+            queryset.query.deferred_loading,
+            ({"id", "business", "business__name", "created_by", "created_by__id", "created_by__email"}, False),
+        )
+        self.assertEqual(queryset.query.select_related, {"business": {}, "created_by": {}})
+
+        queryset = ProductSerializer.project(Product.objects.all(), fields="id", expand="created_by")
+        self.assertEqual(queryset.query.select_related, {"created_by": {"business": {}}})
+        with self.assertNumQueries(1):
+            rows = ProductSerializer(queryset, many=True, fields="id", expand="created_by").data
+        self.assertEqual(rows[0]["created_by"]["business"]["name"], "Acme Corp")
+
+    def test_invalid_names(self):
+        invalid = [
+            ({"fields": "bogus"},                  "fields", "Unknown field 'bogus'. Allowed: id, name,"),
+            ({"fields": "id,created_by.bogus"},    "fields", "Unknown field 'created_by.bogus'. Allowed: id, email,"),
+            ({"fields": "name.length"},            "fields", "Field 'name' has no nested fields."),
+            ({"fields": "id", "expand": "name"},   "expand", "Unknown field 'name'. Allowed: created_by, approved_by."),
+        ]
+        for options, param, message in invalid:
+            with self.subTest(**options):
+                with self.assertRaises(ValidationError) as raised:
+                    ProductSerializer(**options)
+                self.assertTrue(str(raised.exception.detail[param][0]).startswith(message))
+
+        client = APIClient()
+        client.force_authenticate(self.editor)
+        response = client.get("/api/products/?fields=id,bogus")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("bogus", response.json()["fields"][0])
+        response = client.get("/api/products/public/products/?fields=bogus")
+        self.assertEqual(response.status_code, 400)
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    """ORJSONRenderer must produce the same bytes as DRF's JSONRenderer."""
+
+    payload = {
+        "id": 1,
+        "name": "Widget “Pro”\u2028",
+        "price": Decimal("29.99"),
+        "raw_price": "29.99",
+        "ratio": 0.1,
+        "created_at": timezone.now(),
+        "naive": datetime.datetime(2026, 1, 2, 3, 4, 5, 678901),
+        "date": datetime.date(2026, 1, 2),
+        "nested": [{"approved_by": None, "flags": (True, False)}],
+        1: "int key",
+    }
+
+    def test_matches_stdlib_renderer(self):
+        self.assertEqual(ORJSONRenderer().render(self.payload), JSONRenderer().render(self.payload))
+
+    def test_indent_falls_back_to_stdlib(self):
+        media_type = "application/json; indent=4"
+        self.assertEqual(
+            ORJSONRenderer().render(self.payload, media_type),
+            JSONRenderer().render(self.payload, media_type),
+        )
+
+    def test_parser_round_trip(self):
+        body = ORJSONRenderer().render({"message": "Hi — under $30?", "n": [1, 2.5, None]})
+        self.assertEqual(
+            ORJSONParser().parse(io.BytesIO(body)),
+            {"message": "Hi — under $30?", "n": [1, 2.5, None]},
+        )
+
+
+@override_settings(CATALOG_FEED_SETTLE_SECONDS=0)
+class ChangeFeedTests(TestCase):
+    url = "/api/products/public/changes/"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.business = Business.objects.create(name="Acme Corp", email="acme@example.com")
+
+    def make(self, name, status=ProductStatus.APPROVED):
+        return Product.objects.create(name=name, price=Decimal("9.99"), status=status, business=self.business)
+
+    def feed(self, cursor=None, **params):
+        if cursor:
+            params["cursor"] = cursor
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_initial_sync_then_incremental(self):
+        kept    = self.make("Kept")
+        removed = self.make("Removed")
+        self.make("Draft", ProductStatus.DRAFT)
+
+        first = self.feed()
+        self.assertEqual([(c["op"], c["id"]) for c in first["changes"]], [("upsert", kept.pk), ("upsert", removed.pk)])
+        self.assertEqual(first["changes"][0]["product"]["name"], "Kept")
+
+        # Nothing new → same cursor, empty page
+        self.assertEqual(self.feed(first["cursor"]), {**first, "changes": []})
+
+        removed_id = removed.pk
+        removed.delete()
+        kept.status = ProductStatus.DRAFT   # un-approval
+        kept.save()
+        added = self.make("Added")
+        second = self.feed(first["cursor"])
+        self.assertEqual(
+            [(c["op"], c["id"]) for c in second["changes"]],
+            [("delete", removed_id), ("delete", kept.pk), ("upsert", added.pk)],
+        )
+
+    def test_log_is_compacted_per_product(self):
+        product = self.make("Product")
+        for price in ("1.00", "2.00", "3.00"):
+            product.price = Decimal(price)
+            product.save()
+        self.assertEqual(CatalogChange.objects.filter(product_id=product.pk).count(), 1)
+        [change] = self.feed()["changes"]
+        self.assertEqual(change["product"]["price"], "3.00")
+
+    def test_changes_upsert_the_products_row(self):
+        product = self.make("Product")
+        cursor  = self.feed()["cursor"]
+        row     = CatalogChange.objects.get(product_id=product.pk)
+        record_changes([product.pk, product.pk], ChangeOp.UPSERT)
+        moved = CatalogChange.objects.get(product_id=product.pk)
+        self.assertEqual(moved.pk, row.pk)
+        self.assertGreater(moved.changed_at, row.changed_at)
+        self.assertEqual([c["id"] for c in self.feed(cursor)["changes"]], [product.pk])
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            CatalogChange.objects.create(product_id=product.pk, op=ChangeOp.DELETE)
+
+    def test_old_cursors_resync(self):
+        product = self.make("Product")
+        old = base64.urlsafe_b64encode(b"c1:12345").decode().rstrip("=")
+        self.assertEqual([c["id"] for c in self.feed(old)["changes"]], [product.pk])
+
+    def test_unpublished_products_leave_no_tombstone(self):
+        self.make("Draft", ProductStatus.DRAFT).delete()
+        self.assertEqual(self.feed()["changes"], [])
+
+    def test_business_rename_republishes_its_products(self):
+        product = self.make("Product")
+        cursor = self.feed()["cursor"]
+        self.business.name = "Acme Holdings"
+        self.business.save()
+        [change] = self.feed(cursor)["changes"]
+        self.assertEqual((change["id"], change["product"]["business_name"]), (product.pk, "Acme Holdings"))
+
+    def test_paging_and_bad_cursor(self):
+        for i in range(5):
+            self.make(f"P{i}")
+        page = self.feed(limit=2)
+        seen = [c["id"] for c in page["changes"]]
+        while page["has_more"]:
+            page = self.feed(page["cursor"], limit=2)
+            seen += [c["id"] for c in page["changes"]]
+        self.assertEqual(len(seen), 5)
+        self.assertEqual(self.client.get(self.url, {"cursor": "nope!"}).status_code, 400)
+
+    @override_settings(CATALOG_FEED_SETTLE_SECONDS=60)
+    def test_recent_changes_are_held_back(self):
+        self.make("Fresh")
+        self.assertEqual(self.feed()["changes"], [])
+
+
+class ProductEventTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.business = Business.objects.create(name="Acme Corp", email="acme@example.com")
+        cls.approver = User.objects.create_user(
+            email="approver@acme.com", password="password123", role=Role.APPROVER, business=cls.business,
+        )
+        cls.product = Product.objects.create(
+            name="Widget", price=Decimal("9.99"), status=ProductStatus.PENDING_APPROVAL, business=cls.business,
+        )
+
+    def setUp(self):
+        token = str(RefreshToken.for_user(self.approver).access_token)
+        self.client.cookies["access_token"] = self.async_client.cookies["access_token"] = token
+
+    def test_events_are_published_on_commit(self):
+        with get_broker().subscribe(business_topic(self.business.pk)) as subscription:
+            with self.captureOnCommitCallbacks() as callbacks:
+                self.client.post(f"/api/products/{self.product.pk}/approve/")
+                self.assertIsNone(subscription.get(timeout=0))   # not before commit
+            for callback in callbacks:
+                callback()
+            event = subscription.get(timeout=0)
+        self.assertEqual((event["type"], event["id"], event["actor"]), ("product.approved", self.product.pk, self.approver.pk))
+        self.assertEqual(event["product"]["status"], ProductStatus.APPROVED)
+
+    def test_other_businesses_hear_nothing(self):
+        with get_broker().subscribe(business_topic(self.business.pk + 1)) as subscription:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.post(f"/api/products/{self.product.pk}/reject/")
+            self.assertIsNone(subscription.get(timeout=0))
+
+    @override_settings(EVENTS_HEARTBEAT_SECONDS=0.01)
+    def test_stream(self):
+        response = self.client.get("/api/products/events/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        chunks = iter(response.streaming_content)
+        self.assertEqual(next(chunks), b"retry: 3000\n: connected\n\n")
+        self.assertEqual(next(chunks), b": ping\n\n")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(f"/api/products/{self.product.pk}/")   # approver may not delete
+            self.client.post(f"/api/products/{self.product.pk}/reject/")
+        message = next(chunks).decode()
+        self.assertTrue(message.startswith("id: 1\nevent: product.rejected\ndata: {"))
+        response.close()
+        self.assertEqual(get_broker().subscriber_count(business_topic(self.business.pk)), 0)
+
+    @override_settings(EVENTS_HEARTBEAT_SECONDS=0.01, EVENTS_STREAM_MAX_SECONDS=0.1)
+    async def test_async_stream_under_asgi(self):
+        response = await self.async_client.get("/api/products/events/")
+        self.assertEqual(response.status_code, 200)
+        chunks = []
+        async for chunk in response.streaming_content:   # ends after EVENTS_STREAM_MAX_SECONDS
+            if not chunks:
+                get_broker().publish(business_topic(self.business.pk), {"type": "product.deleted", "id": 1})
+            chunks.append(chunk)
+        self.assertEqual(chunks[0], b"retry: 3000\n: connected\n\n")
+        self.assertIn(b'id: 1\nevent: product.deleted\ndata: {"type": "product.deleted", "id": 1}\n\n', chunks)
+
+    @override_settings(EVENTS_QUEUE_SIZE=2)
+    def test_slow_subscriber_is_told_to_resync(self):
+        broker = get_broker()
+        with broker.subscribe("t") as subscription:
+            for i in range(3):
+                broker.publish("t", {"type": "x", "id": i})
+            self.assertEqual(subscription.get(timeout=0), RESYNC)
+            self.assertIsNone(subscription.get(timeout=0))
+
+    def test_requires_a_business(self):
+        loner = User.objects.create_user(email="loner@example.com", password="password123", role=Role.VIEWER)
+        self.client.cookies["access_token"] = str(RefreshToken.for_user(loner).access_token)
+        self.assertEqual(self.client.get("/api/products/events/").status_code, 403)
+
+
+@override_settings(CATALOG_PRICE_BUCKETS=["10", "50"])
+class PublicCatalogFacetTests(TestCase):
+    url = "/api/products/public/products/"
+
+    @classmethod
+    def setUpTestData(cls):
+        acme  = Business.objects.create(name="Acme Corp", email="acme@example.com")
+        globex = Business.objects.create(name="Globex", email="globex@example.com")
+        for name, price, business in [
+            ("Pin", "9.99", acme), ("Cup", "10.00", acme), ("Hat", "49.99", globex), ("Sofa", "0.1E+3", acme),
+        ]:
+            Product.objects.create(name=name, price=Decimal(price), status=ProductStatus.APPROVED, business=business)
+        Product.objects.create(name="Draft", price=Decimal("5"), business=globex)
+        cls.acme, cls.globex = acme, globex
+
+    def names(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return [p["name"] for p in response.json()]
+
+    def test_exact_decimal_bounds_and_sorting(self):
+        self.assertEqual(self.names(min_price="10.00", max_price="49.99", sort="price"), ["Cup", "Hat"])
+        self.assertEqual(self.names(max_price="9.999999999999999999", sort="price"), ["Pin"])
+        self.assertEqual(self.names(min_price="49.981", sort="price"), ["Hat", "Sofa"])
+        self.assertEqual(self.names(min_price="1e30"), [])
+        self.assertEqual(len(self.names(max_price="1e30")), 4)
+        self.assertEqual(self.names(sort="-price"), ["Sofa", "Hat", "Cup", "Pin"])
+        self.assertEqual(self.names(), ["Sofa", "Hat", "Cup", "Pin"])   # newest first
+        self.assertEqual(self.names(business=str(self.globex.pk)), ["Hat"])
+
+    def test_invalid_parameters(self):
+        for params in ({"min_price": "abc"}, {"max_price": "NaN"}, {"sort": "name"},
+                       {"business": "x"}, {"facets": "colour"}):
+            self.assertEqual(self.client.get(self.url, params).status_code, 400, params)
+
+    def test_facets_in_one_query(self):
+        with self.assertNumQueries(2):   # results + one grouped aggregate
+            body = self.client.get(self.url, {"facets": "price,business", "fields": "name"}).json()
+        self.assertEqual(body["count"], 4)
+        self.assertEqual(len(body["results"]), 4)
+        self.assertEqual(body["facets"]["price"], [
+            {"min": "0", "max": "10", "count": 1},
+            {"min": "10", "max": "50", "count": 2},
+            {"min": "50", "max": None, "count": 1},
+        ])
+        self.assertEqual(body["facets"]["business"], [
+            {"id": self.acme.pk, "name": "Acme Corp", "count": 3},
+            {"id": self.globex.pk, "name": "Globex", "count": 1},
+        ])
+
+    def test_facets_follow_filters(self):
+        body = self.client.get(self.url, {"facets": "business", "min_price": "10"}).json()
+        self.assertNotIn("price", body["facets"])
+        self.assertEqual([b["count"] for b in body["facets"]["business"]], [2, 1])
+
+
+@override_settings(CATALOG_FEED_SETTLE_SECONDS=0)
+class CatalogSnapshotTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        business = Business.objects.create(name="Acme Corp", email="acme@example.com")
+        cls.products = [
+            Product.objects.create(name=name, price=Decimal("9.99"), status=ProductStatus.APPROVED, business=business)
+            for name in ("Pin", "Cup — “mug”")
+        ]
+        cls.draft = Product.objects.create(name="Draft", price=Decimal("5"), business=business)
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.enterContext(override_settings(CATALOG_SNAPSHOT_ENABLED=True, CATALOG_SNAPSHOT_DIR=directory.name))
+        self.directory = directory.name
+
+    def test_serves_identical_bytes(self):
+        list_url, detail_url = "/api/products/public/products/", f"/api/products/public/products/{self.products[1].pk}/"
+        with override_settings(CATALOG_SNAPSHOT_ENABLED=False):
+            expected = self.client.get(list_url).content, self.client.get(detail_url).content
+
+        call_command("build_catalog_snapshot", stdout=io.StringIO())
+        with self.assertNumQueries(2):   # has anything changed since the snapshot?
+            listed, detail = self.client.get(list_url), self.client.get(detail_url)
+        self.assertIn("X-Catalog-Snapshot", listed)
+        self.assertTrue(listed.streaming)
+        self.assertEqual((listed.getvalue(), detail.content), expected)
+
+    def test_falls_back_to_the_database(self):
+        build_snapshot()
+        with mock.patch("products.signals.schedule_rebuild") as schedule:
+            with self.captureOnCommitCallbacks(execute=True):
+                added = Product.objects.create(
+                    name="New", price=Decimal("1"), status=ProductStatus.APPROVED, business=self.draft.business,
+                )
+            schedule.assert_called_once()
+
+        response = self.client.get(f"/api/products/public/products/{added.pk}/")   # not in the snapshot yet
+        self.assertNotIn("X-Catalog-Snapshot", response)
+        self.assertEqual(response.json()["name"], "New")
+        self.assertEqual(self.client.get(f"/api/products/public/products/{self.draft.pk}/").status_code, 404)
+        self.assertNotIn("X-Catalog-Snapshot", self.client.get("/api/products/public/products/?search=p"))
+
+        build_snapshot()   # readers pick up the new manifest
+        listed = self.client.get("/api/products/public/products/")
+        self.assertIn("X-Catalog-Snapshot", listed)
+        self.assertEqual(len(json.loads(listed.getvalue())), 3)
+        self.assertEqual(len(os.listdir(self.directory)), 3)   # manifest + two data files
+
+    def test_changes_since_the_build_are_served_from_the_database(self):
+        build_snapshot()
+        pin, cup = self.products
+        with mock.patch("products.signals.schedule_rebuild"):
+            pin.price = Decimal("1.00")
+            pin.save()
+            cup.status = ProductStatus.DRAFT   # un-approved, still in the snapshot file
+            cup.save()
+
+        response = self.client.get(f"/api/products/public/products/{pin.pk}/")
+        self.assertNotIn("X-Catalog-Snapshot", response)
+        self.assertEqual(response.json()["price"], "1.00")
+        self.assertEqual(self.client.get(f"/api/products/public/products/{cup.pk}/").status_code, 404)
+        listed = self.client.get("/api/products/public/products/")
+        self.assertNotIn("X-Catalog-Snapshot", listed)
+        self.assertEqual([p["name"] for p in listed.json()], ["Pin"])
+
+    def test_rebuilds_are_queued_as_one_job(self):
+        schedule_rebuild()
+        schedule_rebuild()
+        [queued] = Job.objects.filter(name="products.build_catalog_snapshot", status=JobStatus.QUEUED)
+        self.assertGreater(queued.run_at, timezone.now())
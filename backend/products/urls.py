@@ -5,12 +5,16 @@ from .views.private_views import (
     ProductSubmitView,
     ProductApproveView,
     ProductRejectView,
+    CatalogSnapshotView,
 )
-from .views.public_views import PublicProductListView, PublicProductDetailView
+from .views.event_views import ProductEventStreamView
+from .views.public_views import PublicProductListView, PublicProductDetailView, PublicChangeFeedView
 
 urlpatterns = [
     path("",                        ProductListCreateView.as_view(), name="product-list-create"),
     path("<int:pk>/",               ProductDetailView.as_view(),     name="product-detail"),
+    path("events/",                 ProductEventStreamView.as_view(), name="product-events"),
+    path("snapshot/",               CatalogSnapshotView.as_view(),   name="product-snapshot"),
     path("<int:pk>/submit/",        ProductSubmitView.as_view(),     name="product-submit"),
     path("<int:pk>/approve/",       ProductApproveView.as_view(),    name="product-approve"),
     path("<int:pk>/reject/",        ProductRejectView.as_view(),     name="product-reject"),
@@ -18,4 +22,5 @@ urlpatterns = [
 
     path("public/products/",        PublicProductListView.as_view(),  name="public-product-list"),
     path("public/products/<int:pk>/", PublicProductDetailView.as_view(), name="public-product-detail"),
+    path("public/changes/",         PublicChangeFeedView.as_view(),   name="public-change-feed"),
 ]
\ No newline at end of file
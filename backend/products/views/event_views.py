@@ -0,0 +1,98 @@
+import json
+import time
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from rest_framework import status
+from rest_framework.renderers import BaseRenderer
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core.pubsub import get_broker
+from users.permissions import IsInternalUser
+from ..events import business_topic
+
+
+class EventStreamRenderer(BaseRenderer):
+    """Lets DRF negotiate `Accept: text/event-stream`; only error bodies are rendered by it."""
+    media_type = "text/event-stream"
+    format     = "sse"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return json.dumps(data).encode()
+
+
+def _message(event, seq) -> str:
+    data = json.dumps(event, cls=DjangoJSONEncoder)
+    return f"id: {seq}\nevent: {event['type']}\ndata: {data}\n\n"
+
+
+# Reconnect after 3 s; the comment line makes proxies flush the headers right away
+PREAMBLE = "retry: 3000\n: connected\n\n"
+
+
+def _sync_stream(topic):
+    deadline = time.monotonic() + settings.EVENTS_STREAM_MAX_SECONDS
+    with get_broker().subscribe(topic) as subscription:
+        yield PREAMBLE
+        seq = 0
+        while time.monotonic() < deadline:
+            event = subscription.get(timeout=settings.EVENTS_HEARTBEAT_SECONDS)
+            if event is None:
+                yield ": ping\n\n"
+                continue
+            seq += 1
+            yield _message(event, seq)
+
+
+async def _async_stream(topic):
+    deadline = time.monotonic() + settings.EVENTS_STREAM_MAX_SECONDS
+    async with get_broker().subscribe_async(topic) as subscription:
+        yield PREAMBLE
+        seq = 0
+        while time.monotonic() < deadline:
+            event = await subscription.get(timeout=settings.EVENTS_HEARTBEAT_SECONDS)
+            if event is None:
+                yield ": ping\n\n"
+                continue
+            seq += 1
+            yield _message(event, seq)
+
+
+class ProductEventStreamView(APIView):
+    """
+    GET /api/products/events/   (Server-Sent Events, all internal roles)
+
+    Pushes product.created / updated / submitted / approved / rejected /
+    deleted events for the user's business as they happen:
+
+        event: product.approved
+        data: {"type": "product.approved", "id": 7, "actor": 2, "at": "...", "product": {...}}
+
+    A "resync" event means events were dropped (slow client) — refetch the
+    list.  The stream ends after EVENTS_STREAM_MAX_SECONDS so the access token
+    is re-checked; EventSource reconnects on its own.
+
+    Under ASGI the stream is async and costs no thread.  Under WSGI each open
+    stream holds one worker thread.
+    """
+    permission_classes = [IsInternalUser]
+    renderer_classes   = [EventStreamRenderer]
+
+    def get(self, request):
+        business_id = request.user.business_id
+        if business_id is None:
+            return Response({"detail": "You don't belong to a business."}, status=status.HTTP_403_FORBIDDEN)
+
+        topic = business_topic(business_id)
+        if isinstance(request._request, ASGIRequest):
+            stream = _async_stream(topic)
+        else:
+            stream = _sync_stream(topic)
+
+        response = StreamingHttpResponse(stream, content_type="text/event-stream")
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"   # nginx: don't buffer the stream
+        return response
@@ -5,7 +5,13 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from django.shortcuts import get_object_or_404
+from django.conf import settings
 
+from core.fastpath import serialize_list
+from core.serializers import field_options
+from jobs.runner import enqueue
+from jobs.serializers import JobSerializer
+from ..events import publish_product_event
 from ..models import Product, ProductStatus
 from ..serializers import ProductSerializer, ProductWriteSerializer
 from users.permissions import IsInternalUser, CanEdit, CanApprove, IsAdmin
@@ -15,6 +21,8 @@ class ProductListCreateView(APIView):
     """
     GET  /api/products/   → all products for the user's business (all internal roles)
     POST /api/products/   → create a new draft product (Editor and above)
+
+    GET supports ?fields=id,name,price and ?expand=created_by to trim the payload.
     """
 
     def get_permissions(self):
@@ -34,7 +42,12 @@ class ProductListCreateView(APIView):
         if search:
             products = products.filter(name__icontains=search)
 
-        serializer = ProductSerializer(products, many=True)
+        options = field_options(request)
+        if settings.FAST_LIST_SERIALIZATION:
+            return Response(serialize_list(ProductSerializer, products, **options))
+
+        products   = ProductSerializer.project(products, **options)
+        serializer = ProductSerializer(products, many=True, **options)
         return Response(serializer.data)
 
     def post(self, request):
@@ -45,7 +58,9 @@ class ProductListCreateView(APIView):
             created_by=request.user,
             status=ProductStatus.DRAFT,
         )
-        return Response(ProductSerializer(product).data, status=status.HTTP_201_CREATED)
+        data = ProductSerializer(product).data
+        publish_product_event("created", product.business_id, product.pk, request.user, data)
+        return Response(data, status=status.HTTP_201_CREATED)
 
 
 class ProductDetailView(APIView):
@@ -66,8 +81,10 @@ class ProductDetailView(APIView):
         return [IsInternalUser()]
 
     def get(self, request, pk):
-        product = self._get_product(request, pk)
-        return Response(ProductSerializer(product).data)
+        options  = field_options(request)
+        queryset = ProductSerializer.project(Product.objects.all(), **options)
+        product  = get_object_or_404(queryset, pk=pk, business=request.user.business)
+        return Response(ProductSerializer(product, **options).data)
 
     def patch(self, request, pk):
         product = self._get_product(request, pk)
@@ -82,11 +99,15 @@ class ProductDetailView(APIView):
         serializer = ProductWriteSerializer(product, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
         serializer.save()
-        return Response(ProductSerializer(product).data)
+        data = ProductSerializer(product).data
+        publish_product_event("updated", product.business_id, product.pk, request.user, data)
+        return Response(data)
 
     def delete(self, request, pk):
         product = self._get_product(request, pk)
+        product_id = product.pk
         product.delete()
+        publish_product_event("deleted", product.business_id, product_id, request.user)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -109,7 +130,9 @@ class ProductSubmitView(APIView):
 
         product.status = ProductStatus.PENDING_APPROVAL
         product.save()
-        return Response(ProductSerializer(product).data)
+        data = ProductSerializer(product).data
+        publish_product_event("submitted", product.business_id, product.pk, request.user, data)
+        return Response(data)
 
 
 class ProductApproveView(APIView):
@@ -131,7 +154,9 @@ class ProductApproveView(APIView):
         product.status      = ProductStatus.APPROVED
         product.approved_by = request.user
         product.save()
-        return Response(ProductSerializer(product).data)
+        data = ProductSerializer(product).data
+        publish_product_event("approved", product.business_id, product.pk, request.user, data)
+        return Response(data)
 
 
 class ProductRejectView(APIView):
@@ -153,4 +178,19 @@ class ProductRejectView(APIView):
         product.status      = ProductStatus.DRAFT
         product.approved_by = None
         product.save()
-        return Response(ProductSerializer(product).data)
\ No newline at end of file
+        data = ProductSerializer(product).data
+        publish_product_event("rejected", product.business_id, product.pk, request.user, data)
+        return Response(data)
+
+
+class CatalogSnapshotView(APIView):
+    """
+    POST /api/products/snapshot/
+    Rebuilds the public catalog snapshot in the background. Admin only.
+    Returns the job to poll at /api/jobs/:id/.
+    """
+    permission_classes = [IsAdmin]
+
+    def post(self, request):
+        job = enqueue("products.build_catalog_snapshot", user=request.user)
+        return Response(JobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
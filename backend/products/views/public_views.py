@@ -1,9 +1,141 @@
+import base64
+import binascii
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import ROUND_CEILING, ROUND_FLOOR, Decimal, InvalidOperation
+
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
+from rest_framework.exceptions import ValidationError
+from rest_framework import status
+from django.conf import settings
+from django.db.models import Case, Count, IntegerField, Q, Value, When
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils import timezone
 
-from ..models import Product, ProductStatus
+from core.fastpath import serialize_list
+from core.serializers import field_options
+from ..models import CatalogChange, ChangeOp, Product
 from ..serializers import PublicProductSerializer
+from ..snapshot import get_reader
+
+
+# ?sort= → ORDER BY; each is served by an (status, <column>) index on Product
+SORTS = {
+    "newest": ("-created_at", "-id"),
+    "price":  ("price", "id"),
+    "-price": ("-price", "-id"),
+}
+FACETS = ("price", "business")
+
+
+def _snapshot_response(request, pk=None):
+    """
+    The pre-rendered document (products/snapshot.py) for a plain request, or
+    None → serve from the database (no snapshot yet, or it is missing a change).
+    """
+    if not settings.CATALOG_SNAPSHOT_ENABLED or request.query_params:
+        return None
+    snapshot = get_reader().current()
+    if snapshot is None:
+        return None
+    if pk is None:
+        if snapshot.changed_since():
+            return None
+        response = StreamingHttpResponse(snapshot.list_chunks(), content_type="application/json")
+        response["Content-Length"] = str(snapshot.size)
+    else:
+        body = snapshot.detail_document(pk)
+        if body is None or snapshot.changed_since(pk):
+            return None
+        response = HttpResponse(body, content_type="application/json")
+    response["X-Catalog-Snapshot"] = snapshot.version
+    return response
+
+
+def _decimal_param(params, name):
+    raw = params.get(name)
+    if not raw:
+        return None
+    try:
+        value = Decimal(raw)
+    except InvalidOperation:
+        value = None
+    if value is None or not value.is_finite():
+        raise ValidationError({name: "Enter a number."})
+    return value
+
+
+def _price_bound(params, name, rounding):
+    """
+    Price filter bound rounded onto the column's scale in the direction that
+    keeps the comparison exact (max_price=9.999 must not match 10.00, which it
+    would if the database rounded the parameter), clamped to the column range.
+    """
+    value = _decimal_param(params, name)
+    if value is None:
+        return None
+    field = Product._meta.get_field("price")
+    limit = Decimal(10) ** (field.max_digits - field.decimal_places)
+    value = max(min(value, limit), -limit)
+    return value.quantize(Decimal(1).scaleb(-field.decimal_places), rounding=rounding)
+
+
+def _id_list_param(params, name):
+    raw = params.get(name)
+    if not raw:
+        return None
+    try:
+        return [int(part) for part in raw.split(",")]
+    except ValueError:
+        raise ValidationError({name: "Enter comma-separated ids."})
+
+
+def price_bands():
+    """[(min, max), ...] from CATALOG_PRICE_BUCKETS; the last band is open-ended."""
+    bounds = [Decimal(b) for b in settings.CATALOG_PRICE_BUCKETS]
+    return list(zip([Decimal(0)] + bounds, bounds + [None]))
+
+
+def compute_facets(products, names) -> dict:
+    """
+    Counts per price band and/or per business for `products`, from a single
+    GROUP BY over (band, business) — the band is a CASE on the indexed price.
+    """
+    bands  = price_bands()
+    fields = []
+    if "price" in names:
+        band = Case(
+            *[When(price__lt=upper, then=Value(i)) for i, (_, upper) in enumerate(bands[:-1])],
+            default=Value(len(bands) - 1),
+            output_field=IntegerField(),
+        )
+        products = products.annotate(band=band)
+        fields.append("band")
+    if "business" in names:
+        fields += ["business_id", "business__name"]
+
+    rows = products.order_by().values(*fields).annotate(count=Count("id"))
+
+    band_counts, businesses = [0] * len(bands), {}
+    for row in rows:
+        if "price" in names:
+            band_counts[row["band"]] += row["count"]
+        if "business" in names:
+            entry = businesses.setdefault(
+                row["business_id"], {"id": row["business_id"], "name": row["business__name"], "count": 0},
+            )
+            entry["count"] += row["count"]
+
+    facets = {}
+    if "price" in names:
+        facets["price"] = [
+            {"min": str(lower), "max": str(upper) if upper is not None else None, "count": count}
+            for (lower, upper), count in zip(bands, band_counts)
+        ]
+    if "business" in names:
+        facets["business"] = sorted(businesses.values(), key=lambda b: (-b["count"], b["name"]))
+    return facets
 
 
 class PublicProductListView(APIView):
@@ -11,43 +143,182 @@ class PublicProductListView(APIView):
     GET /api/products/public/products/
     No authentication required.
     Returns only approved products across all businesses.
-    Supports ?search=name and ?max_price=50 filtering.
+    Supports ?search=name, ?min_price=10&max_price=50 and ?business=1,2
+    filtering, ?sort=newest|price|-price, and ?fields=id,name,price to trim
+    the payload.
+
+    ?facets=price,business wraps the list as
+        {"count": n, "results": [...], "facets": {"price": [...], "business": [...]}}
+    with counts over the filtered products.
+
+    Without query parameters the response comes from the catalog snapshot
+    when CATALOG_SNAPSHOT_ENABLED is on.
     """
     permission_classes = [AllowAny]
 
     def get(self, request):
-        products = Product.objects.filter(status=ProductStatus.APPROVED)
+        cached = _snapshot_response(request)
+        if cached is not None:
+            return cached
+
+        params   = request.query_params
+        products = Product.objects.public()
 
-        search = request.query_params.get("search")
+        search = params.get("search")
         if search:
             products = products.filter(name__icontains=search)
 
-        max_price = request.query_params.get("max_price")
-        if max_price:
-            try:
-                products = products.filter(price__lte=float(max_price))
-            except ValueError:
-                pass
+        max_price = _price_bound(params, "max_price", ROUND_FLOOR)
+        if max_price is not None:
+            products = products.filter(price__lte=max_price)
+
+        min_price = _price_bound(params, "min_price", ROUND_CEILING)
+        if min_price is not None:
+            products = products.filter(price__gte=min_price)
 
-        min_price = request.query_params.get("min_price")
-        if min_price:
-            try:
-                products = products.filter(price__gte=float(min_price))
-            except ValueError:
-                pass
+        business_ids = _id_list_param(params, "business")
+        if business_ids:
+            products = products.filter(business_id__in=business_ids)
 
-        serializer = PublicProductSerializer(products, many=True)
-        return Response(serializer.data)
+        sort = params.get("sort", "newest")
+        if sort not in SORTS:
+            raise ValidationError({"sort": f"Choose one of: {', '.join(SORTS)}."})
+        products = products.order_by(*SORTS[sort])
+
+        facet_names = [name for name in params.get("facets", "").split(",") if name]
+        unknown = set(facet_names) - set(FACETS)
+        if unknown:
+            raise ValidationError({"facets": f"Unknown facet(s): {', '.join(sorted(unknown))}."})
+
+        options = field_options(request)
+        if settings.FAST_LIST_SERIALIZATION:
+            results = serialize_list(PublicProductSerializer, products, **options)
+        else:
+            results = PublicProductSerializer(
+                PublicProductSerializer.project(products, **options), many=True, **options,
+            ).data
+
+        if not facet_names:
+            return Response(results)
+        return Response({
+            "count":   len(results),
+            "results": results,
+            "facets":  compute_facets(products, facet_names),
+        })
 
 
 class PublicProductDetailView(APIView):
     """
     GET /api/products/public/products/:id/
     Returns a single approved product. 404 if not approved.
+    Served from the catalog snapshot when enabled and the product is in it.
     """
     permission_classes = [AllowAny]
 
     def get(self, request, pk):
+        cached = _snapshot_response(request, pk)
+        if cached is not None:
+            return cached
+
         from django.shortcuts import get_object_or_404
-        product = get_object_or_404(Product, pk=pk, status=ProductStatus.APPROVED)
-        return Response(PublicProductSerializer(product).data)
\ No newline at end of file
+        options  = field_options(request)
+        queryset = PublicProductSerializer.project(Product.objects.all(), **options)
+        product  = get_object_or_404(queryset.public(), pk=pk)
+        return Response(PublicProductSerializer(product, **options).data)
+
+
+# ─── Change feed ──────────────────────────────────────────────────────────────
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+START = (EPOCH, 0)
+
+
+def _encode_cursor(position) -> str:
+    changed_at, change_id = position
+    micros = (changed_at - EPOCH) // timedelta(microseconds=1)
+    return base64.urlsafe_b64encode(f"c2:{micros}:{change_id}".encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor) -> tuple:
+    """Opaque cursor → (changed_at, id) of the last CatalogChange seen (START = from the beginning)."""
+    if not cursor:
+        return START
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+    except (binascii.Error, UnicodeDecodeError):
+        raise ValueError(cursor)
+    version, _, rest = raw.partition(":")
+    if version == "c1" and rest.isdigit():
+        # Ids stopped being the feed's order once rows were upserted in place: resync
+        return START
+    micros, _, change_id = rest.partition(":")
+    if version != "c2" or not micros.isdigit() or not change_id.isdigit():
+        raise ValueError(cursor)
+    return EPOCH + timedelta(microseconds=int(micros)), int(change_id)
+
+
+class PublicChangeFeedView(APIView):
+    """
+    GET /api/products/public/changes/?cursor=<cursor>&limit=500
+    No authentication required.
+
+    Approved-catalog changes since `cursor` (omit it for a full initial sync):
+
+        {"changes": [{"op": "upsert", "id": 5, "product": {...}},
+                     {"op": "delete", "id": 7}],
+         "cursor": "<pass back next time>", "has_more": false}
+
+    "upsert" carries the product's current public representation; "delete"
+    means it was deleted or is no longer approved.  Keep requesting with the
+    returned cursor while has_more is true.
+    """
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        try:
+            after = _decode_cursor(request.query_params.get("cursor"))
+        except ValueError:
+            return Response({"detail": "Invalid cursor."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = int(request.query_params.get("limit", settings.CATALOG_FEED_PAGE_SIZE))
+        except ValueError:
+            limit = settings.CATALOG_FEED_PAGE_SIZE
+        limit = max(1, min(limit, settings.CATALOG_FEED_MAX_PAGE_SIZE))
+
+        changed_at, change_id = after
+        changes = CatalogChange.objects.filter(Q(changed_at__gt=changed_at) | Q(changed_at=changed_at, pk__gt=change_id))
+        if settings.CATALOG_FEED_SETTLE_SECONDS:
+            # changed_at is stamped before commit: hold back the newest rows until
+            # any concurrent transaction with an earlier stamp has had time to commit
+            cutoff  = timezone.now() - timedelta(seconds=settings.CATALOG_FEED_SETTLE_SECONDS)
+            changes = changes.filter(changed_at__lte=cutoff)
+        rows = list(changes.order_by("changed_at", "pk").values_list("changed_at", "pk", "product_id", "op")[:limit + 1])
+        has_more, rows = len(rows) > limit, rows[:limit]
+
+        latest = {}
+        for _, _, product_id, op in rows:
+            latest.pop(product_id, None)   # keep the product's last op, in log order
+            latest[product_id] = op
+
+        upserts = [pk for pk, op in latest.items() if op == ChangeOp.UPSERT]
+        products = Product.objects.public().filter(pk__in=upserts)
+        if settings.FAST_LIST_SERIALIZATION:
+            data = serialize_list(PublicProductSerializer, products)
+        else:
+            data = PublicProductSerializer(PublicProductSerializer.project(products), many=True).data
+        by_id = {product["id"]: product for product in data}
+
+        feed = []
+        for product_id, op in latest.items():
+            if op == ChangeOp.DELETE:
+                feed.append({"op": op, "id": product_id})
+            elif product_id in by_id:
+                # An upsert whose product has left the catalog since is followed
+                # by its tombstone further along the log
+                feed.append({"op": op, "id": product_id, "product": by_id[product_id]})
+
+        return Response({
+            "changes":  feed,
+            "cursor":   _encode_cursor(rows[-1][:2] if rows else after),
+            "has_more": has_more,
+        })
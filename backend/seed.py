@@ -3,7 +3,12 @@ Seed script — run once after migrations to create demo data.
 
     python seed.py
 
-Creates:
+Scale mode generates deterministic synthetic data for benchmarking:
+
+    python seed.py --businesses 100 --products-per-business 10000 --chat-messages 100000
+    python seed.py --businesses 10 --products-per-business 1000 --users-per-business 20 --seed 7
+
+Demo mode creates:
     Business: Acme Corp
     Users:
         admin@acme.com      / password123  (Admin)
@@ -14,14 +19,24 @@ Creates:
         3 products in various statuses
 """
 
+import argparse
 import os
+import random
+import sys
+import time
+from decimal import Decimal
+
 import django
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
 django.setup()
 
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
 from users.models import User, Business, Role
-from products.models import Product, ProductStatus
+from products.models import CatalogChange, ChangeOp, Product, ProductStatus
+from chat.models import ChatMessage
 
 
 def run():
@@ -92,5 +107,196 @@ def run():
     print("Password for all: password123")
 
 
+# ─── Scale mode ───────────────────────────────────────────────────────────────
+
+SCALE_EMAIL_DOMAIN = "scale.example.com"
+
+ADJECTIVES = ["Ultra", "Smart", "Eco", "Pro", "Compact", "Deluxe", "Classic", "Rapid", "Silent", "Modular",
+              "Rugged", "Portable", "Premium", "Basic", "Wireless", "Solar", "Vintage", "Digital", "Hybrid", "Mini"]
+NOUNS      = ["Widget", "Gadget", "Blender", "Lamp", "Backpack", "Kettle", "Speaker", "Drill", "Chair", "Monitor",
+              "Keyboard", "Bottle", "Jacket", "Tent", "Camera", "Router", "Watch", "Mug", "Scooter", "Grinder"]
+FEATURES   = ["long battery life", "a two-year warranty", "recycled materials", "one-click setup", "a lifetime guarantee",
+              "whisper-quiet operation", "fast charging", "water resistance", "a modular design", "free spare parts"]
+QUESTIONS  = ["What {noun}s do you have under ${price}?", "Tell me about the {adj} {noun}.",
+              "Which {noun} is the best value?", "Do you sell anything from {business}?",
+              "Is the {adj} {noun} in stock?", "Compare the {noun}s for me."]
+
+# Role mix per business: 1 admin, ~10% approvers, ~40% editors, rest viewers
+ROLE_WEIGHTS    = [(Role.APPROVER, 1), (Role.EDITOR, 4), (Role.VIEWER, 5)]
+# Status mix: mostly approved, like a real catalog
+STATUS_WEIGHTS  = [(ProductStatus.APPROVED, 7), (ProductStatus.PENDING_APPROVAL, 2), (ProductStatus.DRAFT, 1)]
+
+
+class Progress:
+    """Prints `label: done/total (rows/s)` on one line, at most ~4 times a second."""
+
+    def __init__(self, label, total):
+        self.label, self.total, self.done = label, total, 0
+        self.started = self._last = time.perf_counter()
+
+    def advance(self, n):
+        self.done += n
+        now = time.perf_counter()
+        if now - self._last >= 0.25 or self.done >= self.total:
+            self._last = now
+            rate = self.done / max(now - self.started, 1e-9)
+            sys.stdout.write(f"\r  {self.label}: {self.done:,}/{self.total:,} ({rate:,.0f} rows/s)")
+            sys.stdout.flush()
+
+    def finish(self):
+        elapsed = time.perf_counter() - self.started
+        sys.stdout.write(f"\r  {self.label}: {self.done:,} rows in {elapsed:.1f}s{' ' * 20}\n")
+
+
+def _weighted(rng, weights):
+    return rng.choices([w[0] for w in weights], [w[1] for w in weights])[0]
+
+
+def _bulk_insert(model, rows, chunk_size, progress, on_chunk=None) -> int:
+    """
+    bulk_create an iterable of unsaved instances in chunks; returns the row
+    count.  Only `on_chunk(saved)` sees the saved instances, so callers that
+    don't need them hold no more than one chunk in memory.
+    """
+    def flush(chunk):
+        with transaction.atomic():
+            saved = model.objects.bulk_create(chunk)
+            if on_chunk:
+                on_chunk(saved)
+        progress.advance(len(chunk))
+        return len(chunk)
+
+    count, chunk = 0, []
+    for obj in rows:
+        chunk.append(obj)
+        if len(chunk) >= chunk_size:
+            count += flush(chunk)
+            chunk = []
+    if chunk:
+        count += flush(chunk)
+    return count
+
+
+def run_scale(businesses, products_per_business, users_per_business, chat_messages, seed, chunk_size):
+    """
+    Generate `businesses` businesses, each with `users_per_business` users and
+    `products_per_business` products, plus `chat_messages` chat messages.
+    The same --seed always produces the same data; re-running appends new
+    businesses after the ones already generated.
+    """
+    rng = random.Random(seed)
+    started = time.perf_counter()
+    print(f"Seeding scale data (seed={seed})...")
+
+    # One hash for every generated user — hashing per user would dominate runtime
+    password = make_password("password123")
+
+    first = Business.objects.filter(email__endswith=f"@{SCALE_EMAIL_DOMAIN}").count()
+    numbers = range(first, first + businesses)
+
+    progress = Progress("businesses", businesses)
+    created_businesses = []
+    _bulk_insert(Business, (
+        Business(name=f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} Co. #{n}", email=f"business{n}@{SCALE_EMAIL_DOMAIN}")
+        for n in numbers
+    ), chunk_size, progress, on_chunk=created_businesses.extend)
+    progress.finish()
+
+    def users():
+        for n, business in zip(numbers, created_businesses):
+            for i in range(users_per_business):
+                role = Role.ADMIN if i == 0 else _weighted(rng, ROLE_WEIGHTS)
+                yield User(
+                    email=f"user{i}.b{n}@{SCALE_EMAIL_DOMAIN}",
+                    first_name=f"User{i}", last_name=f"B{n}",
+                    role=role, business=business, password=password,
+                )
+
+    by_business = {}
+
+    def group_users(saved):
+        for user in saved:
+            by_business.setdefault(user.business_id, []).append(user)
+
+    progress = Progress("users", businesses * users_per_business)
+    _bulk_insert(User, users(), chunk_size, progress, on_chunk=group_users)
+    progress.finish()
+
+    def products():
+        for business in created_businesses:
+            # Plain ids rather than instances skip Django's related-object bookkeeping
+            staff     = by_business[business.id]
+            editors   = [u.id for u in staff if u.can_edit] or [u.id for u in staff]
+            approvers = [u.id for u in staff if u.can_approve] or [u.id for u in staff]
+            for i in range(products_per_business):
+                status = _weighted(rng, STATUS_WEIGHTS)
+                adj, noun = rng.choice(ADJECTIVES), rng.choice(NOUNS)
+                yield Product(
+                    name=f"{adj} {noun} {i}",
+                    description=f"The {adj.lower()} {noun.lower()} with {rng.choice(FEATURES)} and {rng.choice(FEATURES)}.",
+                    price=Decimal(rng.randint(99, 99999)) / 100,
+                    status=status,
+                    business_id=business.id,
+                    created_by_id=rng.choice(editors),
+                    approved_by_id=rng.choice(approvers) if status == ProductStatus.APPROVED else None,
+                )
+
+    def publish(saved):
+        # bulk_create skips the signals that publish approved products to the change feed
+        CatalogChange.objects.bulk_create([
+            CatalogChange(product_id=p.id, op=ChangeOp.UPSERT) for p in saved if p.status == ProductStatus.APPROVED
+        ])
+
+    progress = Progress("products", businesses * products_per_business)
+    _bulk_insert(Product, products(), chunk_size, progress, on_chunk=publish)
+    progress.finish()
+
+    def messages():
+        for i in range(chat_messages):
+            business = rng.choice(created_businesses)
+            # Roughly a third of chat traffic comes from signed-in staff
+            user = rng.choice(by_business[business.id]) if rng.random() < 0.33 else None
+            question = rng.choice(QUESTIONS).format(
+                adj=rng.choice(ADJECTIVES), noun=rng.choice(NOUNS).lower(),
+                price=rng.choice([10, 25, 50, 100, 250]), business=business.name,
+            )
+            yield ChatMessage(
+                user_id=user.id if user else None,
+                session_id="" if user else f"scale-session-{rng.randrange(chat_messages // 5 + 1)}",
+                user_message=question,
+                ai_response=f"Here are a few options from {business.name} that match: ...",
+            )
+
+    if chat_messages:
+        progress = Progress("chat messages", chat_messages)
+        _bulk_insert(ChatMessage, messages(), chunk_size, progress)
+        progress.finish()
+
+    print(f"\nDone in {time.perf_counter() - started:.1f}s. Password for all generated users: password123")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Seed demo data, or synthetic data at scale.")
+    parser.add_argument("--businesses", type=int, default=0,
+                        help="Scale mode: number of businesses to generate (0 = demo data only)")
+    parser.add_argument("--products-per-business", type=int, default=100)
+    parser.add_argument("--users-per-business", type=int, default=4)
+    parser.add_argument("--chat-messages", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=42, help="Random seed — same seed, same data")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="Rows per bulk_create batch")
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
-    run()
\ No newline at end of file
+    args = parse_args()
+    if args.businesses:
+        run_scale(
+            businesses=args.businesses,
+            products_per_business=args.products_per_business,
+            users_per_business=max(args.users_per_business, 1),
+            chat_messages=args.chat_messages,
+            seed=args.seed,
+            chunk_size=args.chunk_size,
+        )
+    else:
+        run()
\ No newline at end of file
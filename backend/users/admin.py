@@ -1,20 +1,44 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from core.pagination import EstimatedCountPaginator
+from .deletion import request_deletion
 from .models import User, Business
 
 
+class BackgroundDeleteMixin:
+    """Deletes through users/deletion.py instead of one cascading transaction."""
+
+    def get_deleted_objects(self, objs, request):
+        # Collecting every related row for the confirmation page is as slow as deleting them
+        deleted = [f"{obj} — and everything that belongs to it, in the background" for obj in objs]
+        return deleted, {}, set(), []
+
+    def delete_model(self, request, obj):
+        job = request_deletion(obj, requested_by=request.user)
+        self.message_user(request, f"{obj} is hidden now; job #{job.pk} removes its data.")
+
+    def delete_queryset(self, request, queryset):
+        for obj in queryset:
+            self.delete_model(request, obj)
+
+
 @admin.register(Business)
-class BusinessAdmin(admin.ModelAdmin):
+class BusinessAdmin(BackgroundDeleteMixin, admin.ModelAdmin):
     list_display  = ["name", "email", "created_at"]
     search_fields = ["name", "email"]
 
 
 @admin.register(User)
-class UserAdmin(BaseUserAdmin):
+class UserAdmin(BackgroundDeleteMixin, BaseUserAdmin):
     list_display   = ["email", "first_name", "last_name", "role", "business", "is_active"]
-    list_filter    = ["role", "is_active", "business"]
-    search_fields  = ["email", "first_name", "last_name"]
+    # No business filter: its sidebar would list every business on each page load
+    list_filter    = ["role", "is_active"]
+    list_select_related = ["business"]
+    # Prefix matches (istartswith) instead of scanning for substrings
+    search_fields  = ["^email", "^first_name", "^last_name", "=business__name"]
     ordering       = ["email"]
+    paginator      = EstimatedCountPaginator
+    show_full_result_count = False
 
     fieldsets = (
         (None,            {"fields": ("email", "password")}),
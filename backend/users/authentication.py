@@ -1,7 +1,11 @@
 from django.conf import settings
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 
+from monitoring.tracing import traced
+from .tokens import is_current
+
 
 class CookieJWTAuthentication(JWTAuthentication):
     """
@@ -10,6 +14,7 @@ class CookieJWTAuthentication(JWTAuthentication):
     like Postman / curl still work during development.
     """
 
+    @traced("auth.jwt")
     def authenticate(self, request):
         # 1. Try cookie first
         raw_token = request.COOKIES.get(settings.JWT_AUTH_COOKIE)
@@ -18,9 +23,18 @@ class CookieJWTAuthentication(JWTAuthentication):
         if raw_token is None:
             return super().authenticate(request)
 
+        # JS can't clear an HttpOnly cookie: if it is unusable (expired, revoked,
+        # or its user deactivated) the request is anonymous, so that login,
+        # logout and the public pages keep working
         try:
             validated_token = self.get_validated_token(raw_token)
-        except (InvalidToken, TokenError):
+            return self.get_user(validated_token), validated_token
+        except (InvalidToken, TokenError, AuthenticationFailed):
             return None
 
-        return self.get_user(validated_token), validated_token
\ No newline at end of file
+    def get_user(self, validated_token):
+        user = super().get_user(validated_token)
+        # The user row is loaded anyway — checking the generation costs nothing
+        if not is_current(validated_token, user):
+            raise AuthenticationFailed("Token has been revoked.", code="token_revoked")
+        return user
\ No newline at end of file
@@ -0,0 +1,98 @@
+"""
+Deleting a business or a user without one long, table-locking cascade.
+
+    job = request_deletion(user, requested_by=request.user)
+
+returns at once: the row is marked pending deletion, which hides it from
+the default managers (so from every API, login and token check), and the
+user — or every user of the business — is deactivated and signed out.  A
+business's products leave the public catalog (Product.objects.public())
+at once too, with tombstones in the catalog change feed.  The
+"users.purge" job then removes what depends on it, DELETION_BATCH_SIZE rows
+per short transaction, reporting its progress on the job, and deletes the
+row itself last, when its cascade has nothing left to do.  A business's
+products are deleted without their per-row delete signals: the job
+tombstones whatever the feed still publishes in one statement first.
+
+The job can be re-run safely: every step re-queries what is left.
+"""
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from chat.models import ChatMessage
+from core.deletion import delete_in_batches, null_in_batches
+from jobs.models import Job
+from jobs.runner import enqueue
+from products.models import CatalogChange, ChangeOp, Product, ProductStatus
+from products.signals import record_changes
+from .models import Business, User
+
+
+@transaction.atomic
+def request_deletion(obj, requested_by=None) -> Job:
+    """Hide `obj` (a Business or User) now and queue the removal of its data."""
+    now = timezone.now()
+    if isinstance(obj, Business):
+        Business.all_objects.filter(pk=obj.pk).update(deletion_requested_at=now)
+        users = User.all_objects.filter(business=obj)
+        kind  = "business"
+        # Not attached to the business: its jobs are deleted along with it
+        requested_by = None
+        # Feed consumers and the catalog snapshot learn of the removal now
+        published = Product.objects.filter(business=obj, status=ProductStatus.APPROVED).values_list("pk", flat=True)
+        record_changes(published.iterator(chunk_size=2000), ChangeOp.DELETE)
+    else:
+        users = User.all_objects.filter(pk=obj.pk)
+        kind  = "user"
+    users.update(deletion_requested_at=now, is_active=False, token_generation=F("token_generation") + 1)
+    obj.deletion_requested_at = now
+    return enqueue("users.purge", user=requested_by, model=kind, pk=obj.pk)
+
+
+def _steps(model, pk, job_id):
+    """(label, queryset, field to NULL or None to delete, or "raw" to delete without signals), in order."""
+    if model == "business":
+        users = User.all_objects.filter(business_id=pk)
+        head  = [
+            ("products", Product.objects.filter(business_id=pk), "raw"),
+            ("jobs",     Job.objects.filter(business_id=pk).exclude(pk=job_id), None),
+        ]
+        tail  = [("business", Business.all_objects.filter(pk=pk), None)]
+    else:
+        users, head, tail = User.all_objects.filter(pk=pk), [], []
+    return head + [
+        ("chat messages",     ChatMessage.objects.filter(user__in=users), None),
+        ("product authors",   Product.objects.filter(created_by__in=users), "created_by"),
+        ("product approvers", Product.objects.filter(approved_by__in=users), "approved_by"),
+        ("job owners",        Job.objects.filter(created_by__in=users).exclude(pk=job_id), "created_by"),
+        ("users",             users, None),
+    ] + tail
+
+
+def purge(job, model, pk) -> dict:
+    """Remove a business or user marked by request_deletion(), batch by batch."""
+    if model == "business":
+        # Anything published since the request: products are deleted raw, without product_deleted()
+        products  = Product.objects.filter(business_id=pk).values("pk")
+        published = CatalogChange.objects.filter(op=ChangeOp.UPSERT, product_id__in=products)
+        record_changes(published.values_list("product_id", flat=True).iterator(chunk_size=2000), ChangeOp.DELETE)
+    steps = _steps(model, pk, job.pk)
+    total = sum(queryset.count() for _, queryset, _ in steps) or 1
+    done  = 0
+    batch_size = settings.DELETION_BATCH_SIZE
+
+    counts = {}
+    for label, queryset, field in steps:
+        def on_batch(size, label=label):
+            nonlocal done
+            done += size
+            job.report(done / total, f"Removing {label}")
+
+        if field in (None, "raw"):
+            counts[label] = delete_in_batches(queryset, batch_size, on_batch, raw=field == "raw")
+        else:
+            counts[label] = null_in_batches(queryset, field, batch_size, on_batch)
+    return counts
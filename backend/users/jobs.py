@@ -0,0 +1,8 @@
+from jobs.runner import job
+from .deletion import purge
+
+
+@job("users.purge", max_attempts=5)
+def purge_deleted(job, model, pk):
+    # Resumes where an earlier attempt stopped
+    return purge(job, model, pk)
@@ -0,0 +1,49 @@
+import json
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from users.models import User
+from users.provisioning import ProvisioningError, parse_users, provision
+
+
+class Command(BaseCommand):
+    help = (
+        "Create the users listed in a CSV (email,first_name,last_name,role,password) or JSON "
+        "file under an admin's business, with the same validation as POST /api/users/bulk/."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("file", help="CSV or JSON file, or - for stdin")
+        parser.add_argument("--admin", required=True, help="Email of the admin the users are created for")
+        parser.add_argument("--dry-run", action="store_true", help="Only validate")
+        parser.add_argument("--json", action="store_true", help="Print the full per-row report as JSON")
+
+    def handle(self, *args, **options):
+        try:
+            admin = User.objects.select_related("business").get(email=options["admin"], is_active=True)
+        except User.DoesNotExist:
+            raise CommandError(f"No active user {options['admin']!r}.")
+        if not admin.is_admin:
+            raise CommandError(f"{admin.email} is not an Admin.")
+
+        path = options["file"]
+        try:
+            if path == "-":
+                data = sys.stdin.buffer.read()
+            else:
+                with open(path, "rb") as f:
+                    data = f.read()
+            report = provision(parse_users(data, path), admin, dry_run=options["dry_run"])
+        except (OSError, ProvisioningError) as exc:
+            raise CommandError(str(exc))
+
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+        for entry in report["results"]:
+            if entry["status"] == "error":
+                self.stderr.write(f"row {entry['row']} ({entry['email']}): {json.dumps(entry['errors'])}")
+        verb = "Validated" if options["dry_run"] else "Created"
+        count = len(report["results"]) - report["failed"]
+        self.stdout.write(f"{verb} {count} user(s); {report['failed']} row(s) failed.")
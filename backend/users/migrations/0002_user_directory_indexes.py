@@ -0,0 +1,21 @@
+# Generated by Django 6.0.2 on 2026-02-17 16:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['business', 'date_joined'], name='user_business_joined_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['business', 'email'], name='user_business_email_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-02-17 18:30
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_deletion_requested_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='business',
+            index=models.Index(django.db.models.functions.text.Lower('name'), name='business_name_lower_idx'),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 6.0.2 on 2026-02-17 18:35
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+# PostgreSQL's LIKE 'prefix%' can only use a btree index built with
+# text_pattern_ops (under a non-C collation), so the user directory's prefix
+# search gets its own indexes there.
+POSTGRES = [
+    f"CREATE INDEX user_business_{column}_prefix_idx ON users_user (business_id, lower({column}) text_pattern_ops)"
+    for column in ("email", "first_name", "last_name")
+]
+POSTGRES_REVERSE = [
+    f"DROP INDEX IF EXISTS user_business_{column}_prefix_idx"
+    for column in ("email", "first_name", "last_name")
+]
+
+
+def create_prefix_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        for statement in POSTGRES:
+            schema_editor.execute(statement)
+
+
+def drop_prefix_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        for statement in POSTGRES_REVERSE:
+            schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_business_name_lower_idx'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='user',
+            name='user_business_email_idx',
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(models.F('business'), django.db.models.functions.text.Lower('email'), name='user_business_email_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(models.F('business'), django.db.models.functions.text.Lower('first_name'), name='user_business_first_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(models.F('business'), django.db.models.functions.text.Lower('last_name'), name='user_business_last_name_idx'),
+        ),
+        migrations.RunPython(create_prefix_indexes, drop_prefix_indexes),
+    ]
@@ -1,14 +1,30 @@
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
 from django.db import models
+from django.db.models import F
+from django.db.models.functions import Lower
+
+from core.deletion import HidePendingDeletion
+
+
+class BusinessManager(HidePendingDeletion, models.Manager):
+    pass
 
 
 class Business(models.Model):
     name = models.CharField(max_length=255)
     email = models.EmailField(unique=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Set while the business is being deleted in the background (see users/deletion.py)
+    deletion_requested_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects     = BusinessManager()
+    all_objects = models.Manager()   # including businesses pending deletion
 
     class Meta:
         verbose_name_plural = "businesses"
+        indexes = [
+            models.Index(Lower("name"), name="business_name_lower_idx"),   # chat/intents.py
+        ]
 
     def __str__(self):
         return self.name
@@ -37,7 +53,7 @@ ROLE_HIERARCHY = {
 }
 
 
-class UserManager(BaseUserManager):
+class UserManager(HidePendingDeletion, BaseUserManager):
     def create_user(self, email, password=None, **extra_fields):
         if not email:
             raise ValueError("Email is required")
@@ -69,15 +85,37 @@ class User(AbstractBaseUser, PermissionsMixin):
     is_active   = models.BooleanField(default=True)
     is_staff    = models.BooleanField(default=False)   # Django admin access
     date_joined = models.DateTimeField(auto_now_add=True)
+    # Bumped to revoke every token issued so far (see users/tokens.py)
+    token_generation = models.PositiveIntegerField(default=0)
+    # Set while the user is being deleted in the background (see users/deletion.py)
+    deletion_requested_at = models.DateTimeField(null=True, blank=True, editable=False)
 
-    objects = UserManager()
+    objects     = UserManager()
+    all_objects = models.Manager()   # including users pending deletion
 
     USERNAME_FIELD  = "email"
     REQUIRED_FIELDS = ["first_name", "last_name"]
 
+    class Meta:
+        indexes = [
+            # The admin user directory: keyset pages, and prefix search on the
+            # lowered email and names (users/views/user_views.py); PostgreSQL
+            # also gets text_pattern_ops twins for LIKE (migration 0006)
+            models.Index(fields=["business", "date_joined"], name="user_business_joined_idx"),
+            models.Index(F("business"), Lower("email"), name="user_business_email_idx"),
+            models.Index(F("business"), Lower("first_name"), name="user_business_first_name_idx"),
+            models.Index(F("business"), Lower("last_name"), name="user_business_last_name_idx"),
+        ]
+
     def __str__(self):
         return f"{self.email} ({self.role})"
 
+    def revoke_tokens(self):
+        """Invalidate every access and refresh token issued to this user so far."""
+        User.objects.filter(pk=self.pk).update(token_generation=F("token_generation") + 1)
+        # Deferred: reloaded from the database only if someone reads it again
+        self.__dict__.pop("token_generation", None)
+
     # ── Convenience permission helpers ────────────────────────────────────────
 
     def _has_min_role(self, min_role: str) -> bool:
@@ -0,0 +1,157 @@
+"""
+Bulk user provisioning: many users in one request, or from the command line.
+
+    rows   = parse_users(upload_bytes, filename="team.csv")   # CSV or JSON
+    report = provision(rows, admin)                            # dry_run=True to only validate
+
+Every row is validated with CreateUserSerializer (so the role rules are the
+same as for a single POST /api/users/), passwords are hashed in parallel and
+the valid users are inserted with bulk_create.  The report has one entry per
+row, in input order:
+
+    {"created": 2, "failed": 1, "results": [
+        {"row": 1, "email": "a@acme.com", "status": "created", "id": 17},
+        {"row": 2, "email": "b@acme.com", "status": "error", "errors": {"role": [...]}},
+        ...]}
+
+Password hashing is deliberately slow, and it dominates an import.  The
+hashers Django ships (PBKDF2, Argon2, bcrypt, scrypt) release the GIL while
+hashing, so a thread pool spreads the work over every core.
+"""
+
+import csv
+import io
+import json
+import os
+from concurrent import futures
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, transaction
+from rest_framework.validators import UniqueValidator
+
+from monitoring.tracing import span
+from .models import User
+from .serializers import CreateUserSerializer
+
+
+class ProvisioningError(ValueError):
+    """The upload as a whole can't be read."""
+
+
+COLUMNS = ("email", "first_name", "last_name", "role", "password")
+
+
+# ─── Input ───────────────────────────────────────────────────────────────────
+
+def parse_users(data, filename="") -> list:
+    """
+    Rows from a CSV (with a header line naming COLUMNS) or a JSON list of
+    objects — or {"users": [...]}.  `data` may be bytes, text or parsed JSON.
+    """
+    if isinstance(data, bytes):
+        try:
+            data = data.decode("utf-8-sig")
+        except UnicodeDecodeError:
+            raise ProvisioningError("The file must be UTF-8 encoded.")
+    if isinstance(data, str):
+        text = data.strip()
+        if filename.lower().endswith(".json") or text.startswith(("[", "{")):
+            try:
+                data = json.loads(text)
+            except ValueError as exc:
+                raise ProvisioningError(f"Invalid JSON: {exc}")
+        else:
+            reader = csv.DictReader(io.StringIO(text))
+            missing = set(COLUMNS) - {"role"} - set(reader.fieldnames or ())
+            if missing:
+                raise ProvisioningError(f"CSV header is missing: {', '.join(sorted(missing))}.")
+            return [{k: v for k, v in row.items() if k in COLUMNS and v not in (None, "")} for row in reader]
+
+    if isinstance(data, dict):
+        data = data.get("users")
+    if not isinstance(data, list) or not all(isinstance(row, dict) for row in data):
+        raise ProvisioningError('Expected a list of users (or {"users": [...]}).')
+    return data
+
+
+# ─── Provisioning ────────────────────────────────────────────────────────────
+
+def hash_passwords(passwords) -> list:
+    workers = min(settings.USERS_BULK_HASH_WORKERS or os.cpu_count() or 1, len(passwords))
+    with span("users.hash_passwords", {"count": len(passwords), "workers": workers}):
+        if workers <= 1:
+            return [make_password(password) for password in passwords]
+        with futures.ThreadPoolExecutor(workers, thread_name_prefix="hash") as pool:
+            return list(pool.map(make_password, passwords))
+
+
+def _validate(rows, admin):
+    """Per row: (validated_data, None) or (None, errors)."""
+    taken = set(User.all_objects.filter(
+        email__in=[User.objects.normalize_email(str(row.get("email", ""))) for row in rows],
+    ).values_list("email", flat=True))
+
+    outcomes, seen = [], set()
+    for row in rows:
+        serializer = CreateUserSerializer(data=row, context={"user": admin})
+        # Uniqueness is checked for the whole upload at once (above), not row by row
+        email_field = serializer.fields["email"]
+        email_field.validators = [v for v in email_field.validators if not isinstance(v, UniqueValidator)]
+
+        if not serializer.is_valid():
+            outcomes.append((None, serializer.errors))
+            continue
+        data  = serializer.validated_data
+        email = data["email"] = User.objects.normalize_email(data["email"])
+        if email in taken:
+            outcomes.append((None, {"email": ["A user with this email already exists."]}))
+        elif email in seen:
+            outcomes.append((None, {"email": ["This email appears more than once in the upload."]}))
+        else:
+            seen.add(email)
+            outcomes.append((data, None))
+    return outcomes
+
+
+def provision(rows, admin, dry_run=False) -> dict:
+    """Create the valid rows as users of `admin`'s business; see the module docstring."""
+    if len(rows) > settings.USERS_BULK_MAX_ROWS:
+        raise ProvisioningError(f"At most {settings.USERS_BULK_MAX_ROWS} users per upload.")
+
+    with span("users.provision", {"rows": len(rows), "dry_run": dry_run}):
+        outcomes = _validate(rows, admin)
+        valid = [data for data, _ in outcomes if data is not None]
+
+        created = {}
+        if valid and not dry_run:
+            hashes = hash_passwords([data["password"] for data in valid])
+            users  = [
+                User(**{**data, "password": hashed}, business=admin.business)
+                for data, hashed in zip(valid, hashes)
+            ]
+            try:
+                with transaction.atomic():
+                    User.objects.bulk_create(users, batch_size=500)
+            except IntegrityError:
+                # Someone registered one of these emails since _validate()
+                raise ProvisioningError("Some of these users were created meanwhile; upload the file again.")
+            # Not every backend returns primary keys from bulk_create
+            created = dict(User.objects.filter(email__in=[u.email for u in users]).values_list("email", "pk"))
+
+    results = []
+    for number, (row, (data, errors)) in enumerate(zip(rows, outcomes), start=1):
+        entry = {"row": number, "email": data["email"] if data else row.get("email")}
+        if errors:
+            entry.update(status="error", errors=errors)
+        elif dry_run:
+            entry["status"] = "valid"
+        else:
+            entry.update(status="created", id=created.get(data["email"]))
+        results.append(entry)
+
+    return {
+        "created": 0 if dry_run else len(valid),
+        "failed":  len(rows) - len(valid),
+        "results": results,
+    }
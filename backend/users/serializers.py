@@ -1,5 +1,7 @@
 from rest_framework import serializers
+from rest_framework.validators import UniqueValidator
 from django.contrib.auth import authenticate
+from core.serializers import DynamicFieldsMixin, TracedListSerializer
 from .models import User, Business, Role
 
 
@@ -30,8 +32,8 @@ class LoginSerializer(serializers.Serializer):
 
 # ─── User (read) ──────────────────────────────────────────────────────────────
 
-class UserSerializer(serializers.ModelSerializer):
-    """Full user detail — used for /me and user list responses."""
+class UserSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    """Full user detail — used for /me and user list responses. Supports ?fields=."""
     business = BusinessSerializer(read_only=True)
 
     class Meta:
@@ -41,6 +43,7 @@ class UserSerializer(serializers.ModelSerializer):
             "role", "business", "is_active", "date_joined",
         ]
         read_only_fields = ["id", "date_joined"]
+        list_serializer_class = TracedListSerializer
 
 
 # ─── User (create) ────────────────────────────────────────────────────────────
@@ -49,24 +52,30 @@ class CreateUserSerializer(serializers.ModelSerializer):
     """
     Used by Admin to create a new user under their business.
     Password is write-only; role defaults to viewer if not supplied.
+    The admin comes from context["request"], or context["user"] outside a request.
     """
     password = serializers.CharField(write_only=True, min_length=8)
+    # Users pending deletion still hold their email address
+    email    = serializers.EmailField(max_length=254, validators=[UniqueValidator(queryset=User.all_objects.all())])
 
     class Meta:
         model  = User
         fields = ["id", "email", "first_name", "last_name", "role", "password"]
         read_only_fields = ["id"]
 
+    @property
+    def requesting_user(self):
+        return self.context["user"] if "user" in self.context else self.context["request"].user
+
     def validate_role(self, value):
-        requesting_user = self.context["request"].user
         # Only admin can create another admin
-        if value == Role.ADMIN and not requesting_user.is_admin:
+        if value == Role.ADMIN and not self.requesting_user.is_admin:
             raise serializers.ValidationError("Only an Admin can assign the Admin role.")
         return value
 
     def create(self, validated_data):
         # Attach the new user to the same business as the requesting admin
-        business = self.context["request"].user.business
+        business = self.requesting_user.business
         return User.objects.create_user(business=business, **validated_data)
 
 
@@ -85,6 +94,17 @@ class UpdateUserSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Only an Admin can assign the Admin role.")
         return value
 
+    def update(self, instance, validated_data):
+        revoke = (
+            validated_data.get("role", instance.role) != instance.role
+            or (instance.is_active and validated_data.get("is_active") is False)
+        )
+        user = super().update(instance, validated_data)
+        if revoke:
+            # Sessions opened with the old role (or before deactivation) end now
+            user.revoke_tokens()
+        return user
+
 
 # ─── Password change ──────────────────────────────────────────────────────────
 
@@ -1,3 +1,370 @@
-from django.test import TestCase
+import io
+import json
+import tempfile
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from chat.intents import answer
+from chat.models import ChatMessage
+from jobs.models import Job, JobStatus
+from jobs.runner import _claim_one, execute
+from products.models import CatalogChange, ChangeOp, Product, ProductStatus
+from .deletion import request_deletion
+from .models import Business, Role, User
+from .serializers import UserSerializer
+from .views.user_views import _filter_directory
+
+
+class UserDirectoryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.business = Business.objects.create(name="Acme Corp", email="acme@example.com")
+        other        = Business.objects.create(name="Other Ltd", email="other@example.com")
+        cls.admin    = User.objects.create_user(
+            email="admin@acme.com", password="password123",
+            first_name="Ada", last_name="Admin", role=Role.ADMIN, business=cls.business,
+        )
+        people = [
+            ("carol@acme.com", "Carol", "Editor",   Role.EDITOR,   True),
+            ("dave@acme.com",  "Dave",  "Viewer",   Role.VIEWER,   True),
+            ("erin@acme.com",  "Erin",  "Carter",   Role.VIEWER,   False),
+            ("frank@acme.com", "Frank", "Approver", Role.APPROVER, True),
+        ]
+        for email, first, last, role, active in people:
+            User.objects.create_user(
+                email=email, password="password123", first_name=first, last_name=last,
+                role=role, is_active=active, business=cls.business,
+            )
+        User.objects.create_user(
+            email="carl@other.com", password="password123", first_name="Carl", last_name="Other",
+            role=Role.VIEWER, business=other,
+        )
+        # Same join time for everyone: the id must break the tie between pages
+        User.objects.update(date_joined=timezone.now() - timedelta(days=1))
+
+    def setUp(self):
+        self.client.cookies["access_token"] = str(RefreshToken.for_user(self.admin).access_token)
+
+    def directory(self, **params):
+        response = self.client.get("/api/users/", params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def emails(self, **params):
+        return [user["email"] for user in self.directory(**params)["results"]]
+
+    def test_first_page_matches_the_serializer(self):
+        page = self.directory()
+        expected = UserSerializer(User.objects.filter(business=self.business).order_by("date_joined", "pk"), many=True).data
+        self.assertEqual(page, {"results": [dict(user) for user in expected], "next": None})
+
+    def test_cursor_walks_every_user_once(self):
+        seen, params = [], {"limit": 2}
+        with self.assertNumQueries(3):   # the admin, the business (once) and the page
+            page = self.directory(**params)
+        while True:
+            seen += [user["email"] for user in page["results"]]
+            if not page["next"]:
+                break
+            page = self.directory(cursor=page["next"], **params)
+        self.assertEqual(seen, list(
+            User.objects.filter(business=self.business).order_by("pk").values_list("email", flat=True)
+        ))
+
+    def test_filters_and_search(self):
+        self.assertEqual(self.emails(role="viewer"), ["dave@acme.com", "erin@acme.com"])
+        self.assertEqual(self.emails(role="viewer", is_active="true"), ["dave@acme.com"])
+        self.assertEqual(self.emails(is_active="false"), ["erin@acme.com"])
+        self.assertEqual(self.emails(search="car"), ["carol@acme.com", "erin@acme.com"])   # email or last name
+        self.assertEqual(self.emails(search="FRANK@"), ["frank@acme.com"])
+
+    def test_search_uses_the_lowered_indexes(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("SQLite query plans")
+        users = _filter_directory(self.business.pk, {"search": "Car"})
+        plan  = users.explain()
+        for index in ("user_business_email_idx", "user_business_first_name_idx", "user_business_last_name_idx"):
+            self.assertIn(index, plan)
+
+    def test_fields_and_shared_business(self):
+        results = self.directory(fields="email,business.name")["results"]
+        self.assertEqual(results[0], {"email": "admin@acme.com", "business": {"name": "Acme Corp"}})
+        with self.assertNumQueries(2):   # no business in the output, no business query
+            self.directory(fields="email")
+
+    @override_settings(FAST_LIST_SERIALIZATION=False)
+    def test_regular_serializer_path(self):
+        page = self.directory(limit=3, fields="id,email")
+        self.assertEqual([set(user) for user in page["results"]], [{"id", "email"}] * 3)
+        self.assertIsNotNone(page["next"])
+
+    def test_bad_parameters(self):
+        for params in ({"role": "owner"}, {"is_active": "maybe"}, {"cursor": "not-a-cursor"}):
+            self.assertEqual(self.client.get("/api/users/", params).status_code, 400, params)
+
+
+@override_settings(
+    PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"],
+    USERS_BULK_HASH_WORKERS=4,
+)
+class BulkProvisioningTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.business = Business.objects.create(name="Acme Corp", email="acme@example.com")
+        cls.admin    = User.objects.create_user(
+            email="admin@acme.com", password="password123",
+            first_name="Ada", last_name="Admin", role=Role.ADMIN, business=cls.business,
+        )
+        User.objects.create_user(email="taken@acme.com", password="password123", first_name="T", last_name="Aken")
+
+    def setUp(self):
+        self.client.cookies["access_token"] = str(RefreshToken.for_user(self.admin).access_token)
+
+    def test_json_rows_are_created_with_per_row_results(self):
+        rows = [
+            {"email": "one@acme.com", "first_name": "One", "last_name": "A", "role": "editor", "password": "password123"},
+            {"email": "two@ACME.com", "first_name": "Two", "last_name": "B", "password": "password123"},
+            {"email": "taken@acme.com", "first_name": "T", "last_name": "C", "password": "password123"},
+            {"email": "one@acme.com", "first_name": "Dup", "last_name": "D", "password": "password123"},
+            {"email": "short@acme.com", "first_name": "S", "last_name": "E", "password": "short"},
+        ]
+        response = self.client.post("/api/users/bulk/", rows, content_type="application/json")
+        self.assertEqual(response.status_code, 207)
+        report = response.json()
+        self.assertEqual((report["created"], report["failed"]), (2, 3))
+        self.assertEqual([r["status"] for r in report["results"]], ["created", "created", "error", "error", "error"])
+        self.assertIn("password", report["results"][4]["errors"])
+
+        two = User.objects.get(pk=report["results"][1]["id"])
+        self.assertEqual((two.email, two.role, two.business), ("two@acme.com", Role.VIEWER, self.business))
+        self.assertTrue(two.check_password("password123"))
+
+    def test_csv_upload_and_dry_run(self):
+        csv = b"email,first_name,last_name,role,password\nnew@acme.com,New,Person,approver,password123\n"
+        upload = SimpleUploadedFile("team.csv", csv, content_type="text/csv")
+        response = self.client.post("/api/users/bulk/?dry_run=true", {"file": upload})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["results"][0]["status"], "valid")
+        self.assertFalse(User.objects.filter(email="new@acme.com").exists())
+
+        upload = SimpleUploadedFile("team.csv", csv, content_type="text/csv")
+        self.assertEqual(self.client.post("/api/users/bulk/", {"file": upload}).status_code, 201)
+        self.assertEqual(User.objects.get(email="new@acme.com").role, Role.APPROVER)
+
+    def test_unreadable_upload(self):
+        upload = SimpleUploadedFile("team.csv", b"email,name\nx@acme.com,X\n")
+        response = self.client.post("/api/users/bulk/", {"file": upload})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("first_name", response.json()["detail"])
+
+    def test_management_command(self):
+        rows = [{"email": f"cli{i}@acme.com", "first_name": "Cli", "last_name": str(i), "password": "password123"}
+                for i in range(10)]
+        with tempfile.NamedTemporaryFile("w", suffix=".json") as f, self.settings(USERS_BULK_MAX_ROWS=10):
+            json.dump(rows, f)
+            f.flush()
+            out = io.StringIO()
+            call_command("provision_users", f.name, admin="admin@acme.com", stdout=out)
+        self.assertIn("Created 10 user(s)", out.getvalue())
+        self.assertEqual(User.objects.filter(email__startswith="cli", business=self.business).count(), 10)
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class TokenRevocationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.business = Business.objects.create(name="Acme Corp", email="acme@example.com")
+        cls.admin    = User.objects.create_user(
+            email="admin@acme.com", password="password123",
+            first_name="Ada", last_name="Admin", role=Role.ADMIN, business=cls.business,
+        )
+        cls.editor   = User.objects.create_user(
+            email="editor@acme.com", password="password123",
+            first_name="Carol", last_name="Editor", role=Role.EDITOR, business=cls.business,
+        )
+
+    def login(self, email):
+        client = self.client_class()
+        response = client.post("/api/auth/login/", {"email": email, "password": "password123"}, content_type="application/json")
+        self.assertEqual(response.status_code, 200)
+        return client
+
+    def assertSignedIn(self, client, signed_in=True):
+        self.assertEqual(client.get("/api/auth/me/").status_code, 200 if signed_in else 401)
+        self.assertEqual(client.post("/api/auth/refresh/").status_code, 200 if signed_in else 401)
+
+    def test_check_costs_no_query(self):
+        client = self.login("editor@acme.com")
+        with self.assertNumQueries(2):   # the user row and their business, as before
+            client.get("/api/auth/me/")
+
+    def test_role_change_and_deactivation_revoke(self):
+        admin, editor = self.login("admin@acme.com"), self.login("editor@acme.com")
+        url = f"/api/users/{self.editor.pk}/"
+
+        admin.patch(url, {"first_name": "Caroline"}, content_type="application/json")
+        self.assertSignedIn(editor)
+
+        admin.patch(url, {"role": "viewer"}, content_type="application/json")
+        self.assertSignedIn(editor, False)
+
+        editor = self.login("editor@acme.com")
+        admin.patch(url, {"is_active": False}, content_type="application/json")
+        User.objects.filter(pk=self.editor.pk).update(is_active=True)   # only the generation may reject now
+        self.assertSignedIn(editor, False)
+
+    def test_password_change_keeps_only_this_session(self):
+        laptop, phone = self.login("editor@acme.com"), self.login("editor@acme.com")
+        response = laptop.post(
+            "/api/users/change-password/", {"old_password": "password123", "new_password": "password456"},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertSignedIn(laptop)
+        self.assertSignedIn(phone, False)
+
+    def test_logout_everywhere(self):
+        laptop, phone = self.login("editor@acme.com"), self.login("editor@acme.com")
+        self.assertEqual(laptop.post("/api/auth/logout-all/").status_code, 200)
+        self.assertSignedIn(phone, False)
+        self.assertSignedIn(self.login("editor@acme.com"))
+
+    def test_revoked_cookie_leaves_the_browser_anonymous(self):
+        laptop, phone = self.login("editor@acme.com"), self.login("editor@acme.com")
+        laptop.post("/api/auth/logout-all/")
+        self.assertEqual(phone.get("/api/products/public/products/").status_code, 200)
+        response = phone.post("/api/auth/login/", {"email": "editor@acme.com", "password": "password123"}, content_type="application/json")
+        self.assertEqual(response.status_code, 200)
+        self.assertSignedIn(phone)
+
+        laptop = self.login("editor@acme.com")
+        User.objects.get(pk=self.editor.pk).revoke_tokens()
+        response = laptop.post("/api/auth/logout/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.cookies["access_token"].value, "")
+        # An Authorization header is still rejected outright
+        token = RefreshToken.for_user(self.editor).access_token
+        token["gen"] = 0
+        self.assertEqual(self.client_class().get("/api/auth/me/", HTTP_AUTHORIZATION=f"Bearer {token}").status_code, 401)
+
+
+class BackgroundDeletionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.business = Business.objects.create(name="Acme Corp", email="acme@example.com")
+        cls.other    = Business.objects.create(name="Other Ltd", email="other@example.com")
+        cls.admin    = User.objects.create_user(
+            email="admin@acme.com", password="password123",
+            first_name="Ada", last_name="Admin", role=Role.ADMIN, business=cls.business,
+        )
+        cls.editor   = User.objects.create_user(
+            email="editor@acme.com", password="password123",
+            first_name="Carol", last_name="Editor", role=Role.EDITOR, business=cls.business,
+        )
+        cls.outsider = User.objects.create_user(
+            email="editor@other.com", password="password123",
+            first_name="Olga", last_name="Other", role=Role.EDITOR, business=cls.other,
+        )
+        for i in range(5):
+            Product.objects.create(
+                name=f"Acme {i}", price="9.99", status=ProductStatus.APPROVED,
+                business=cls.business, created_by=cls.editor, approved_by=cls.admin,
+            )
+        cls.foreign = Product.objects.create(name="Other", price="5.00", business=cls.other, created_by=cls.editor)
+        ChatMessage.objects.bulk_create([
+            ChatMessage(user=cls.editor, user_message=f"Q{i}", ai_response="A") for i in range(7)
+        ])
+
+    def test_user_is_hidden_at_once_and_purged_later(self):
+        self.client.cookies["access_token"] = str(RefreshToken.for_user(self.admin).access_token)
+        editor = self.client_class()
+        editor.cookies["access_token"] = str(RefreshToken.for_user(self.editor).access_token)
+
+        response = self.client.delete(f"/api/users/{self.editor.pk}/")
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()["status"], JobStatus.QUEUED)
+        job = Job.objects.get(pk=response.json()["id"])
+
+        # Gone from every query and signed out, while its data is still there
+        self.assertFalse(User.objects.filter(pk=self.editor.pk).exists())
+        self.assertEqual(self.client.get(f"/api/users/{self.editor.pk}/").status_code, 404)
+        self.assertEqual(editor.get("/api/auth/me/").status_code, 401)
+        self.assertEqual(ChatMessage.objects.filter(user=self.editor).count(), 7)
+        # ...and its email can't be taken meanwhile
+        response = self.client.post("/api/users/", {
+            "email": "editor@acme.com", "first_name": "New", "last_name": "Editor", "password": "password123",
+        }, content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+
+        with override_settings(DELETION_BATCH_SIZE=3):
+            self.assertTrue(_claim_one(job, "test"))
+            execute(job, "test")
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.progress), (JobStatus.SUCCEEDED, 1.0))
+        self.assertEqual(job.result["chat messages"], 7)
+        self.assertFalse(User.all_objects.filter(pk=self.editor.pk).exists())
+        self.assertFalse(ChatMessage.objects.exists())
+        self.assertEqual(Product.objects.filter(created_by=None).count(), 6)   # kept, author cleared
+        self.assertEqual(Product.objects.filter(approved_by=self.admin).count(), 5)
+
+    @override_settings(CATALOG_FEED_SETTLE_SECONDS=0)
+    def test_business_products_leave_the_catalog_at_once(self):
+        cursor = self.client.get("/api/products/public/changes/").json()["cursor"]
+        acme   = Product.objects.get(name="Acme 0")
+        request_deletion(self.business)   # the purge job hasn't run yet
+
+        self.assertEqual(self.client.get("/api/products/public/products/").json(), [])
+        self.assertEqual(self.client.get(f"/api/products/public/products/{acme.pk}/").status_code, 404)
+        self.assertIsNone(answer("how much is Acme 0?"))
+        self.assertNotIn("Acme", answer("products under $20"))
+        changes = self.client.get("/api/products/public/changes/", {"cursor": cursor}).json()["changes"]
+        self.assertEqual(
+            sorted((c["op"], c["id"]) for c in changes),
+            sorted(("delete", pk) for pk in Product.objects.filter(business=self.business).values_list("pk", flat=True)),
+        )
+
+    def test_failed_request_changes_nothing(self):
+        with mock.patch("users.deletion.enqueue", side_effect=RuntimeError("queue down")):
+            with self.assertRaises(RuntimeError):
+                request_deletion(self.business)
+        self.assertTrue(Business.objects.filter(pk=self.business.pk).exists())
+        self.assertTrue(User.objects.get(pk=self.editor.pk).is_active)
+        self.assertFalse(CatalogChange.objects.filter(op=ChangeOp.DELETE).exists())
+
+    def test_purge_deletes_products_in_bulk(self):
+        job = request_deletion(self.business)
+        republished = Product.objects.get(name="Acme 0")
+        CatalogChange.objects.filter(product_id=republished.pk).update(op=ChangeOp.UPSERT)   # approved again since
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertTrue(_claim_one(job, "test"))
+            execute(job, "test")
+        change_log = [q["sql"] for q in queries if "products_catalogchange" in q["sql"]]
+        self.assertLessEqual(len(change_log), 2, change_log)   # not one per product
+        self.assertFalse(Product.objects.filter(business=self.business).exists())
+        self.assertEqual(CatalogChange.objects.get(product_id=republished.pk).op, ChangeOp.DELETE)
+
+    @override_settings(JOBS_EAGER=True, DELETION_BATCH_SIZE=2)
+    def test_business_purge(self):
+        Job.objects.create(name="products.build_catalog_snapshot", business=self.business)
+        job = request_deletion(self.business, requested_by=self.admin)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, JobStatus.SUCCEEDED, job.error)
+        self.assertEqual(
+            (job.result["products"], job.result["jobs"], job.result["users"], job.result["business"]), (5, 1, 2, 1),
+        )
+        self.assertFalse(Business.all_objects.filter(pk=self.business.pk).exists())
+        self.assertEqual(CatalogChange.objects.filter(op=ChangeOp.DELETE).count(), 5)   # tombstones for the feed
+        # The other business keeps its data; the product one of the deleted users wrote loses its author
+        self.assertEqual(list(User.objects.values_list("email", flat=True)), ["editor@other.com"])
+        self.foreign.refresh_from_db()
+        self.assertIsNone(self.foreign.created_by)
@@ -0,0 +1,26 @@
+"""
+JWTs that can be revoked all at once, per user.
+
+Every token carries the user's `token_generation` in the "gen" claim.
+Bumping the counter (User.revoke_tokens()) invalidates every access and
+refresh token issued before — on deactivation, role change, password change
+and "log out everywhere".  The check is free: authentication loads the user
+row anyway, so no blacklist table or cache is involved.
+
+Tokens without the claim (issued before it existed) count as generation 0.
+"""
+
+from rest_framework_simplejwt.tokens import RefreshToken
+
+GENERATION_CLAIM = "gen"
+
+
+def issue_tokens(user) -> RefreshToken:
+    """A refresh token (and, via .access_token, an access token) for the user's current generation."""
+    refresh = RefreshToken.for_user(user)
+    refresh[GENERATION_CLAIM] = user.token_generation   # copied into the access token
+    return refresh
+
+
+def is_current(token, user) -> bool:
+    return token.get(GENERATION_CLAIM, 0) == user.token_generation
@@ -1,9 +1,10 @@
 from django.urls import path
-from users.views.auth_views import LoginView, RefreshView, LogoutView, MeView
+from users.views.auth_views import LoginView, RefreshView, LogoutView, LogoutAllView, MeView
 
 urlpatterns = [
     path("login/",   LoginView.as_view(),   name="auth-login"),
     path("refresh/", RefreshView.as_view(),  name="auth-refresh"),
     path("logout/",  LogoutView.as_view(),   name="auth-logout"),
+    path("logout-all/", LogoutAllView.as_view(), name="auth-logout-all"),
     path("me/",      MeView.as_view(),       name="auth-me"),
 ]
\ No newline at end of file
@@ -1,8 +1,9 @@
 from django.urls import path
-from users.views.user_views import UserListCreateView, UserDetailView, ChangePasswordView
+from users.views.user_views import UserListCreateView, BulkUserCreateView, UserDetailView, ChangePasswordView
 
 urlpatterns = [
     path("",                  UserListCreateView.as_view(), name="user-list-create"),
+    path("bulk/",             BulkUserCreateView.as_view(), name="user-bulk-create"),
     path("<int:pk>/",         UserDetailView.as_view(),     name="user-detail"),
     path("change-password/",  ChangePasswordView.as_view(), name="change-password"),
 ]
\ No newline at end of file
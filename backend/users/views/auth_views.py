@@ -6,8 +6,11 @@ from rest_framework import status
 
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.exceptions import TokenError, InvalidToken
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
 
+from users.models import User
 from users.serializers import LoginSerializer, UserSerializer
+from users.tokens import is_current, issue_tokens
 
 
 def _set_auth_cookies(response, access_token: str, refresh_token: str):
@@ -58,7 +61,7 @@ def _set_auth_cookies(response, access_token: str, refresh_token: str):
 
 def _build_auth_response(user) -> dict:
     """Generate tokens for a user and return the full payload."""
-    refresh = RefreshToken.for_user(user)
+    refresh = issue_tokens(user)
     return {
         "user":          UserSerializer(user).data,
         "access_token":  str(refresh.access_token),
@@ -103,12 +106,18 @@ class RefreshView(APIView):
 
         try:
             refresh  = RefreshToken(raw_refresh)
-            user     = refresh.user  # added by simplejwt when ROTATE_REFRESH_TOKENS=True
+            user     = User.objects.get(
+                **{jwt_settings.USER_ID_FIELD: refresh[jwt_settings.USER_ID_CLAIM]}, is_active=True
+            )
+            if not is_current(refresh, user):
+                raise InvalidToken("Token has been revoked.")
             # Force rotation — blacklists old token and issues a new one
-            new_refresh = RefreshToken.for_user(user)
+            new_refresh = issue_tokens(user)
             refresh.blacklist()
         except (TokenError, InvalidToken) as exc:
             return Response({"detail": str(exc)}, status=status.HTTP_401_UNAUTHORIZED)
+        except (KeyError, User.DoesNotExist):
+            return Response({"detail": "User not found or inactive."}, status=status.HTTP_401_UNAUTHORIZED)
 
         payload = {
             "user":          UserSerializer(user).data,
@@ -124,7 +133,8 @@ class RefreshView(APIView):
 # ─── Logout ───────────────────────────────────────────────────────────────────
 
 class LogoutView(APIView):
-    permission_classes = [IsAuthenticated]
+    # Also clears the cookies of a session that has already ended
+    permission_classes = [AllowAny]
 
     def post(self, request):
         raw_refresh = request.COOKIES.get(settings.JWT_AUTH_REFRESH_COOKIE)
@@ -141,6 +151,22 @@ class LogoutView(APIView):
         return response
 
 
+class LogoutAllView(APIView):
+    """
+    POST /api/auth/logout-all/
+    Ends every session of the current user, on every device.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        request.user.revoke_tokens()
+
+        response = Response({"detail": "Logged out everywhere."}, status=status.HTTP_200_OK)
+        response.delete_cookie(settings.JWT_AUTH_COOKIE)
+        response.delete_cookie(settings.JWT_AUTH_REFRESH_COOKIE)
+        return response
+
+
 # ─── Me ───────────────────────────────────────────────────────────────────────
 
 class MeView(APIView):
@@ -1,10 +1,26 @@
+import base64
+import binascii
+
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from rest_framework.exceptions import ValidationError
 from rest_framework import status
+from django.conf import settings
+from django.db import connections
+from django.db.models import Q, Value
+from django.db.models.functions import Lower
 from django.shortcuts import get_object_or_404
+from django.utils.dateparse import parse_datetime
 
-from users.models import User
+from core.fastpath import serialize_list
+from jobs.serializers import JobSerializer
+from core.serializers import field_options
+from users.models import Role, User
 from users.permissions import IsAdmin
+from users.deletion import request_deletion
+from users.provisioning import ProvisioningError, parse_users, provision
+from users.tokens import issue_tokens
+from users.views.auth_views import _set_auth_cookies
 from users.serializers import (
     UserSerializer,
     CreateUserSerializer,
@@ -13,17 +29,123 @@ from users.serializers import (
 )
 
 
+# ─── Directory paging ─────────────────────────────────────────────────────────
+
+def _encode_cursor(date_joined: str, pk: int) -> str:
+    return base64.urlsafe_b64encode(f"u1:{pk}:{date_joined}".encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor):
+    """Opaque cursor → (date_joined, id) of the last user seen."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+    except (binascii.Error, UnicodeDecodeError):
+        raise ValidationError({"cursor": "Invalid cursor."})
+    version, _, rest = raw.partition(":")
+    pk, _, date_joined = rest.partition(":")
+    date_joined = parse_datetime(date_joined) if version == "u1" and pk.isdigit() else None
+    if date_joined is None:
+        raise ValidationError({"cursor": "Invalid cursor."})
+    return date_joined, int(pk)
+
+
+SEARCHED = ("email", "first_name", "last_name")
+
+
+def _starts_with(users, business_id, search) -> Q:
+    """
+    Any SEARCHED column starts with `search`, case-insensitively, through the
+    (business, lower(column)) indexes.  PostgreSQL: a LIKE prefix on the
+    text_pattern_ops twins; elsewhere a range scan (SQLite's LIKE can't use
+    an index on a lowered column).  Each branch repeats the business: the
+    planners only combine indexes for an OR whose branches use them whole.
+    """
+    postgres  = connections[users.db].vendor == "postgresql"
+    low, high = Lower(Value(search)), Lower(Value(search + "\U0010ffff"))   # every string with that prefix sorts between
+    match = Q()
+    for column in SEARCHED:
+        if postgres:
+            match |= Q(business_id=business_id, **{f"{column}_lower__startswith": search.lower()})
+        else:
+            match |= Q(business_id=business_id, **{f"{column}_lower__gte": low, f"{column}_lower__lt": high})
+    return match
+
+
+def _filter_directory(business_id, params):
+    """The users of a business, after ?role=, ?is_active= and ?search= (prefix of email, first or last name)."""
+    users = User.objects.all()
+
+    role = params.get("role")
+    if role:
+        if role not in Role.values:
+            raise ValidationError({"role": f"Choose from {', '.join(Role.values)}."})
+        users = users.filter(role=role)
+
+    is_active = params.get("is_active", "").lower()
+    if is_active:
+        if is_active not in ("true", "false"):
+            raise ValidationError({"is_active": "Use true or false."})
+        users = users.filter(is_active=is_active == "true")
+
+    search = params.get("search", "").strip()
+    if search:
+        # The business is part of each branch of the search (see _starts_with)
+        users = users.alias(**{f"{column}_lower": Lower(column) for column in SEARCHED})
+        users = users.filter(_starts_with(users, business_id, search))
+    else:
+        users = users.filter(business_id=business_id)
+    return users
+
+
+def _page_size(params) -> int:
+    try:
+        limit = int(params.get("limit", settings.USERS_PAGE_SIZE))
+    except ValueError:
+        limit = settings.USERS_PAGE_SIZE
+    return max(1, min(limit, settings.USERS_MAX_PAGE_SIZE))
+
+
 class UserListCreateView(APIView):
     """
-    GET  /api/users/   → list all users in the requesting admin's business
+    GET  /api/users/   → one page of the users in the requesting admin's business
     POST /api/users/   → create a new user under the same business
+
+    GET supports ?role=, ?is_active=true|false, ?search=<prefix> (email, first
+    or last name), ?limit= and ?fields=.  Users come oldest first:
+
+        {"results": [...], "next": "<cursor>"}      → GET ?cursor=<cursor> for more
+
+    `next` is null on the last page.
     """
     permission_classes = [IsAdmin]
 
     def get(self, request):
-        users = User.objects.filter(business=request.user.business).order_by("date_joined")
-        serializer = UserSerializer(users, many=True)
-        return Response(serializer.data)
+        params = request.query_params
+        users  = _filter_directory(request.user.business_id, params)
+        if params.get("cursor"):
+            date_joined, pk = _decode_cursor(params["cursor"])
+            users = users.filter(Q(date_joined__gt=date_joined) | Q(date_joined=date_joined, pk__gt=pk))
+        limit = _page_size(params)
+        users = users.order_by("date_joined", "pk")[:limit + 1]
+
+        # Every user shares the admin's business: render it once instead of
+        # joining it onto each row
+        listing = UserSerializer(**field_options(request))
+        names   = list(listing.fields)
+        shared  = None
+        if "business" in names and request.user.business is not None:
+            shared = listing.fields["business"].to_representation(request.user.business)
+        columns = ",".join(dict.fromkeys([n for n in names if n != "business"] + ["id", "date_joined"]))
+        if settings.FAST_LIST_SERIALIZATION:
+            rows = serialize_list(UserSerializer, users, fields=columns)
+        else:
+            rows = UserSerializer(UserSerializer.project(users, fields=columns), many=True, fields=columns).data
+
+        has_more, rows = len(rows) > limit, rows[:limit]
+        return Response({
+            "results": [{name: shared if name == "business" else row[name] for name in names} for row in rows],
+            "next":    _encode_cursor(rows[-1]["date_joined"], rows[-1]["id"]) if has_more else None,
+        })
 
     def post(self, request):
         serializer = CreateUserSerializer(data=request.data, context={"request": request})
@@ -32,11 +154,37 @@ class UserListCreateView(APIView):
         return Response(UserSerializer(user).data, status=status.HTTP_201_CREATED)
 
 
+class BulkUserCreateView(APIView):
+    """
+    POST /api/users/bulk/   → create many users under the admin's business at once
+
+    Body: a JSON list of users (or {"users": [...]}), or a multipart upload
+    `file` holding CSV (header: email,first_name,last_name,role,password) or
+    JSON.  ?dry_run=true only validates.  Responds 201 if every row was
+    created, else 207 with per-row results (see users/provisioning.py).
+    """
+    permission_classes = [IsAdmin]
+
+    def post(self, request):
+        upload  = request.FILES.get("file")
+        dry_run = request.query_params.get("dry_run", "").lower() == "true"
+        try:
+            rows   = parse_users(upload.read(), upload.name) if upload else parse_users(request.data)
+            report = provision(rows, request.user, dry_run=dry_run)
+        except ProvisioningError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        if report["failed"]:
+            return Response(report, status=status.HTTP_207_MULTI_STATUS)
+        return Response(report, status=status.HTTP_200_OK if dry_run else status.HTTP_201_CREATED)
+
+
 class UserDetailView(APIView):
     """
     GET    /api/users/:id/   → retrieve a single user (must belong to same business)
     PATCH  /api/users/:id/   → update role / active status
-    DELETE /api/users/:id/   → remove user from business
+    DELETE /api/users/:id/   → remove user from business (in the background;
+                                returns the job to poll at /api/jobs/:id/)
     """
     permission_classes = [IsAdmin]
 
@@ -45,8 +193,10 @@ class UserDetailView(APIView):
         return get_object_or_404(User, pk=pk, business=request.user.business)
 
     def get(self, request, pk):
-        user = self._get_user(request, pk)
-        return Response(UserSerializer(user).data)
+        options  = field_options(request)
+        queryset = UserSerializer.project(User.objects.all(), **options)
+        user     = get_object_or_404(queryset, pk=pk, business=request.user.business)
+        return Response(UserSerializer(user, **options).data)
 
     def patch(self, request, pk):
         user = self._get_user(request, pk)
@@ -74,14 +224,15 @@ class UserDetailView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        user.delete()
-        return Response(status=status.HTTP_204_NO_CONTENT)
+        job = request_deletion(user, requested_by=request.user)
+        return Response(JobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
 
 
 class ChangePasswordView(APIView):
     """
     POST /api/users/change-password/
     Any authenticated user can change their own password.
+    Every other session of the user ends; this one gets fresh tokens.
     """
 
     def post(self, request):
@@ -89,4 +240,9 @@ class ChangePasswordView(APIView):
         serializer.is_valid(raise_exception=True)
         request.user.set_password(serializer.validated_data["new_password"])
         request.user.save()
-        return Response({"detail": "Password updated successfully."})
\ No newline at end of file
+        request.user.revoke_tokens()
+
+        refresh  = issue_tokens(request.user)
+        response = Response({"detail": "Password updated successfully."})
+        _set_auth_cookies(response, str(refresh.access_token), str(refresh))
+        return response
\ No newline at end of file
@@ -3,13 +3,14 @@
 import { useState, useEffect } from 'react';
 import { useAuth } from '@/hooks/useAuth';
 import { apiRequests } from '@/lib/api';
-import { User, Role, CreateUserData } from '@/types';
+import { User, UserPage, Role, CreateUserData } from '@/types';
 import { Plus, Trash2, AlertCircle, CheckCircle, X, Shield, UserCheck, Edit, Eye } from 'lucide-react';
 import RoleBadge from '@/components/ui/RoleBadge';
 
 export default function UsersPage() {
   const { user: currentUser } = useAuth();
   const [users, setUsers] = useState<User[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [isLoading, setIsLoading] = useState(true);
   const [showModal, setShowModal] = useState(false);
   const [toast, setToast] = useState<{ message: string; type: 'success' | 'error' } | null>(null);
@@ -28,8 +29,9 @@ export default function UsersPage() {
   const loadUsers = async () => {
     try {
       setIsLoading(true);
-      const { data } = await apiRequests.get<User[]>('/api/users/');
-      setUsers(data);
+      const { data } = await apiRequests.get<UserPage>('/api/users/');
+      setUsers(data.results);
+      setNextCursor(data.next);
     } catch (error) {
       showToast('Failed to load users', 'error');
     } finally {
@@ -37,6 +39,17 @@ export default function UsersPage() {
     }
   };
 
+  const loadMoreUsers = async () => {
+    if (!nextCursor) return;
+    try {
+      const { data } = await apiRequests.get<UserPage>('/api/users/', { cursor: nextCursor });
+      setUsers((current) => [...current, ...data.results]);
+      setNextCursor(data.next);
+    } catch (error) {
+      showToast('Failed to load users', 'error');
+    }
+  };
+
   const showToast = (message: string, type: 'success' | 'error') => {
     setToast({ message, type });
     setTimeout(() => setToast(null), 3000);
@@ -278,6 +291,16 @@ export default function UsersPage() {
             </tbody>
           </table>
         </div>
+        {nextCursor && (
+          <div className="flex justify-center p-4 border-t border-slate-200 dark:border-slate-800">
+            <button
+              onClick={loadMoreUsers}
+              className="px-6 py-2 text-sm font-semibold text-brand-600 dark:text-brand-400 hover:bg-slate-100 dark:hover:bg-slate-800 rounded-xl transition-all"
+            >
+              Load more
+            </button>
+          </div>
+        )}
       </div>
 
       {/* Create User Modal */}
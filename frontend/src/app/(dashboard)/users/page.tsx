@@ -3,7 +3,7 @@
 import { useState, useEffect } from 'react';
 import { Plus, Trash2, X, Eye, EyeOff } from 'lucide-react';
 import { useAuth } from '@/hooks/useAuth';
-import { User, Role } from '@/types';
+import { User, UserPage, Role } from '@/types';
 import RoleBadge from '@/components/ui/RoleBadge';
 import { useToast } from '@/components/ui/Toast';
 import { apiRequests } from '@/lib/api';
@@ -33,9 +33,9 @@ export default function UsersPage() {
   const fetchUsers = async () => {
     try {
       setLoading(true);
-      const data = await apiRequests.get<User[]>('/api/users/');
+      const data = await apiRequests.get<UserPage>('/api/users/');
 
-      setUsers(data.data);
+      setUsers(data.data.results);
     } catch (error) {
       showToast('Failed to fetch users', 'error');
     } finally {
@@ -19,6 +19,11 @@ export interface User {
   date_joined: string;
 }
 
+export interface UserPage {
+  results: User[];
+  next: string | null;
+}
+
 export interface Product {
   id: number;
   name: string;